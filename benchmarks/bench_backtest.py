@@ -0,0 +1,102 @@
+# python benchmarks/bench_backtest.py --bars 5000 --trees 100
+"""
+백테스트 전략 비교: 봉마다 예측(예전 MLStrategy: 한 행 추출 → scaler.transform → model.predict)
+vs 미리 계산한 신호(compute_signals로 테스트 구간을 한 번에 예측 → MLStrategy는 신호만 읽음).
+- signals: compute_signals 한 번의 배치 예측 시간
+- run:     cerebro.run 시간 (봉마다 예측은 모델 호출 포함, 신호 방식은 브로커 시뮬레이션만)
+두 방식의 최종 포트폴리오 가치가 같은지도 출력한다.
+"""
+import argparse
+import os
+import sys
+import time
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.backtesting import MLStrategy, compute_signals
+from src.trading.model.ml_models import build_model
+
+
+class PerBarStrategy(bt.Strategy):
+    """ 예전 방식: 봉마다 DataFrame 한 행을 스케일해 모델 예측 (테스트 구간 봉만) """
+    params = (("model", None), ("frame", None), ("features", []), ("split_idx", 0), ("position_size", 100))
+
+    def next(self):
+        idx = len(self) - 1
+        if idx < self.params.split_idx:
+            return
+        model = self.params.model
+        row = self.params.frame.loc[self.params.frame.index[idx], self.params.features].values.reshape(1, -1)
+        scaled = model.scaler.transform(row)
+        if model.model_type == "xgb":
+            pred = int(model.model.predict(xgb.DMatrix(scaled))[0] > 0.5)
+        elif model.model_type == "lgb":
+            pred = int(model.model.predict(scaled)[0] > 0.5)
+        else:
+            pred = model.model.predict(scaled)[0]
+        if not self.position and pred == 1:
+            self.buy(size=self.params.position_size)
+        elif self.position and pred == 0:
+            self.sell(size=self.params.position_size)
+
+
+def make_frame(bars, n_features, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(scale=0.01, size=bars)))
+    df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                       "Volume": rng.integers(10_000, 100_000, bars)},
+                      index=pd.bdate_range("2000-01-03", periods=bars, name="Date"))
+    features = [f"f{i}" for i in range(n_features)]
+    for i, name in enumerate(features):
+        df[name] = rng.normal(size=bars) * (i + 1) * 10 + i
+    return df, features
+
+
+def run(df, strategy, **params):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(10_000_000)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addstrategy(strategy, **params)
+    start = time.perf_counter()
+    cerebro.run()
+    return time.perf_counter() - start, cerebro.broker.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백테스트 봉마다 예측 vs 미리 계산한 신호 벤치마크")
+    parser.add_argument("--bars", type=int, default=5000, help="일봉 수 (뒤 20%가 테스트 구간)")
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=100, help="RF 트리 수 / 부스팅 라운드 수")
+    args = parser.parse_args()
+
+    df, features = make_frame(args.bars, args.features)
+    split_idx = int(len(df) * 0.8)
+    X = df[features].to_numpy()
+    y = (np.diff(df["Close"].to_numpy(), append=df["Close"].iloc[-1]) > 0).astype(int)
+    print(f"[INFO] {args.bars} bars ({args.bars - split_idx} test bars) x {args.features} features, "
+          f"{args.trees} trees/rounds, 1 thread")
+
+    for model_type in ("rf", "xgb", "lgb"):
+        key = "n_estimators" if model_type == "rf" else "num_boost_round"
+        model = build_model(model_type, n_jobs=1, params={key: args.trees})
+        X_train, _ = model.scale(X[:split_idx], X[split_idx:])
+        model.train(X_train, y[:split_idx])
+
+        t_per_bar, value_per_bar = run(df, PerBarStrategy, model=model, frame=df, features=features, split_idx=split_idx)
+        start = time.perf_counter()
+        signals = compute_signals(lambda rows: model.predict(model.scaler.transform(rows)), df, features, split_idx)
+        t_signals = time.perf_counter() - start
+        t_run, value = run(df, MLStrategy, signals=signals)
+
+        print(f"[RESULT] {model_type}: per-bar predict {t_per_bar:6.2f}s | signals {t_signals * 1000:7.1f}ms + "
+              f"run {t_run:5.2f}s = {t_signals + t_run:5.2f}s ({t_per_bar / (t_signals + t_run):5.1f}x)")
+        print(f"[RESULT]   same final value: {np.isclose(value, value_per_bar)} ({value:,.0f} KRW)")
+
+
+if __name__ == "__main__":
+    main()
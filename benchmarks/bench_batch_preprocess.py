@@ -0,0 +1,66 @@
+# python benchmarks/bench_batch_preprocess.py --tickers 40 --workers 1,2,4
+"""
+전 종목 전처리 처리량 비교 (합성 raw 데이터, 임시 디렉터리).
+- loop:  티커마다 scripts/preprocess.py --input 을 새 프로세스로 실행 (셸 루프와 같음, 매번 import 비용)
+- batch: scripts/preprocess.py --batch 한 번 실행, --workers 개 프로세스로 분산
+
+특징 캐시는 끄고(--no-cache) 매번 처음부터 계산한다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from src.trading.price_store import PriceStore
+
+SCRIPT = os.path.join(ROOT, "scripts", "preprocess.py")
+
+
+def build_raw(workdir: str, n_tickers: int, n_days: int) -> list:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2015-01-01", periods=n_days)
+    store = PriceStore(os.path.join(workdir, "data", "store"), "raw")
+    tickers = []
+    for i in range(n_tickers):
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                           "Volume": rng.integers(0, 1_000_000, n_days), "Adj Close": close}, index=dates)
+        tickers.append(f"{i:06d}")
+        store.write(tickers[-1], df, mode="overwrite")
+    return tickers
+
+
+def run(args, workdir):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, SCRIPT] + args, cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일괄 전처리 처리량 벤치마크")
+    parser.add_argument("--tickers", type=int, default=40)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 batch 워커 수 목록")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        tickers = build_raw(workdir, args.tickers, args.days)
+        print(f"[INFO] {args.tickers} tickers x {args.days} days, {os.cpu_count()} CPU cores")
+
+        t_loop = sum(run(["--input", tic, "--no-cache"], workdir) for tic in tickers)
+        print(f"[RESULT]    loop: {t_loop:7.2f}s ({args.tickers / t_loop:6.1f} tickers/s)")
+        for workers in (int(w) for w in args.workers.split(",")):
+            t = run(["--batch", "data/store/raw", "--workers", str(workers), "--no-cache", "--force"], workdir)
+            print(f"[RESULT] batch x{workers}: {t:7.2f}s ({args.tickers / t:6.1f} tickers/s, {t_loop / t:4.1f}x vs loop)")
+
+
+if __name__ == "__main__":
+    main()
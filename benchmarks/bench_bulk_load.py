@@ -0,0 +1,112 @@
+# python benchmarks/bench_bulk_load.py --tickers 300 --days 250
+"""
+krx_daily_price 적재 경로 벤치마크.
+- upsert: 기존 insert_prices (티커마다 psycopg2.connect + execute_values)
+- copy:   PriceBulkLoader (풀 연결 + COPY FROM STDIN 스테이징 + 배치 병합)
+
+PG* 환경 변수로 지정한 로컬 PostgreSQL에 bench_ingest 스키마를 만들고
+search_path를 바꿔 krx_daily_price 이름 그대로 실행한다. 실제 테이블은 건드리지 않는다.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import PriceBulkLoader, get_conn_params, close_pools
+from scripts.insert_price_data import insert_prices
+
+SCHEMA = "bench_ingest"
+
+
+def make_records(n_tickers: int, n_days: int, seed: int = 0):
+    """ 티커별 가상 OHLCV 레코드 목록 생성 """
+    rng = np.random.default_rng(seed)
+    dates = [(date(2015, 1, 1) + timedelta(days=i)).isoformat() for i in range(n_days)]
+    per_ticker = {}
+    for t in range(n_tickers):
+        tic = f"{t:06d}"
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        vol = rng.integers(1000, 1_000_000, n_days)
+        per_ticker[tic] = [
+            (tic, d, float(c), float(c * 1.01), float(c * 0.99), float(c), float(c), int(v))
+            for d, c, v in zip(dates, close, vol)
+        ]
+    return per_ticker
+
+
+def reset_schema(conn_params):
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+            cur.execute(f"CREATE SCHEMA {SCHEMA};")
+            cur.execute(f"""
+            CREATE TABLE {SCHEMA}.krx_daily_price (
+                ticker      VARCHAR(10) NOT NULL,
+                price_date  DATE NOT NULL,
+                open_price  DOUBLE PRECISION,
+                high_price  DOUBLE PRECISION,
+                low_price   DOUBLE PRECISION,
+                close_price DOUBLE PRECISION,
+                adj_close   DOUBLE PRECISION,
+                volume      BIGINT,
+                UNIQUE (ticker, price_date)
+            );
+            """)
+        conn.commit()
+
+
+def bench_upsert(per_ticker, conn_params):
+    start = time.perf_counter()
+    for recs in per_ticker.values():
+        insert_prices(recs, conn_params)
+    return time.perf_counter() - start
+
+
+def bench_copy(per_ticker, conn_params, batch_size, commit_every):
+    start = time.perf_counter()
+    with PriceBulkLoader(conn_params, batch_size=batch_size, commit_every=commit_every) as loader:
+        for recs in per_ticker.values():
+            loader.add(recs)
+    elapsed = time.perf_counter() - start
+    close_pools()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="krx_daily_price 적재 경로 벤치마크")
+    parser.add_argument("--tickers", type=int, default=300)
+    parser.add_argument("--days", type=int, default=250)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--commit-every", type=int, default=1)
+    args = parser.parse_args()
+
+    conn_params = get_conn_params()
+    conn_params["options"] += f" -c search_path={SCHEMA}"
+    per_ticker = make_records(args.tickers, args.days)
+    n_rows = args.tickers * args.days
+    print(f"[INFO] {args.tickers} tickers x {args.days} days = {n_rows:,} rows")
+
+    # 빈 테이블 삽입과 기존 행 갱신(재실행) 두 경우를 모두 측정
+    for label, func in [
+        ("upsert", lambda: bench_upsert(per_ticker, conn_params)),
+        ("copy", lambda: bench_copy(per_ticker, conn_params, args.batch_size, args.commit_every)),
+    ]:
+        reset_schema(conn_params)
+        t_insert = func()
+        t_update = func()
+        print(f"[RESULT] {label:>6}: insert {t_insert:7.2f}s ({n_rows / t_insert:10,.0f} rows/s), "
+              f"re-upsert {t_update:7.2f}s ({n_rows / t_update:10,.0f} rows/s)")
+
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# python benchmarks/bench_dataset_cache.py --rows 500000 --features 20 --repeats 5
+"""
+같은 데이터로 여러 번 학습할 때 데이터셋 구성 비용 비교 (시험·폴드 반복과 같은 상황).
+- none:  매 학습마다 lgb.Dataset / xgb.DMatrix를 새로 구성 (기존 동작)
+- cold:  DatasetCache 첫 학습 (구성 + LightGBM binary 저장)
+- disk:  새 DatasetCache(다른 프로세스와 같음)로 LightGBM binary 파일 읽기
+- warm:  같은 DatasetCache로 반복 (메모리의 Dataset / QuantileDMatrix 재사용)
+
+학습 라운드는 적게 둬서 데이터셋 구성 비용이 드러나게 한다. 예측값이 캐시 없이 학습한 모델과 같은지도 확인한다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.model.dataset_cache import DatasetCache
+from src.trading.model.ml_models import build_model
+
+
+def train(model_type, X, y, cache, rounds):
+    model = build_model(model_type, params={"num_boost_round": rounds}, dataset_cache=cache)
+    start = time.perf_counter()
+    model.train(X, y)
+    return time.perf_counter() - start, model
+
+
+def probabilities(model_type, model, X):
+    return model.model.predict(X if model_type == "lgb" else xgb.DMatrix(X))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 데이터셋 캐시 벤치마크")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, args.features))
+    y = (X[:, 0] + rng.normal(size=args.rows) > 0).astype(int)
+    print(f"[INFO] {args.rows} rows x {args.features} features, {args.rounds} rounds, {os.cpu_count()} CPU cores")
+
+    for model_type in ("lgb", "xgb"):
+        with tempfile.TemporaryDirectory() as root:
+            t_none, base = min((train(model_type, X, y, None, args.rounds) for _ in range(args.repeats)), key=lambda r: r[0])
+            cache = DatasetCache(root)
+            t_cold, _ = train(model_type, X, y, cache, args.rounds)
+            t_warm, warm = min((train(model_type, X, y, cache, args.rounds) for _ in range(args.repeats)), key=lambda r: r[0])
+            same = np.array_equal(probabilities(model_type, base, X[:10000]), probabilities(model_type, warm, X[:10000]))
+            line = f"[RESULT] {model_type}: none {t_none:6.3f}s, cold {t_cold:6.3f}s, warm {t_warm:6.3f}s"
+            if model_type == "lgb":
+                t_disk, _ = train(model_type, X, y, DatasetCache(root), args.rounds)
+                line += f", disk {t_disk:6.3f}s"
+            print(f"{line} ({t_none / t_warm:5.1f}x warm vs none, identical predictions: {same})")
+
+
+if __name__ == "__main__":
+    main()
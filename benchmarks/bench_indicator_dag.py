@@ -0,0 +1,70 @@
+# python benchmarks/bench_indicator_dag.py --tickers 500 --days 2500
+"""
+넓은 지표 집합의 계산 비용 비교.
+- separate: 지표마다 따로 계산 (지표 하나짜리 IndicatorRegistry를 지표 수만큼, 중간 결과 공유 없음)
+- dag:      IndicatorRegistry 하나로 전체 계산 (이동평균·이동표준편차·EMA 공유)
+
+(봉 × 티커) 종가 표 하나에 대해 측정하며, 두 결과가 같은지도 확인한다.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.indicators import IndicatorRegistry
+
+
+def wide_spec() -> dict:
+    spec = {}
+    for w in (5, 10, 20, 60, 120):
+        spec[f"MA{w}"] = {"op": "sma", "window": w}
+        spec[f"STD{w}"] = {"op": "rolling_std", "window": w}
+        spec[f"BB_High{w}"] = {"op": "bb_high", "window": w, "dev": 2}
+        spec[f"BB_Low{w}"] = {"op": "bb_low", "window": w, "dev": 2}
+    for span in (12, 26, 50):
+        spec[f"EMA{span}"] = {"op": "ema", "span": span}
+    spec["MACD"] = {"op": "macd"}
+    spec["MACD_signal"] = {"op": "macd_signal"}
+    spec["MACD_diff"] = {"op": "macd_diff"}
+    spec["RSI14"] = {"op": "rsi", "window": 14}
+    return spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 DAG 공유 계산 벤치마크")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = pd.DataFrame(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, (args.days, args.tickers)), axis=0)))
+    data = {"Close": close}
+    spec = wide_spec()
+
+    separate = [IndicatorRegistry({name: definition}) for name, definition in spec.items()]
+    start = time.perf_counter()
+    expected = {}
+    for registry in separate:
+        expected.update(registry.compute(data))
+    t_separate = time.perf_counter() - start
+    n_separate = sum(len(r.plan()) - 1 for r in separate)
+
+    registry = IndicatorRegistry(spec)
+    start = time.perf_counter()
+    out = registry.compute(data)
+    t_dag = time.perf_counter() - start
+    n_dag = len(registry.plan()) - 1
+
+    for name in spec:
+        np.testing.assert_array_equal(out[name].to_numpy(), expected[name].to_numpy())
+    print(f"[INFO] {len(spec)} indicators on {args.days} x {args.tickers} closes")
+    print(f"[RESULT] separate: {t_separate:6.2f}s ({n_separate} node evaluations)")
+    print(f"[RESULT]      dag: {t_dag:6.2f}s ({n_dag} node evaluations, {t_separate / t_dag:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
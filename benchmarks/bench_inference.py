@@ -0,0 +1,112 @@
+# python benchmarks/bench_inference.py --rows 1000000 --trees 100
+"""
+추론 경로 비교: 네이티브(StandardScaler.transform → 라이브러리 predict) vs 추론 엔진(BaseModel.compile,
+스케일러를 기준값에 합친 TreeEnsemble로 원래 특징 값에서 바로 예측).
+- single: 한 행씩 예측할 때 호출당 지연 (백테스트·실시간처럼 봉마다 예측하는 경우)
+- batch:  --rows 행을 한 번에 예측한 처리량
+- crossover: xgb/lgb 아티팩트(ModelArtifact)에서 배치 크기별 엔진 vs transform + 네이티브 부스터 시간
+             (artifacts.NATIVE_MIN_ROWS를 정하는 근거)
+
+예측 라벨이 같은지와 확률 최대 차이를 함께 출력한다. 컴파일 시간은 학습 후 한 번 드는 비용이다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.model.artifacts import NATIVE_MIN_ROWS, load_artifact, write_artifact
+from src.trading.model.ml_models import build_model
+
+
+def native_proba(model, X):
+    scaled = model.scaler.transform(X)
+    if model.model_type == "rf":
+        return model.model.predict_proba(scaled)[:, 1]
+    if model.model_type == "xgb":
+        return model.model.predict(xgb.DMatrix(scaled))
+    return model.model.predict(scaled)
+
+
+def per_call(func, rows, repeats):
+    start = time.perf_counter()
+    for i in range(repeats):
+        func(rows[i % len(rows)][None, :])
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="트리 앙상블 추론 엔진 벤치마크")
+    parser.add_argument("--train-rows", type=int, default=20_000)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="batch 예측 행 수")
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=100, help="RF 트리 수 / 부스팅 라운드 수")
+    parser.add_argument("--single", type=int, default=300, help="single 지연 측정 호출 수")
+    parser.add_argument("--crossover", type=str, default="1,16,64,256,1024,4096,16384",
+                        help="crossover 측정 배치 행 수 (쉼표 구분)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # 특징마다 평균·크기가 다른 원래 값 (스케일러가 하는 일이 있도록)
+    shift, spread = rng.uniform(-100, 100, args.features), rng.uniform(1, 1000, args.features)
+    X = rng.normal(size=(args.train_rows, args.features)) * spread + shift
+    y = (X[:, 0] - shift[0] + rng.normal(scale=spread[0], size=args.train_rows) > 0).astype(int)
+    X_batch = rng.normal(size=(args.rows, args.features)) * spread + shift
+    print(f"[INFO] train {args.train_rows} rows, batch {args.rows} rows x {args.features} features, "
+          f"{args.trees} trees/rounds, 1 thread")
+
+    for model_type in ("rf", "xgb", "lgb"):
+        key = "n_estimators" if model_type == "rf" else "num_boost_round"
+        model = build_model(model_type, n_jobs=1, params={key: args.trees})
+        X_train, _ = model.scale(X, X[:1])
+        model.train(X_train, y)
+        start = time.perf_counter()
+        engine = model.compile()
+        t_compile = time.perf_counter() - start
+
+        t_native_single = per_call(lambda row: native_proba(model, row), X_batch, args.single)
+        t_engine_single = per_call(engine.predict_proba, X_batch, args.single)
+        start = time.perf_counter()
+        expected = native_proba(model, X_batch)
+        t_native = time.perf_counter() - start
+        start = time.perf_counter()
+        got = engine.predict_proba(X_batch)[:, 1]
+        t_engine = time.perf_counter() - start
+
+        same = np.array_equal(model.predict(model.scaler.transform(X_batch)), engine.predict(X_batch))
+        print(f"[RESULT] {model_type}: compile {t_compile:5.2f}s ({len(engine.feature)} nodes, depth {engine.max_depth})")
+        print(f"[RESULT]   single: native {t_native_single * 1000:7.3f}ms, engine {t_engine_single * 1000:7.3f}ms "
+              f"({t_native_single / t_engine_single:5.1f}x)")
+        print(f"[RESULT]   batch:  native {args.rows / t_native:10,.0f} rows/s, engine {args.rows / t_engine:10,.0f} rows/s "
+              f"({t_native / t_engine:5.2f}x)")
+        print(f"[RESULT]   identical predictions: {same}, max probability difference {np.abs(expected - got).max():.2e}")
+        if model_type != "rf":
+            crossover(model, X_batch, [int(n) for n in args.crossover.split(",")])
+
+
+def crossover(model, X_batch, sizes):
+    """ ModelArtifact의 두 예측 경로를 배치 크기별로 비교 (NATIVE_MIN_ROWS 이상이면 네이티브) """
+    with tempfile.TemporaryDirectory() as directory:
+        write_artifact(model, directory)
+        artifact = load_artifact(directory)
+        artifact.engine, artifact.model  # 읽기 비용은 제외
+        for n in sizes:
+            rows = X_batch[:n]
+            repeats = max(3, 20_000 // n)
+            timings = []
+            for predict in (artifact.engine.predict_proba, artifact._native_proba):
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    predict(rows)
+                timings.append((time.perf_counter() - start) / repeats)
+            used = "native" if n >= NATIVE_MIN_ROWS else "engine"
+            print(f"[RESULT]   {n:6d} rows: engine {timings[0] * 1000:8.3f}ms, native {timings[1] * 1000:8.3f}ms "
+                  f"({timings[0] / timings[1]:5.2f}x) -> {used}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# python benchmarks/bench_kernels.py --sizes 1000,10000,100000,1000000,10000000
+"""
+지표 계산 backend 마이크로 벤치마크 (시계열 하나, 봉 수별).
+- 커널별: 이동평균(20), 이동표준편차(20), EMA(12), Wilder 평활(14)을 pandas와 NumPy 커널로 계산
+- 지표 전체: config 기본 지표(IndicatorRegistry)를 backend "ta" / "pandas" / "numpy"로 계산
+
+NumPy 결과와 pandas 결과의 최대 상대 오차도 함께 출력한다.
+(수백만 봉 이상에서는 pandas의 온라인 분산 누적 오차가 더 커서, 변동이 아주 작은 구간의 표준편차 차이는
+ 주로 pandas 쪽 오차다. 블록 누적합인 NumPy 커널은 두 번 읽는 정확한 계산과 1e-10 안팎으로 같다.)
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading import kernels
+from src.trading.indicators import DEFAULT_INDICATORS, IndicatorRegistry
+
+KERNELS = {
+    "rolling_mean(20)": (lambda s: s.rolling(20, min_periods=20).mean(), lambda x: kernels.rolling_mean(x, 20)),
+    "rolling_std(20)": (lambda s: s.rolling(20, min_periods=20).std(ddof=0), lambda x: kernels.rolling_std(x, 20)),
+    "ema(12)": (lambda s: s.ewm(span=12, min_periods=12, adjust=False).mean(), lambda x: kernels.ema(x, 12)),
+    "wilder(14)": (lambda s: s.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean(), lambda x: kernels.wilder(x, 14)),
+}
+
+
+def best_of(func, repeat: int):
+    times, out = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def max_rel_err(actual, expected) -> float:
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        err = np.abs(actual - expected) / np.maximum(np.abs(expected), 1e-12)
+    return float(np.nanmax(err)) if np.isfinite(err).any() else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy 지표 커널 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000,10000000", help="쉼표로 구분한 봉 수 목록")
+    parser.add_argument("--repeat", type=int, default=3, help="크기마다 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--skip-ta", action="store_true", help="ta backend 측정 생략")
+    args = parser.parse_args()
+
+    registry = IndicatorRegistry(DEFAULT_INDICATORS)
+    rng = np.random.default_rng(0)
+    for n in (int(v) for v in args.sizes.split(",")):
+        close = pd.Series(10000 * np.exp(np.cumsum(rng.normal(0, 0.001, n))), name="Close")
+        values = close.to_numpy()
+        print(f"[INFO] {n:,} bars")
+        for name, (pandas_func, numpy_func) in KERNELS.items():
+            t_pd, expected = best_of(lambda: pandas_func(close), args.repeat)
+            t_np, actual = best_of(lambda: numpy_func(values), args.repeat)
+            print(f"[RESULT] {name:>16}: pandas {t_pd * 1e3:9.2f}ms  numpy {t_np * 1e3:9.2f}ms "
+                  f"({t_pd / t_np:5.1f}x, max rel err {max_rel_err(actual, expected):.1e})")
+
+        data = pd.DataFrame({"Close": close})
+        timings = {}
+        for backend in (["pandas", "numpy"] if args.skip_ta else ["ta", "pandas", "numpy"]):
+            timings[backend], out = best_of(lambda: registry.compute(data, backend=backend), args.repeat)
+            if backend == "pandas":
+                expected = out
+            elif backend == "numpy":
+                err = max(max_rel_err(out[c], expected[c]) for c in registry.columns)
+        line = "  ".join(f"{b} {t * 1e3:9.2f}ms" for b, t in timings.items())
+        print(f"[RESULT] {'all indicators':>16}: {line} "
+              f"({timings['pandas'] / timings['numpy']:5.1f}x vs pandas, max rel err {err:.1e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# python benchmarks/bench_memory.py --tickers 2500 --days 2500
+"""
+전 종목 데이터 적재 → 전처리 → 지표 계산의 최대 메모리(peak RSS) 비교.
+- default: float64 가격·특징, int64 거래량, 문자열(object) Ticker·Name
+- compact: float32 가격·특징, 최소 폭 정수 거래량, category Ticker·Name (src.trading.compact)
+
+합성 전 종목 데이터(collect_data.py와 같은 컬럼, 종목명 포함)를 임시 PriceStore에 저장한 뒤,
+모드마다 새 프로세스에서 같은 파이프라인을 돌려 프로세스 최대 RSS를 잰다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.compact import frame_nbytes, peak_rss_bytes
+from src.trading.feature_engine import add_indicators_long
+from src.trading.feature_engineering import basic_preprocessing
+from src.trading.price_store import PriceStore, TICKER_COL
+
+
+def build_store(root: str, n_tickers: int, n_days: int):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2015-01-01", periods=n_days, name="Date")
+    store = PriceStore(root, "raw")
+    for i in range(n_tickers):
+        close = np.round(rng.uniform(1000, 100000) * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))), 0)
+        df = pd.DataFrame({
+            "Name": f"종목{i:04d}",
+            "Open": close * rng.uniform(0.98, 1.02, n_days),
+            "High": close * 1.03,
+            "Low": close * 0.97,
+            "Close": close,
+            "Volume": rng.integers(0, 5_000_000, n_days),
+            "Adj Close": close,
+        }, index=dates)
+        store.write(f"{i:06d}", df, mode="overwrite")
+
+
+def run_pipeline(root: str, compact: bool) -> dict:
+    base = peak_rss_bytes()
+    start = time.perf_counter()
+    df = PriceStore(root, "raw").read(compact=compact)
+    loaded = frame_nbytes(df)
+    peak_load = peak_rss_bytes()
+
+    # 전처리(z-score 이상치 제거)는 티커별 통계를 쓰므로 티커마다 적용
+    df = pd.concat([basic_preprocessing(part)
+                    for _, part in df.set_index("Date").groupby(TICKER_COL, observed=True, sort=False)])
+    df = add_indicators_long(df.reset_index())
+    return {
+        "rows": len(df), "seconds": time.perf_counter() - start,
+        "import_rss": base, "load_rss": peak_load, "peak_rss": peak_rss_bytes(),
+        "loaded_bytes": loaded, "feature_bytes": frame_nbytes(df),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compact dtype 모드 최대 메모리 비교")
+    parser.add_argument("--tickers", type=int, default=2500)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--root", default=None, help="합성 데이터 PriceStore 위치 (기본: 임시 디렉터리, 있으면 재사용)")
+    parser.add_argument("--mode", choices=["default", "compact"], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        # 하위 프로세스: 한 모드만 실행하고 결과를 JSON으로 출력
+        print(json.dumps(run_pipeline(args.root, args.mode == "compact")))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root or tmp
+        if not PriceStore(root, "raw").tickers():
+            start = time.perf_counter()
+            build_store(root, args.tickers, args.days)
+            print(f"[INFO] Built {args.tickers} x {args.days} synthetic store in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+        for mode in ("default", "compact"):
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--root", root, "--mode", mode],
+                                 capture_output=True, text=True)
+            results[mode] = json.loads(out.stdout.strip().splitlines()[-1]) if out.returncode == 0 else None
+            if out.returncode != 0:
+                # 메모리가 모자라면 OOM killer가 SIGKILL(-9)로 종료시킨다
+                print(f"[WARN] {mode} run failed (exit {out.returncode}{', out of memory?' if out.returncode == -9 else ''})")
+
+    mb = 1 << 20
+    for mode, r in results.items():
+        if r is None:
+            continue
+        print(f"[RESULT] {mode:>7}: peak RSS {r['peak_rss'] / mb:8.0f} MB (after load {r['load_rss'] / mb:6.0f} MB, "
+              f"imports {r['import_rss'] / mb:4.0f} MB) | loaded frame {r['loaded_bytes'] / mb:6.0f} MB, "
+              f"features {r['feature_bytes'] / mb:6.0f} MB | {r['rows']:,} rows in {r['seconds']:.1f}s")
+    if all(results.values()):
+        print(f"[RESULT] peak RSS reduction: "
+              f"{1 - results['compact']['peak_rss'] / results['default']['peak_rss']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
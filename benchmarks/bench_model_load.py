@@ -0,0 +1,79 @@
+# python benchmarks/bench_model_load.py --rows 20000 --trees 300 --repeats 5
+"""
+추론용 모델 로드 시간 비교 (로드 + 첫 한 행 예측까지).
+- pickle:   BaseModel.save의 {"model", "scaler"} pickle 전체 역직렬화 (기존 MLStrategy 방식)
+- artifact: ModelRegistry 아티팩트 (manifest + 지연 로드, 스케일러를 합친 추론 엔진 노드 배열을 memmap으로 열어 예측)
+
+같은 입력에서 두 방식의 예측이 같은지도 확인한다. 파일은 한 번 읽어 둔 상태(페이지 캐시)에서 잰다.
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.model.artifacts import ModelRegistry
+from src.trading.model.ml_models import build_model
+
+
+def timed(load, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = load()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def load_pickle(path, row):
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    scaled = data["scaler"].transform(row)
+    return data["model"].predict(xgb.DMatrix(scaled) if isinstance(data["model"], xgb.Booster) else scaled)
+
+
+def load_artifact(registry, name, row):
+    return registry.load(name).predict(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 로드 시간 벤치마크")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=300, help="RF 트리 수 / 부스팅 라운드 수")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, args.features))
+    y = (X[:, 0] + rng.normal(size=args.rows) > 0).astype(int)
+    print(f"[INFO] {args.rows} rows x {args.features} features, {args.trees} trees/rounds")
+
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(os.path.join(root, "registry"))
+        for model_type in ("rf", "xgb", "lgb"):
+            key = "n_estimators" if model_type == "rf" else "num_boost_round"
+            model = build_model(model_type, n_jobs=1, params={key: args.trees})
+            X_train, _ = model.scale(X, X[:1])
+            model.train(X_train, y)
+            path = os.path.join(root, f"{model_type}.pkl")
+            model.save(path)
+            registry.register(model_type, model)
+            size = os.path.getsize(path)
+
+            t_pickle, _ = timed(lambda: load_pickle(path, X[:1]), args.repeats)
+            t_artifact, _ = timed(lambda: load_artifact(registry, model_type, X[:1]), args.repeats)
+            expected = model.model.predict(X_train) if model_type == "rf" else model.predict(X_train)
+            same = np.array_equal(registry.load(model_type).predict(X), expected)
+            print(f"[RESULT] {model_type}: pickle {size / 2**20:6.1f}MB {t_pickle * 1000:8.2f}ms, "
+                  f"artifact {t_artifact * 1000:8.2f}ms ({t_pickle / t_artifact:5.1f}x), "
+                  f"identical predictions: {same}")
+
+
+if __name__ == "__main__":
+    main()
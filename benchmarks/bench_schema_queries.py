@@ -0,0 +1,151 @@
+# python benchmarks/bench_schema_queries.py --tickers 2500 --years 16
+"""
+krx_daily_price 스키마별 조회 벤치마크.
+- plain:       기존 가정 (일반 테이블 + UNIQUE (ticker, price_date))
+- partitioned: src.trading.schema (연도 파티션 + PK (ticker, price_date) + BRIN (price_date))
+
+PG* 환경 변수로 지정한 로컬 PostgreSQL에 bench_schema 스키마를 만들고 search_path를 바꿔
+krx_daily_price 이름 그대로 실행한다. 실제 테이블은 건드리지 않는다.
+가상 데이터는 일별 적재처럼 날짜 순서로 쌓는다.
+
+측정 쿼리
+- day:    특정 영업일 전 종목 (price_date = ?)
+- ticker: 한 티커의 여러 해 (ticker = ? AND price_date BETWEEN ?)
+- upsert: 한 영업일 전 종목 ON CONFLICT 갱신
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import get_conn_params, close_pools
+from src.trading.schema import ensure_price_schema
+
+SCHEMA = "bench_schema"
+START_YEAR = 2010
+
+
+def reset_schema(conn_params, layout, n_years):
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+            cur.execute(f"CREATE SCHEMA {SCHEMA};")
+            if layout == "plain":
+                cur.execute(f"""
+                CREATE TABLE {SCHEMA}.krx_daily_price (
+                    ticker      VARCHAR(10) NOT NULL,
+                    price_date  DATE NOT NULL,
+                    open_price  DOUBLE PRECISION,
+                    high_price  DOUBLE PRECISION,
+                    low_price   DOUBLE PRECISION,
+                    close_price DOUBLE PRECISION,
+                    adj_close   DOUBLE PRECISION,
+                    volume      BIGINT,
+                    UNIQUE (ticker, price_date)
+                );
+                """)
+        conn.commit()
+    if layout == "partitioned":
+        ensure_price_schema(conn_params, f"{START_YEAR}0101", f"{START_YEAR + n_years - 1}1231")
+        close_pools()
+
+
+def load(conn_params, n_tickers, n_years):
+    """ 평일을 영업일로 보고 (날짜, 티커) 순서로 가상 시세를 서버에서 생성 """
+    start = time.perf_counter()
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+            INSERT INTO krx_daily_price
+            SELECT lpad(t::text, 6, '0'), d::date,
+                   100 + t %% 50, 101 + t %% 50, 99 + t %% 50, 100 + t %% 50, 100 + t %% 50,
+                   (t * 7919 + extract(doy FROM d)::int * 104729) %% 1000000
+              FROM generate_series(%s::date, %s::date, interval '1 day') AS d
+             CROSS JOIN generate_series(1, %s) AS t
+             WHERE extract(isodow FROM d) < 6
+             ORDER BY d, t;
+            """, (f"{START_YEAR}-01-01", f"{START_YEAR + n_years - 1}-12-31", n_tickers))
+            rows = cur.rowcount
+            cur.execute("ANALYZE krx_daily_price;")
+            cur.execute("""
+            SELECT coalesce(sum(pg_total_relation_size(c.oid)), 0)
+              FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = %s AND c.relkind IN ('r', 'i');
+            """, (SCHEMA,))
+            size = cur.fetchone()[0]
+        conn.commit()
+    return rows, time.perf_counter() - start, size
+
+
+def timed(cur, sql, params_list):
+    """ 파라미터마다 한 번씩 실행해 (중앙값 ms, 평균 반환 행 수) """
+    times, counts = [], []
+    for params in params_list:
+        t0 = time.perf_counter()
+        cur.execute(sql, params)
+        counts.append(cur.rowcount if cur.description is None else len(cur.fetchall()))
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), statistics.mean(counts)
+
+
+def bench_queries(conn_params, n_tickers, n_years, repeat, seed=0):
+    rng = np.random.default_rng(seed)
+    days = np.busday_offset(f"{START_YEAR}-01-01", rng.integers(0, n_years * 250, repeat), roll="forward")
+    days = [d.item() for d in days]
+    tickers = [f"{t:06d}" for t in rng.integers(1, n_tickers + 1, repeat)]
+    span_start = f"{START_YEAR + n_years // 4}-01-01"
+    span_end = f"{START_YEAR + n_years - 1}-12-31"
+
+    results = {}
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            results["day"] = timed(cur, "SELECT * FROM krx_daily_price WHERE price_date = %s;",
+                                   [(d,) for d in days])
+            results["ticker"] = timed(cur, """
+            SELECT * FROM krx_daily_price
+             WHERE ticker = %s AND price_date BETWEEN %s AND %s
+             ORDER BY price_date;
+            """, [(t, span_start, span_end) for t in tickers])
+            results["upsert"] = timed(cur, """
+            INSERT INTO krx_daily_price
+            SELECT ticker, price_date, open_price, high_price, low_price, close_price + 1, adj_close, volume
+              FROM krx_daily_price WHERE price_date = %s
+            ON CONFLICT (ticker, price_date) DO UPDATE
+              SET close_price = EXCLUDED.close_price;
+            """, [(d,) for d in days[:max(1, repeat // 4)]])
+        conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="krx_daily_price 스키마별 조회 벤치마크")
+    parser.add_argument("--tickers", type=int, default=2500)
+    parser.add_argument("--years", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--layouts", nargs="+", default=["plain", "partitioned"],
+                        choices=["plain", "partitioned"])
+    args = parser.parse_args()
+
+    conn_params = get_conn_params()
+    conn_params["options"] += f" -c search_path={SCHEMA}"
+
+    for layout in args.layouts:
+        reset_schema(conn_params, layout, args.years)
+        rows, t_load, size = load(conn_params, args.tickers, args.years)
+        print(f"[INFO] {layout}: {rows:,} rows loaded in {t_load:.1f}s, {size / (1 << 20):,.0f} MB (table+indexes)")
+        for name, (ms, n) in bench_queries(conn_params, args.tickers, args.years, args.repeat).items():
+            print(f"[RESULT] {layout:>11} {name:>6}: median {ms:9.2f} ms ({n:,.0f} rows)")
+
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
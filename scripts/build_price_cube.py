@@ -0,0 +1,35 @@
+# python scripts\build_price_cube.py            (전체 재생성)
+# python scripts\build_price_cube.py --append   (마지막 영업일 이후만 추가)
+
+import os
+import sys
+import argparse
+
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import get_conn_params
+from src.trading.price_cube import DEFAULT_CUBE_DIR, build_cube, append_days
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="krx_daily_price를 (티커 × 영업일 × 필드) memory-mapped 큐브로 내보내기"
+    )
+    parser.add_argument("--path", default=DEFAULT_CUBE_DIR,
+        help="큐브 디렉터리")
+    parser.add_argument("--append", action="store_true",
+        help="기존 큐브에 새 영업일만 추가")
+    parser.add_argument("--headroom", type=int, default=260,
+        help="날짜 축에 미리 확보할 영업일 수")
+    args = parser.parse_args()
+
+    conn_params = get_conn_params()
+    if args.append and os.path.exists(os.path.join(args.path, "meta.json")):
+        cube = append_days(conn_params, args.path, headroom=args.headroom)
+    else:
+        cube = build_cube(conn_params, args.path, headroom=args.headroom)
+    print(f"[INFO] 큐브 크기: {cube.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 # excute command: python scripts\collect_data.py --ticker 005930 --start 2020-01-01 --end 2025-05-31
 import argparse
 import os
-from datetime import datetime
+import sys
 
 import pandas as pd
 from pykrx import stock
 
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.price_store import save_prices
+from src.trading.response_cache import cached_call
+
 def download_stock_data_pykrx(ticker: str, start: str, end: str) -> pd.DataFrame:
     """
     pykrx를 이용해 한국 주가 데이터를 가져옵니다.
@@ -26,7 +31,8 @@ def download_stock_data_pykrx(ticker: str, start: str, end: str) -> pd.DataFrame
 
     # 2) 종목명 조회 시도. 실패 시 ticker(숫자) 자체를 이름으로 사용
     try:
-        name = stock.get_market_ticker_name(ticker)
+        name = cached_call("pykrx", "get_market_ticker_name",
+                           lambda: stock.get_market_ticker_name(ticker), ticker=ticker)
         if not name:  # 빈 문자열로 반환될 수도 있으므로 확인
             raise ValueError("get_market_ticker_name returned empty string")
     except Exception as e:
@@ -38,7 +44,9 @@ def download_stock_data_pykrx(ticker: str, start: str, end: str) -> pd.DataFrame
     end_dt = end.replace("-", "")
 
     # 지정 기간 동안의 시가/고가/저가/종가/거래량을 반환
-    df = stock.get_market_ohlcv_by_date(start_dt, end_dt, ticker)
+    df = cached_call("pykrx", "get_market_ohlcv_by_date",
+                     lambda: stock.get_market_ohlcv_by_date(start_dt, end_dt, ticker),
+                     ticker=ticker, start=start_dt, end=end_dt)
 
     # 컬럼명 한글 → 영어로 변경
     df = df.rename(columns={
@@ -53,20 +61,16 @@ def download_stock_data_pykrx(ticker: str, start: str, end: str) -> pd.DataFrame
     # Adj Close(보정 종가) 컬럼이 별도로 없으므로, 'Close'를 복사
     df["Adj Close"] = df["Close"]
 
-    # 'Name' 컬럼을 맨 앞에 추가 (모든 행에 동일한 종목명)
-    df.insert(0, "Name", name)
+    # 'Name' 컬럼을 맨 앞에 추가 (모든 행에 동일한 종목명 → 행마다 문자열을 두지 않도록 category)
+    df.insert(0, "Name", pd.Categorical([name] * len(df)))
 
     return df
 
-def save_raw_csv(df: pd.DataFrame, ticker: str):
+def save_raw(df: pd.DataFrame, ticker: str):
     """
-    data/raw/{ticker}_{YYYYMMDD_HHMMSS}.csv 형태로 파일 저장
+    data/store/raw/ticker={ticker}/year=YYYY/ 파티션에 병합 저장 (같은 날짜는 최신 값으로 갱신)
     """
-    os.makedirs("data/raw", exist_ok=True)
-    date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"data/raw/{ticker}_{date_str}.csv"
-    df.to_csv(filename, encoding="cp949")
-    print(f"[INFO] Saved raw data to {filename}")
+    save_prices(df, ticker, dataset="raw", mode="upsert")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -88,7 +92,7 @@ def main():
 
     print(f"[INFO] Downloading data for {args.ticker} from {args.start} to {args.end} with pykrx...")
     df = download_stock_data_pykrx(args.ticker, args.start, args.end)
-    save_raw_csv(df, args.ticker)
+    save_raw(df, args.ticker.split(".")[0])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
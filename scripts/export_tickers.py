@@ -1,49 +1,23 @@
 # excute command: python scripts\export_tickers.py
 
 import os
+import sys
 from datetime import datetime
 
 import pandas as pd
-from pykrx import stock
+
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading import tickers as ticker_store
 
 def fetch_all_tickers(date: str) -> pd.DataFrame:
     """
     지정한 날짜(date, 'YYYYMMDD') 기준으로 KOSPI와 KOSDAQ 시장의
     모든 티커(ticker), 종목명(name), 시장(market) 정보를 DataFrame으로 반환.
+    종목명은 src.trading.tickers 의 로컬 캐시를 공유하며, 캐시 미스만 병렬 조회한다.
     """
-    all_data = []
-
-    # 조회할 시장 목록 (필요 시 'KONEX' 등 다른 시장도 추가 가능)
-    markets = {
-        "KOSPI": "KOSPI",   # KOSPI(유가증권시장)
-        "KOSDAQ": "KOSDAQ"  # KOSDAQ(코스닥시장)
-    }
-
-    for market_name, market_code in markets.items():
-        # 1) 해당 시장의 티커 리스트 조회
-        try:
-            tickers = stock.get_market_ticker_list(market=market_code, date=date)
-        except Exception as e:
-            print(f"[WARN] get_market_ticker_list('{market_code}', '{date}') 호출 중 예외 발생: {e}")
-            continue
-
-        # 2) 각 티커별 종목명(name)을 조회
-        for tic in tickers:
-            try:
-                name = stock.get_market_ticker_name(tic)
-                if not name:
-                    name = ""
-            except Exception:
-                name = ""
-            all_data.append({
-                "Ticker": tic,
-                "Name": name,
-                "Market": market_name
-            })
-
-    # 3) DataFrame 생성
-    df = pd.DataFrame(all_data, columns=["Ticker", "Name", "Market"])
-    return df
+    df = ticker_store.fetch_all_tickers(date)
+    return df.rename(columns={"ticker": "Ticker", "name": "Name", "market": "Market"})
 
 def save_to_excel(df: pd.DataFrame, output_path: str):
     """
@@ -0,0 +1,40 @@
+# python scripts\init_schema.py --start 2010 --end 2026     (테이블·연도 파티션 생성)
+# python scripts\init_schema.py --migrate                    (기존 일반 테이블을 파티션 테이블로 이전)
+# python scripts\init_schema.py --cluster 2015               (백필 후 해당 연도 파티션 날짜순 재정렬)
+
+import os
+import sys
+import argparse
+
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import get_conn_params
+from src.trading.schema import ensure_price_schema, migrate_to_partitioned, cluster_partition
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="krx_daily_price 연도 파티션 테이블 및 인덱스 관리"
+    )
+    parser.add_argument("--start", type=int, default=None,
+        help="파티션을 만들 시작 연도")
+    parser.add_argument("--end", type=int, default=None,
+        help="파티션을 만들 종료 연도 (기본: 시작 연도)")
+    parser.add_argument("--migrate", action="store_true",
+        help="기존 일반 테이블을 파티션 테이블로 이전 (기존 테이블은 *_legacy로 남김)")
+    parser.add_argument("--cluster", type=int, nargs="*", default=[],
+        help="(price_date, ticker) 순서로 다시 쓸 파티션 연도")
+    args = parser.parse_args()
+
+    conn_params = get_conn_params()
+    if args.migrate:
+        migrate_to_partitioned(conn_params)
+    start = f"{args.start}0101" if args.start else None
+    end = f"{args.end or args.start}1231" if args.start else None
+    ensure_price_schema(conn_params, start, end)
+    for year in args.cluster:
+        cluster_partition(conn_params, year)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,19 @@
 import os
 import sys
 import argparse
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import psycopg2
 from psycopg2.extras import execute_values
 from pykrx import stock
 
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import BulkLoadError, PriceBulkLoader, get_conn_params, close_pools, fetch_watermarks
+from src.trading.schema import ensure_price_schema
+from src.trading.pipeline import Checkpoint, run_pipeline
+from src.trading.response_cache import cached_call
+
 
 def fetch_tickers(conn_params):
     """ krx_tickers 테이블에서 모든 ticker 목록을 가져옴 """
@@ -18,42 +25,43 @@ def fetch_tickers(conn_params):
             return [row[0] for row in cur.fetchall()]
 
 
+def fetch_ohlcv_frame(ticker, start, end):
+    """
+    pykrx로 티커 하나의 일별 OHLCV DataFrame 조회 (네트워크 호출만 수행)
+    start/end는 'YYYYMMDD' 문자열
+    """
+    return cached_call("pykrx", "get_market_ohlcv_by_date",
+                       lambda: stock.get_market_ohlcv_by_date(start, end, ticker),
+                       ticker=ticker, start=start, end=end)
+
+
+def ohlcv_to_records(ticker, df):
+    """
+    fetch_ohlcv_frame 결과를 컬럼 단위로 변환해 레코드 목록 생성 (iterrows 없이 zip)
+    반환: list of tuples (ticker, date, open, high, low, close, adj_close, volume)
+    """
+    if df is None or df.empty:
+        return []
+    dates = df.index.strftime("%Y-%m-%d").tolist()
+    opens = df["시가"].astype(float).tolist()
+    highs = df["고가"].astype(float).tolist()
+    lows = df["저가"].astype(float).tolist()
+    closes = df["종가"].astype(float).tolist()
+    volumes = df["거래량"].astype(int).tolist()
+    # Adj Close(보정 종가)는 별도로 없으므로 종가를 그대로 사용
+    return [
+        (ticker, d, o, h, l, c, c, v)
+        for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
+    ]
+
+
 def fetch_ohlcv(ticker, start, end):
     """
        pykrx로 일별 OHLCV+Adj Close 조회
        start/end는 'YYYYMMDD' 문자열
        반환: list of tuples (ticker, date, open, high, low, close, adj_close, volume)
        """
-    df = stock.get_market_ohlcv_by_date(start, end, ticker)
-    df = df.rename(columns={
-        "시가": "open_price",
-        "고가": "high_price",
-        "저가": "low_price",
-        "종가": "close_price",
-        "거래량": "volume"
-    })
-    df["adj_close"] = df["close_price"]
-
-    # 인덱스 이름 확인 (None 이면 'index'가 기본)
-    idx_name = df.index.name if df.index.name else "index"
-    # reset_index 한 뒤 실제 컬럼명으로 price_date 리네임
-    df_reset = df.reset_index()
-    df_reset = df_reset.rename(columns={idx_name: "price_date"})
-
-    records = []
-    for _, row in df_reset.iterrows():
-        # 'price_date' 컬럼이 이제 확실히 존재합니다
-        records.append((
-            ticker,
-            row["price_date"].strftime("%Y-%m-%d"),
-            float(row["open_price"]),
-            float(row["high_price"]),
-            float(row["low_price"]),
-            float(row["close_price"]),
-            float(row["adj_close"]),
-            int(row["volume"])
-        ))
-    return records
+    return ohlcv_to_records(ticker, fetch_ohlcv_frame(ticker, start, end))
 
 
 def insert_prices(records, conn_params):
@@ -78,43 +86,224 @@ def insert_prices(records, conn_params):
         conn.commit()
 
 
+def last_trading_day(date: str) -> str:
+    """ date(YYYYMMDD) 이전(포함) 가장 가까운 영업일. 조회 실패 시 date 그대로 반환 """
+    try:
+        return cached_call("pykrx", "get_nearest_business_day_in_a_week",
+                           lambda: stock.get_nearest_business_day_in_a_week(date=date, prev=True),
+                           start=date, end=date)
+    except Exception as e:
+        print(f"[WARN] 영업일 조회 실패({e}), 종료일 {date}를 그대로 사용")
+        return date
+
+
+def plan_incremental(tickers, watermarks, start, end):
+    """
+    티커별 마지막 적재일(watermarks) 다음 날부터 end까지만 조회하도록 시작일을 정한다.
+    이미 end까지 적재된 티커는 제외.
+    반환: {ticker: 조회 시작일(YYYYMMDD)}
+    """
+    plan = {}
+    for tic in tickers:
+        last = watermarks.get(tic)
+        tic_start = start
+        if last is not None:
+            tic_start = max(start, (last + timedelta(days=1)).strftime("%Y%m%d"))
+        if tic_start <= end:
+            plan[tic] = tic_start
+    return plan
+
+
+def fetch_snapshot_frame(date):
+    """ pykrx로 특정 영업일(date, 'YYYYMMDD')의 전 종목 OHLCV DataFrame 조회 """
+    return cached_call("pykrx", "get_market_ohlcv",
+                       lambda: stock.get_market_ohlcv(date, market="ALL"),
+                       start=date, end=date, market="ALL")
+
+
+def snapshot_to_records(date, df, tickers=None):
+    """
+    fetch_snapshot_frame 결과를 레코드 목록으로 변환
+    tickers가 주어지면 해당 티커만 남긴다 (krx_tickers 기준)
+    """
+    if df is None or df.empty:
+        return []
+    if tickers is not None:
+        df = df[df.index.isin(tickers)]
+
+    price_date = datetime.strptime(date, "%Y%m%d").strftime("%Y-%m-%d")
+    opens = df["시가"].astype(float).tolist()
+    highs = df["고가"].astype(float).tolist()
+    lows = df["저가"].astype(float).tolist()
+    closes = df["종가"].astype(float).tolist()
+    volumes = df["거래량"].astype(int).tolist()
+    return [
+        (tic, price_date, o, h, l, c, c, v)
+        for tic, o, h, l, c, v in zip(df.index.tolist(), opens, highs, lows, closes, volumes)
+    ]
+
+
+def fetch_market_snapshot(date, tickers=None):
+    """
+    pykrx로 특정 영업일(date, 'YYYYMMDD')의 전 종목 OHLCV를 한 번에 조회
+    반환: list of tuples (ticker, date, open, high, low, close, adj_close, volume)
+    """
+    return snapshot_to_records(date, fetch_snapshot_frame(date), tickers)
+
+
+def trading_days(start, end):
+    """ start~end(YYYYMMDD) 사이의 영업일 목록 (YYYYMMDD 문자열) """
+    days = cached_call("pykrx", "get_previous_business_days",
+                       lambda: stock.get_previous_business_days(fromdate=start, todate=end),
+                       start=start, end=end)
+    return [d.strftime("%Y%m%d") for d in days]
+
+
+def ingest_tickers(tickers, start, end, write, starts=None, **kwargs):
+    """
+    티커별로 기간 OHLCV를 조회/삽입 (티커당 pykrx 1회 호출)
+    - starts: 티커별 조회 시작일 {ticker: YYYYMMDD} (없는 티커는 start 사용, 증분 모드용)
+    나머지 인자(workers, rate, retries, queue_size, on_done, on_failed, write_retries)는 run_pipeline 참고
+    """
+    starts = starts or {}
+    return run_pipeline(tickers, lambda tic: fetch_ohlcv_frame(tic, starts.get(tic, start), end),
+                        ohlcv_to_records, write, **kwargs)
+
+
+def ingest_dates(dates, write, tickers=None, **kwargs):
+    """
+    영업일별로 전 종목 OHLCV를 조회/삽입 (날짜당 pykrx 1회 호출)
+    """
+    ticker_set = set(tickers) if tickers is not None else None
+    return run_pipeline(dates, fetch_snapshot_frame,
+                        lambda d, df: snapshot_to_records(d, df, ticker_set), write, **kwargs)
+
+
+def print_summary(summary, unit="티커"):
+    """ ingest 결과 요약 출력 """
+    total_rows = sum(summary["success"].values())
+    print(f"[INFO] 성공 {len(summary['success'])}개 {unit} ({total_rows}건), "
+          f"데이터 없음 {len(summary['empty'])}개, 실패 {len(summary['failed'])}개")
+    for key, err in sorted(summary["failed"].items()):
+        print(f"[ERROR]  - {key}: {err}", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="KRX 티커별 일별 시세를 DB에 저장"
     )
     parser.add_argument("--start", required=True,
-        help="조회 시작일 (YYYYMMDD)")
+        help="조회 시작일 (YYYYMMDD, 증분 모드에선 신규 티커의 시작일)")
     parser.add_argument("--end", required=True,
         help="조회 종료일 (YYYYMMDD)")
+    parser.add_argument("--workers", type=int, default=4,
+        help="동시 처리 워커 수 (1이면 순차 처리)")
+    parser.add_argument("--rate", type=float, default=5.0,
+        help="초당 최대 pykrx 호출 수 (전체 워커 공유)")
+    parser.add_argument("--retries", type=int, default=3,
+        help="티커별 재시도 횟수 (지수 백오프)")
+    parser.add_argument("--loader", choices=["copy", "upsert"], default="copy",
+        help="copy: 풀 연결 + COPY 스테이징 병합, upsert: 티커마다 연결해 execute_values")
+    parser.add_argument("--batch-size", type=int, default=50000,
+        help="copy 로더의 병합 단위 레코드 수")
+    parser.add_argument("--commit-every", type=int, default=1,
+        help="copy 로더가 몇 배치마다 커밋할지")
+    parser.add_argument("--incremental", action="store_true",
+        help="티커별 마지막 적재일 이후의 누락 영업일만 조회")
+    parser.add_argument("--mode", choices=["ticker", "date"], default="ticker",
+        help="ticker: 티커마다 기간 조회, date: 영업일마다 전 종목 스냅샷 조회")
+    parser.add_argument("--queue-size", type=int, default=8,
+        help="조회/변환/쓰기 단계 사이 큐 크기 (메모리 상한)")
+    parser.add_argument("--checkpoint", default=None,
+        help="체크포인트 파일 경로 (기본: data/checkpoints/insert_price_{mode}_{start}_{end}.json)")
+    parser.add_argument("--no-resume", action="store_true",
+        help="기존 체크포인트를 무시하고 처음부터 실행")
     args = parser.parse_args()
 
     # DB 연결정보 (환경 변수)
-    conn_params = {
-        "host":     os.getenv("PGHOST", "localhost"),
-        "port":     os.getenv("PGPORT", "5432"),
-        "dbname":   os.getenv("PGDATABASE", "postgres"),
-        "user":     os.getenv("PGUSER", "postgres"),
-        "password": os.getenv("PDB_KEY", ""),
-        "options":  "-c client_encoding=UTF8 -c lc_messages=C"
-    }
+    conn_params = get_conn_params()
 
     # 1) krx_tickers에서 티커 목록 읽기
     print("[INFO] krx_tickers 테이블에서 ticker 목록 조회...")
     tickers = fetch_tickers(conn_params)
     print(f"[INFO] 총 {len(tickers)}개 티커 조회됨.")
 
-    # 2) 각 티커별 OHLCV 조회 & DB 삽입
-    for tic in tickers:
-        print(f"[INFO] {tic} 시세 조회 ({args.start}~{args.end})...")
+    # 증분 모드: 이미 최신인 티커는 네트워크 호출 없이 건너뜀
+    starts = None
+    start, end = args.start, args.end
+    if args.incremental:
+        end = last_trading_day(args.end)
+        watermarks = fetch_watermarks(conn_params)
+        starts = plan_incremental(tickers, watermarks, args.start, end)
+        print(f"[INFO] 증분 모드: 마지막 영업일 {end}, 최신 상태 {len(tickers) - len(starts)}개 건너뜀, "
+              f"{len(starts)}개 티커 조회 필요.")
+        if args.mode == "ticker":
+            tickers = [tic for tic in tickers if tic in starts]
+        elif starts:
+            # 날짜 모드는 가장 뒤처진 티커의 시작일부터 전 종목을 함께 조회
+            start = min(starts.values())
+
+    # 체크포인트: 이미 커밋된 티커/날짜는 건너뛰고 이어서 실행
+    checkpoint_path = args.checkpoint or os.path.join(
+        "data", "checkpoints", f"insert_price_{args.mode}_{args.start}_{args.end}.json")
+    if args.no_resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path, {
+        "mode": args.mode, "start": args.start, "end": args.end, "incremental": args.incremental,
+    })
+    options = dict(workers=args.workers, rate=args.rate, retries=args.retries,
+                   queue_size=args.queue_size, on_done=checkpoint.stage, on_failed=checkpoint.discard)
+
+    # 적재 기간의 연도 파티션이 없으면 미리 생성
+    ensure_price_schema(conn_params, start, end)
+
+    # 2) fetch → convert → write 파이프라인으로 OHLCV 조회 & DB 삽입
+    if args.mode == "date":
+        dates = trading_days(start, end) if (starts is None or starts) else []
+        keys = [d for d in dates if not checkpoint.is_done(d)]
+        print(f"[INFO] 날짜 모드: {len(keys)}개 영업일 스냅샷 조회 ({start}~{end}, "
+              f"체크포인트로 {len(dates) - len(keys)}개 건너뜀), "
+              f"워커 {args.workers}개, 초당 {args.rate}회 제한...")
+
+        def ingest(write):
+            return ingest_dates(keys, write, tickers=tickers, **options)
+    else:
+        keys = [tic for tic in tickers if not checkpoint.is_done(tic)]
+        print(f"[INFO] 시세 조회 ({start}~{end}, 체크포인트로 {len(tickers) - len(keys)}개 건너뜀), "
+              f"워커 {args.workers}개, 초당 {args.rate}회 제한...")
+
+        def ingest(write):
+            return ingest_tickers(keys, start, end, write, starts=starts, **options)
+
+    if args.loader == "copy":
+        # 로더가 커밋할 때마다 그 시점까지 쓴 키를 체크포인트에 확정.
+        # 병합 재시도는 로더가 같은 배치로 하므로 파이프라인은 add를 다시 호출하지 않음
+        options["write_retries"] = 0
         try:
-            recs = fetch_ohlcv(tic, args.start, args.end)
-            if recs:
-                insert_prices(recs, conn_params)
-                print(f"[INFO]  → {len(recs)}건 삽입/업데이트 완료.")
-            else:
-                print("  → 데이터 없음, 건너뜀.")
-        except Exception as e:
-            print(f"[ERROR] {tic} 처리 중 오류: {e}", file=sys.stderr)
+            with PriceBulkLoader(conn_params, batch_size=args.batch_size,
+                                 commit_every=args.commit_every, on_commit=checkpoint.commit,
+                                 retries=args.retries) as loader:
+                summary = ingest(lambda key, recs: loader.add(recs, key=key))
+        except BulkLoadError as e:
+            # 마지막 배치(close)를 끝내 커밋하지 못함
+            for key in e.keys:
+                summary["success"].pop(key, None)
+                summary["failed"][key] = str(e)
+                checkpoint.discard(key)
+            print(f"[ERROR] 마지막 배치 적재 실패: {e}", file=sys.stderr)
+        print(f"[INFO] COPY 로더 커밋 완료: {loader.rows_written}건")
+        close_pools()
+    else:
+        def write(key, recs):
+            insert_prices(recs, conn_params)
+        options["on_done"] = lambda key: (checkpoint.stage(key), checkpoint.commit())
+        summary = ingest(write)
+    checkpoint.commit()
+    print_summary(summary, unit="영업일" if args.mode == "date" else "티커")
+    if not summary["failed"]:
+        checkpoint.clear()
+    else:
+        print(f"[INFO] 실패한 항목이 있어 체크포인트를 유지합니다: {checkpoint_path}")
 
 if __name__ == "__main__":
     main()
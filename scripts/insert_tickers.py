@@ -2,115 +2,61 @@
 
 import os
 import sys
+import argparse
 from datetime import datetime
 
 import pandas as pd
-import psycopg2
-from psycopg2.extras import execute_values
-from pykrx import stock
 
-
-def fetch_all_tickers(date: str) -> pd.DataFrame:
-    """
-    지정한 날짜(date, 'YYYYMMDD') 기준으로 KOSPI/KOSDAQ 티커와 마켓 정보를 DataFrame 으로 반환
-    """
-    all_data = []
-    markets = {
-        "KOSPI": "KOSPI",
-        "KOSDAQ": "KOSDAQ"
-    }
-
-    for market_name, market_code in markets.items():
-        try:
-            tickers = stock.get_market_ticker_list(market=market_code, date=date)
-        except Exception as e:
-            print(f"[WARN] get_market_ticker_list('{market_code}', '{date}') 예외: {e}", file=sys.stderr)
-            continue
-
-        for tic in tickers:
-            try:
-                name = stock.get_market_ticker_name(tic)
-                if not name:
-                    name = ""
-            except Exception:
-                name = ""
-            all_data.append({
-                "ticker": tic,
-                "name"  : name,
-                "market": market_name
-            })
-
-    df = pd.DataFrame(all_data, columns=["ticker", "name", "market"])
-    return df
+# scripts/ 에서 직접 실행해도 src 패키지를 찾을 수 있도록 프로젝트 루트를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.trading.db import close_pools, get_conn_params
+from src.trading.tickers import TickerNameCache, DEFAULT_CACHE_PATH, fetch_all_tickers, sync_tickers_table
 
 
 def insert_into_db(df: pd.DataFrame, conn_params: dict):
     """
-    DataFrame의 ticker/market을 PostgreSQL의 krx_tickers 테이블에 삽입.
+    DataFrame의 ticker/name/market을 PostgreSQL의 krx_tickers 테이블에 반영.
+    추가·변경·상장폐지된 티커만 한 트랜잭션으로 갱신한다.
     conn_params: dict with keys: host, port, dbname, user, password
     """
-    conn = None
     try:
-        conn = psycopg2.connect(**conn_params)
-        cur = conn.cursor()
-
-        # 1) 테이블 생성 (없으면)
-        create_sql = """
-        CREATE TABLE IF NOT EXISTS krx_tickers (
-            ticker VARCHAR(10) PRIMARY KEY,
-            name   VARCHAR(100) NOT null,
-            market VARCHAR(10) NOT NULL
-        );
-        """
-        cur.execute(create_sql)
-        conn.commit()
-
-        # 2) 기존 데이터 삭제 혹은 ON CONFLICT 처리
-        #    여기선 모든 데이터를 지우고 재삽입하는 예시
-        cur.execute("DELETE FROM krx_tickers;")
-        conn.commit()
-
-        # 3) DataFrame을 튜플 리스트로 변환 후 bulk insert
-        records = df.to_records(index=False)
-        values = [(r["ticker"], r["name"], r["market"]) for r in records]
-
-        insert_sql = """
-        INSERT INTO krx_tickers (ticker, name, market)
-        VALUES %s
-        ON CONFLICT (ticker) DO NOTHING;
-        """
-        execute_values(cur, insert_sql, values)
-        conn.commit()
-
-        print(f"[INFO] 총 {len(values)}개 레코드를 krx_tickers 테이블에 삽입했습니다.")
-
+        diff = sync_tickers_table(df, conn_params)
+        print(f"[INFO] krx_tickers 갱신: 추가 {len(diff['added'])}개, "
+              f"변경 {len(diff['changed'])}개, 상장폐지 {len(diff['delisted'])}개 "
+              f"(전체 {len(df)}개)")
     except Exception as e:
         print(f"[ERROR] DB 삽입 중 예외 발생: {e}", file=sys.stderr)
-    finally:
-        if conn:
-            conn.close()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="KOSPI/KOSDAQ 티커 목록을 krx_tickers 테이블에 동기화")
+    parser.add_argument("--workers", type=int, default=8,
+        help="종목명 병렬 조회 스레드 수")
+    parser.add_argument("--rate", type=float, default=10.0,
+        help="초당 최대 pykrx 호출 수")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+        help="종목명 캐시 파일 경로")
+    parser.add_argument("--cache-ttl-days", type=float, default=7,
+        help="종목명 캐시 유효 기간(일)")
+    args = parser.parse_args()
+
     # 1) 기준일자를 오늘로 지정 (원한다면 고정 날짜로 바꿔도 됨)
     today = datetime.today().strftime("%Y%m%d")
 
     print(f"[INFO] {today} 기준으로 KOSPI/KOSDAQ 티커 목록을 가져옵니다.")
-    df_tickers = fetch_all_tickers(date=today)
+    cache = TickerNameCache(args.cache, ttl=args.cache_ttl_days * 24 * 3600)
+    df_tickers = fetch_all_tickers(date=today, cache=cache, workers=args.workers, rate=args.rate)
     print(f"[INFO] 총 {len(df_tickers)}개 티커 데이터를 가져왔습니다.")
 
     # 2) DB 연결 정보 (환경 변수에서 불러오기)
-    conn_params = {
-        "host": os.getenv("PGHOST", "localhost"),
-        "port": os.getenv("PGPORT", "5432"),
-        "dbname": os.getenv("PGDATABASE", "postgres"),
-        "user": os.getenv("PGUSER", "postgres"),
-        "password": os.getenv("PDB_KEY", ""),
-    }
+    conn_params = get_conn_params()
 
-    # 3) 삽입 함수 호출
-    insert_into_db(df_tickers, conn_params)
+    # 3) 변경분만 반영 (끝나면 풀 연결을 닫아 서버 세션을 남기지 않음)
+    try:
+        insert_into_db(df_tickers, conn_params)
+    finally:
+        close_pools()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,24 @@
+import argparse
+import json
+from src.trading.model.artifacts import DEFAULT_REGISTRY, ModelRegistry
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 저장소 조회 스크립트 (Python 3.11.9 기준)")
+    parser.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="모델 저장소 디렉터리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="등록된 모델 버전 목록")
+    show = sub.add_parser("show", help="모델 버전의 manifest 출력")
+    show.add_argument("model", help="이름 또는 이름:버전 (예: rf_005930, rf_005930:2, 버전 생략 시 최신)")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    if args.command == "list":
+        table = registry.list()
+        print(table.to_string(index=False) if not table.empty else f"[INFO] No models registered in {args.registry}")
+        return
+    artifact = registry.load(args.model)
+    print(f"[INFO] {artifact.directory}")
+    print(json.dumps(artifact.manifest, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,65 @@
 import argparse
+import functools
+from src.trading.batch import is_up_to_date, resolve_inputs, run_batch
 from src.trading.feature_engineering import load_raw_csv, basic_preprocessing, calculate_technical_indicators, save_processed_csv
+from src.trading.feature_cache import FeatureCache
+from src.trading.price_repository import PriceRepository
+from src.trading.price_store import ticker_from_path
+
+@functools.lru_cache(maxsize=None)
+def _feature_cache(backend):
+    # 프로세스마다 한 번만 생성 (캐시 디렉터리 색인을 입력마다 다시 읽지 않도록)
+    return FeatureCache(backend=backend)
+
+@functools.lru_cache(maxsize=None)
+def _repository(compact):
+    return PriceRepository(compact=compact)
+
+def preprocess_one(source: str, from_db=False, backend=None, compact=False, use_cache=True) -> int:
+    """ 입력 하나(티커 또는 raw CSV)를 전처리·지표 계산해 processed 저장소에 저장. 반환: 저장한 행 수 """
+    print(f"[INFO] Loading raw data from {source}...")
+    repository = _repository(compact) if from_db else None
+    df_raw = load_raw_csv(source, repository=repository, compact=compact)
+    if not use_cache:
+        df_feat = calculate_technical_indicators(basic_preprocessing(df_raw), backend=backend)
+    else:
+        # 입력·지표 설정·코드가 같으면 저장된 결과를, 새 봉만 붙었으면 그 부분만 계산
+        cache = _feature_cache(backend)
+        df_feat = cache.features(df_raw, name=ticker_from_path(source))
+        print(f"[INFO] Feature cache: {cache.stats}")
+    save_processed_csv(df_feat, source)
+    return len(df_feat)
 
 def main():
     parser = argparse.ArgumentParser(description="데이터 전처리 및 기술적 지표 계산 스크립트 (Python 3.11.9 기준)")
-    parser.add_argument("--input", type=str, required=True, help="raw CSV 파일 경로 (예: data/raw/005930.KS_20250603_153012.csv)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--input", type=str, help="티커(예: 005930) 또는 raw CSV 파일 경로 (예: data/raw/005930.KS_20250603_153012.csv)")
+    target.add_argument("--batch", nargs="+", metavar="SPEC",
+                        help="일괄 처리: 디렉터리(예: data/store/raw, data/raw), glob 패턴, 또는 쉼표로 구분한 티커 목록")
+    parser.add_argument("--from-db", action="store_true", help="티커의 시세를 krx_daily_price에서 읽기")
+    parser.add_argument("--backend", choices=["pandas", "numpy", "ta"], default=None,
+                        help="지표 계산 backend (기본: config.yaml의 features.backend, 없으면 pandas)")
+    parser.add_argument("--compact", action="store_true",
+                        help="float32 가격·특징, 최소 폭 정수, category 문자열로 읽고 계산 (메모리 절약)")
+    parser.add_argument("--no-cache", action="store_true", help="특징 캐시(data/cache/features)를 쓰지 않고 항상 다시 계산")
+    parser.add_argument("--workers", type=int, default=None, help="--batch 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunksize", type=int, default=None, help="--batch 워커에 한 번에 넘길 입력 수")
+    parser.add_argument("--force", action="store_true", help="--batch에서 processed 결과가 최신인 입력도 다시 처리")
     args = parser.parse_args()
+    options = dict(from_db=args.from_db, backend=args.backend, compact=args.compact, use_cache=not args.no_cache)
+
+    if args.input:
+        preprocess_one(args.input, **options)
+        return
 
-    print(f"[INFO] Loading raw data from {args.input}...")
-    df_raw = load_raw_csv(args.input)
-    df_clean = basic_preprocessing(df_raw)
-    df_feat = calculate_technical_indicators(df_clean)
-    save_processed_csv(df_feat, args.input)
+    sources = resolve_inputs(args.batch)
+    # DB 입력은 수정 시각을 알 수 없으므로 항상 처리
+    skipped = set() if args.force or args.from_db else {s for s in sources if is_up_to_date(s)}
+    todo = [s for s in sources if s not in skipped]
+    print(f"[INFO] {len(sources)} inputs: {len(todo)} to process, {len(skipped)} up to date")
+    summary = run_batch(preprocess_one, todo, workers=args.workers, chunksize=args.chunksize, **options)
+    print(f"[INFO] Done: {len(summary['success'])} processed, {len(skipped)} skipped, "
+          f"{len(summary['failed'])} failed {sorted(summary['failed']) or ''}")
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,34 @@ from PyQt5.QtWidgets import QApplication
 import sys
 import os
 from src.config import KIWOOM_ID, KIWOOM_PW
+from src.trading.feature_engineering import basic_preprocessing
+from src.trading.incremental import IndicatorState
+from src.trading.price_store import load_prices
+
+STATE_PATH = os.path.join("data", "state", "indicators_005930.json")
+
+
+def load_indicator_state(ticker: str, path: str) -> IndicatorState:
+    """
+    저장된 지표 상태를 복원하고 그 이후 저장소에 쌓인 일봉만 이어서 반영한다.
+    상태 파일이 없으면 저장된 일봉 전체로 새로 채운다.
+    모델 학습용 특징(FeatureCache._compute)과 같은 이력에서 시작하도록 basic_preprocessing을 거친 종가를 쓴다
+    (이상치 제거가 전체 기간 통계를 쓰므로 전처리는 전체 이력에 하고 새 일봉만 골라냄).
+    """
+    df = basic_preprocessing(load_prices(ticker))
+    state = IndicatorState.load(path) if os.path.exists(path) else None
+    # 저장된 상태가 같은 전처리 이력으로 만든 것이 아니면(전처리 전 종가로 채운 예전 상태 등) 처음부터 다시 채움
+    if state is not None and state.last_date is not None and (df.index <= state.last_date).sum() != state.bars:
+        print(f"[WARN] {path}의 지표 상태가 전처리한 일봉 이력과 맞지 않아 다시 계산합니다.")
+        state = None
+    if state is None:
+        state = IndicatorState()
+    elif state.last_date is not None:
+        df = df[df.index > state.last_date]
+    for date, close in zip(df.index, df["Close"]):
+        state.update(close, date=date.date())
+    state.save(path)
+    return state
 
 class RealTimeApp:
     def __init__(self):
@@ -17,11 +45,17 @@ class RealTimeApp:
         self.kiwoom.OnReceiveRealData.connect(self.on_receive_realdata)
         # SCR1 윈도우로 삼성전자(005930) 현재가(10)·체결량(15) 실시간 등록
         self.kiwoom.SetRealReg("SCR1", "005930", "10;15", "0")
+        # 일봉 지표 상태: 체결마다 현재가를 오늘 종가로 가정해 O(1)로 지표 계산
+        self.indicators = load_indicator_state("005930", STATE_PATH)
 
     def on_receive_realdata(self, screen_no, real_type, real_data):
         price = self.kiwoom.GetCommRealData("005930", 10)   # 10: 현재가
         volume = self.kiwoom.GetCommRealData("005930", 15)  # 15: 체결량
         print(f"[REALTIME] 현재가: {price} KRW, 체결량: {volume}")
+        # 현재가는 '+71000'/'-71000'처럼 전일 대비 부호가 붙어 온다
+        live = self.indicators.peek(abs(float(price)))
+        print(f"[REALTIME] MA20: {live['MA20']:.1f}, RSI14: {live['RSI14']:.1f}, "
+              f"MACD: {live['MACD']:.2f}/{live['MACD_signal']:.2f}")
 
     def run(self):
         sys.exit(self.app.exec_())
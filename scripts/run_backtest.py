@@ -1,12 +1,25 @@
 import argparse
 from src.trading.backtesting import run_backtest
+from src.trading.feature_cache import FeatureCache
+from src.trading.model.artifacts import DEFAULT_REGISTRY
+from src.trading.price_repository import PriceRepository
 
 def main():
     parser = argparse.ArgumentParser(description="백테스트 실행 스크립트 (Python 3.11.9 기준)")
-    parser.add_argument("--model", type=str, required=True, help="models 폴더 내 모델 파일 이름 (예: random_forest_model.pkl)")
+    parser.add_argument("--model", type=str, required=True,
+                        help="models 폴더 내 모델 파일 이름 (예: random_forest_model.pkl), 아티팩트 디렉터리, "
+                             "또는 모델 저장소의 이름[:버전] (예: rf_005930:2)")
+    parser.add_argument("--ticker", type=str, default=None, help="가격 저장소의 processed 데이터를 사용할 티커 (예: 005930)")
+    parser.add_argument("--from-db", action="store_true", help="krx_daily_price 시세로 지표를 계산해 백테스트 (--ticker 필요)")
+    parser.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="--model을 찾을 모델 저장소 디렉터리")
+    parser.add_argument("--no-plot", action="store_true", help="끝난 뒤 차트를 띄우지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="--from-db 사용 시 특징 캐시를 쓰지 않고 항상 다시 계산")
     args = parser.parse_args()
 
-    run_backtest(args.model)
+    repository = PriceRepository() if args.from_db else None
+    feature_cache = None if args.no_cache else FeatureCache()
+    run_backtest(args.model, ticker=args.ticker, repository=repository, feature_cache=feature_cache,
+                 registry_root=args.registry, plot=not args.no_plot)
 
 if __name__ == "__main__":
     main()
@@ -1,56 +1,152 @@
 import argparse
+import os
+import time
+import json
 import pandas as pd
-import numpy as np
-from src.trading.model.ml_models import RandomForestModel, XGBoostModel, LightGBMModel
+from src.trading.batch import limit_threads, plan_parallelism, resolve_inputs, run_batch
+from src.trading.indicators import model_features
+from src.trading.model.artifacts import DEFAULT_REGISTRY, ModelRegistry
+from src.trading.model.dataset import features_and_target, train_split_index
+from src.trading.model.dataset_cache import DEFAULT_CACHE_DIR, data_hash, process_cache
+from src.trading.model.ml_models import build_model
+from src.trading.model.validation import MODES, summarize_folds, walk_forward
+from src.trading.price_store import ticker_from_path
 
-def load_processed_csv(file_path: str) -> pd.DataFrame:
-    return pd.read_csv(file_path, index_col=0, parse_dates=True)
+# 단일 학습(--input) 결과 파일 (백테스트 기본 경로와 같음)
+MODEL_FILES = {"rf": "random_forest_model.pkl", "xgb": "xgboost_model.pkl", "lgb": "lightgbm_model.pkl"}
 
-def create_target(df: pd.DataFrame):
-    # 내일 종가 상승 여부 이진 분류 (1: 상승, 0: 하락/보합)
-    df['Target'] = np.where(df['Adj Close'].shift(-1) > df['Adj Close'], 1, 0)
-    df.dropna(subset=['Target'], inplace=True)
-    return df
+def train_one(source: str, model_type: str = "rf", output: str = None, output_dir: str = None, n_jobs=None,
+              params: dict = None, dataset_cache_dir: str = None, registry_root: str = None) -> dict:
+    """
+    processed 데이터 하나(티커 또는 CSV)로 모델을 학습·평가하고 저장.
+    output을 생략하면 output_dir/{티커}.pkl 에 저장한다. params: 기본 설정을 덮어쓸 하이퍼파라미터
+    dataset_cache_dir: xgb/lgb 학습 데이터셋 캐시 디렉터리 (None이면 매번 새로 구성)
+    registry_root: 모델 저장소 디렉터리. 있으면 "{모델}_{티커}" 이름의 새 버전 아티팩트로도 등록
+    반환: 지표와 학습 시간 등 요약 dict
+    """
+    print(f"[INFO] Loading processed data from {source}...")
+    X, y, dates = features_and_target(source)
+
+    # 시계열 특성: 앞 80%를 학습, 뒤 20%를 테스트 (shuffle=False)
+    split_idx = train_split_index(len(X))
+    X_train, X_test = X[:split_idx], X[split_idx:]
+    y_train, y_test = y[:split_idx], y[split_idx:]
+
+    dataset_cache = process_cache(dataset_cache_dir) if dataset_cache_dir else None
+    model = build_model(model_type, n_jobs=n_jobs, params=params, dataset_cache=dataset_cache)
+    X_train_scaled, X_test_scaled = model.scale(X_train, X_test)
+    start = time.perf_counter()
+    # 조기 종료는 학습 구간 끝부분으로 검증 (테스트 구간은 평가에만 사용)
+    model.fit(X_train_scaled, y_train)
+    train_seconds = time.perf_counter() - start
+    accuracy = model.evaluate(X_test_scaled, y_test)
+
+    output = output or os.path.join(output_dir, f"{ticker_from_path(source)}.pkl")
+    model.save(output)
+    result = {"model": model_type, "accuracy": accuracy, "train_rows": len(X_train), "test_rows": len(X_test),
+              "train_seconds": train_seconds, "path": output}
+    if registry_root:
+        window = {"start": str(pd.Timestamp(dates[0]).date()), "end": str(pd.Timestamp(dates[split_idx - 1]).date()),
+                  "rows": len(X_train)}
+        version, path = ModelRegistry(registry_root).register(
+            f"{model_type}_{ticker_from_path(source)}", model, features=model_features(),
+            data_hash=data_hash(X_train, y_train), metrics={"accuracy": accuracy}, train_window=window)
+        result.update(version=version, artifact=path)
+    return result
+
+def summary_table(summary: dict) -> pd.DataFrame:
+    """ run_batch 결과 → 티커별 요약 표 (실패한 티커는 error 컬럼에 사유) """
+    rows = [{"ticker": ticker_from_path(src), **result, "seconds": summary["seconds"][src]}
+            for src, result in summary["success"].items()]
+    rows += [{"ticker": ticker_from_path(src), "error": error, "seconds": summary["seconds"][src]}
+             for src, error in summary["failed"].items()]
+    return pd.DataFrame(rows).sort_values("ticker").reset_index(drop=True)
+
+def train_batch(specs, model_type: str = "rf", output_dir: str = None, workers: int = None, threads: int = None,
+                params: dict = None, dataset_cache_dir: str = None, registry_root: str = None):
+    """
+    --batch: specs(resolve_inputs 형식)의 티커마다 train_one을 프로세스 풀에서 실행하고
+    output_dir(기본: models/{model})에 {티커}.pkl과 summary.csv 저장.
+    반환: 티커별 요약 표 (입력이 하나도 없으면 None)
+    """
+    sources = resolve_inputs(specs)
+    if not sources:
+        print(f"[ERROR] No inputs found for {' '.join(specs)}")
+        return None
+    output_dir = output_dir or os.path.join("models", model_type)
+    # 프로세스 수 × 모델 내부 스레드 수가 코어 수를 넘지 않게 분배
+    workers, threads = plan_parallelism(len(sources), workers, threads)
+    print(f"[INFO] Training {len(sources)} {model_type} models: {workers} processes x {threads} threads")
+    summary = run_batch(train_one, sources, workers=workers, initializer=limit_threads, initargs=(threads,),
+                        model_type=model_type, output_dir=output_dir, n_jobs=threads, params=params,
+                        dataset_cache_dir=dataset_cache_dir, registry_root=registry_root)
+
+    table = summary_table(summary)
+    os.makedirs(output_dir, exist_ok=True)
+    table_path = os.path.join(output_dir, "summary.csv")
+    table.to_csv(table_path, index=False)
+    print(table.to_string(index=False))
+    print(f"[INFO] {len(summary['success'])} trained, {len(summary['failed'])} failed. Summary saved to {table_path}")
+    return table
+
+def cross_validate(source: str, model_type: str, args, params: dict = None):
+    """ walk-forward 교차 검증 결과를 폴드별 표와 집계로 출력 (--cv-output이 있으면 CSV 저장) """
+    X, y, dates = features_and_target(source)
+    folds = walk_forward(X, y, model_type, n_folds=args.cv, mode=args.cv_mode, train_size=args.train_size,
+                         test_size=args.test_size, gap=args.gap, workers=args.workers, threads=args.threads,
+                         params=params, dataset_cache_dir=args.dataset_cache_dir)
+    folds.insert(1, "train_from", dates[folds["train_start"]])
+    folds.insert(2, "test_from", dates[folds["test_start"]])
+    folds.insert(3, "test_to", dates[folds["test_end"] - 1])
+    print(folds.drop(columns=["train_start", "train_end", "test_start", "test_end"]).to_string(index=False))
+    stats = summarize_folds(folds)
+    print("[RESULT] " + ", ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items()))
+    if args.cv_output:
+        folds.to_csv(args.cv_output, index=False)
+        print(f"[INFO] Fold results saved to {args.cv_output}")
+    return folds
 
 def main():
     parser = argparse.ArgumentParser(description="모델 학습 스크립트 (Python 3.11.9 기준)")
-    parser.add_argument("--input", type=str, required=True, help="processed CSV 파일 경로")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--input", type=str, help="티커(예: 005930) 또는 processed CSV 파일 경로")
+    target.add_argument("--batch", nargs="+", metavar="SPEC",
+                        help="티커별 일괄 학습: 디렉터리(예: data/store/processed), glob 패턴, 또는 쉼표로 구분한 티커 목록")
     parser.add_argument("--model", type=str, choices=["rf","xgb","lgb"], default="rf", help="학습할 모델 종류")
+    parser.add_argument("--output-dir", type=str, default=None, help="--batch 모델 저장 폴더 (기본: models/{model})")
+    parser.add_argument("--workers", type=int, default=None, help="--batch/--cv 동시 학습 프로세스 수 (기본: 코어 수에 맞춰 자동)")
+    parser.add_argument("--threads", type=int, default=None, help="모델 하나의 내부 스레드 수 (기본: 코어 수 / 프로세스 수)")
+    parser.add_argument("--params", type=str, default=None, help="하이퍼파라미터 JSON 파일 (tune_model.py 결과)")
+    parser.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="학습한 모델을 버전별 아티팩트로 등록할 모델 저장소")
+    parser.add_argument("--no-registry", action="store_true", help="모델 저장소에 등록하지 않음 (pickle만 저장)")
+    parser.add_argument("--no-dataset-cache", action="store_true", help=f"xgb/lgb 학습 데이터셋 캐시({DEFAULT_CACHE_DIR})를 쓰지 않음")
+    parser.add_argument("--cv", type=int, default=None, metavar="N", help="--input 데이터로 N폴드 walk-forward 교차 검증 (폴드 병렬 실행)")
+    parser.add_argument("--cv-mode", choices=MODES, default="expanding", help="학습 구간 방식: expanding(시작 고정) | sliding(길이 고정)")
+    parser.add_argument("--train-size", type=int, default=None, help="첫 폴드(sliding은 모든 폴드)의 학습 행 수")
+    parser.add_argument("--test-size", type=int, default=None, help="폴드당 테스트 행 수")
+    parser.add_argument("--gap", type=int, default=0, help="학습 끝과 테스트 시작 사이에 버리는 행 수")
+    parser.add_argument("--cv-output", type=str, default=None, help="폴드별 결과 CSV 저장 경로")
     args = parser.parse_args()
+    args.dataset_cache_dir = None if args.no_dataset_cache else DEFAULT_CACHE_DIR
+    registry_root = None if args.no_registry else args.registry
+    params = None
+    if args.params:
+        with open(args.params, encoding="utf-8") as f:
+            params = json.load(f)
 
-    print(f"[INFO] Loading processed data from {args.input}...")
-    df = load_processed_csv(args.input)
-    df = create_target(df)
+    if args.cv:
+        if not args.input:
+            parser.error("--cv는 --input과 함께 사용")
+        cross_validate(args.input, args.model, args, params)
+        return
 
-    features = ['MA20','MA60','RSI14','MACD_signal','Volume']
-    X = df[features].values
-    y = df['Target'].values
-
-    # 시계열 특성: 80%를 학습, 20%를 테스트 (shuffle=False)
-    split_idx = int(len(df) * 0.8)
-    X_train, X_test = X[:split_idx], X[split_idx:]
-    y_train, y_test = y[:split_idx], y[split_idx:]
+    if args.input:
+        train_one(args.input, args.model, output=os.path.join("models", MODEL_FILES[args.model]), n_jobs=args.threads,
+                  params=params, dataset_cache_dir=args.dataset_cache_dir, registry_root=registry_root)
+        return
 
-    if args.model == "rf":
-        model = RandomForestModel(n_estimators=100)
-        X_train_scaled, X_test_scaled = model.scale(X_train, X_test)
-        model.train(X_train_scaled, y_train)
-        model.evaluate(X_test_scaled, y_test)
-        model.save("models/random_forest_model.pkl")
-
-    elif args.model == "xgb":
-        model = XGBoostModel(params={"objective": "binary:logistic", "eval_metric": "error"})
-        X_train_scaled, X_test_scaled = model.scaler.fit_transform(X_train), model.scaler.transform(X_test)
-        model.train(X_train_scaled, y_train, X_val=X_test_scaled, y_val=y_test)
-        model.evaluate(X_test_scaled, y_test)
-        model.save("models/xgboost_model.pkl")
-
-    else:  # lightgbm
-        model = LightGBMModel(params={"objective": "binary", "metric": "binary_error"})
-        X_train_scaled, X_test_scaled = model.scaler.fit_transform(X_train), model.scaler.transform(X_test)
-        model.train(X_train_scaled, y_train, X_val=X_test_scaled, y_val=y_test)
-        model.evaluate(X_test_scaled, y_test)
-        model.save("models/lightgbm_model.pkl")
+    train_batch(args.batch, args.model, output_dir=args.output_dir, workers=args.workers, threads=args.threads,
+                params=params, dataset_cache_dir=args.dataset_cache_dir, registry_root=registry_root)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
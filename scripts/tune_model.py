@@ -0,0 +1,52 @@
+import argparse
+import json
+import os
+from src.trading.model import dataset_cache
+from src.trading.model.dataset import training_window
+from src.trading.model.search import DEFAULT_CACHE_DIR, RESOURCES, best_params, search
+from src.trading.price_store import ticker_from_path
+
+def main():
+    parser = argparse.ArgumentParser(description="하이퍼파라미터 탐색 스크립트 (successive halving / Hyperband, Python 3.11.9 기준)")
+    parser.add_argument("--input", type=str, required=True, help="티커(예: 005930) 또는 processed CSV 파일 경로")
+    parser.add_argument("--model", type=str, choices=["rf","xgb","lgb"], default="rf", help="탐색할 모델 종류")
+    parser.add_argument("--method", choices=["halving", "hyperband"], default="halving", help="탐색 방식")
+    parser.add_argument("--candidates", type=int, default=27, help="halving: 처음 평가할 후보 수")
+    parser.add_argument("--eta", type=int, default=3, help="rung마다 남길 비율의 역수 (예산도 eta배씩 증가)")
+    parser.add_argument("--resource", choices=RESOURCES, default=None, help="예산 단위: rows(최근 학습 행 수) | rounds(트리·부스팅 라운드 수, 기본)")
+    parser.add_argument("--min-budget", type=int, default=None, help="가장 작은 예산 (행 수 또는 라운드 수)")
+    parser.add_argument("--max-budget", type=int, default=None, help="가장 큰 예산 (기본: 학습 구간 전체 행 또는 300 라운드)")
+    parser.add_argument("--valid-fraction", type=float, default=0.2, help="후보 비교에 쓰는 학습 구간 끝부분 비율")
+    parser.add_argument("--workers", type=int, default=None, help="동시 시험 프로세스 수 (기본: 코어 수에 맞춰 자동)")
+    parser.add_argument("--threads", type=int, default=None, help="시험 하나의 모델 내부 스레드 수")
+    parser.add_argument("--seed", type=int, default=0, help="후보 추출 시드")
+    parser.add_argument("--no-cache", action="store_true", help=f"시험 결과 메모({DEFAULT_CACHE_DIR})를 쓰지 않음")
+    parser.add_argument("--no-dataset-cache", action="store_true",
+                        help=f"xgb/lgb 학습 데이터셋 캐시({dataset_cache.DEFAULT_CACHE_DIR})를 쓰지 않음")
+    parser.add_argument("--output", type=str, default=None,
+                        help="최적 파라미터 JSON 저장 경로 (기본: models/{model}_{티커}_params.json, train_model.py --params로 사용)")
+    args = parser.parse_args()
+
+    # train_model의 테스트 세트·백테스트 구간(뒤 20%)은 빼고 학습 구간 안에서만 후보를 비교
+    X, y, _ = training_window(args.input)
+    results = search(X, y, args.model, method=args.method, n_candidates=args.candidates, eta=args.eta,
+                     resource=args.resource, min_budget=args.min_budget, max_budget=args.max_budget,
+                     valid_fraction=args.valid_fraction, workers=args.workers, threads=args.threads,
+                     cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR, seed=args.seed,
+                     dataset_cache_dir=None if args.no_dataset_cache else dataset_cache.DEFAULT_CACHE_DIR)
+
+    top = results.sort_values(["budget", "accuracy"], ascending=False).head(10)
+    print(top[["bracket", "rung", "budget", "accuracy", "train_seconds", "cached", "params"]].to_string(index=False))
+    print(f"[RESULT] {len(results)} trials ({int(results['cached'].sum())} from cache), "
+          f"training time {results['train_seconds'].sum():.2f}s")
+
+    params = best_params(results)
+    output = args.output or os.path.join("models", f"{args.model}_{ticker_from_path(args.input)}_params.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(params, f, indent=2)
+    print(f"[RESULT] Best params: {params}")
+    print(f"[INFO] Saved best params to {output}")
+
+if __name__ == "__main__":
+    main()
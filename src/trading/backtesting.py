@@ -1,69 +1,120 @@
 import backtrader as bt
-import pickle
+import numpy as np
 import pandas as pd
 import os
 
+from src.trading.feature_engineering import load_raw_csv, basic_preprocessing, calculate_technical_indicators
+from src.trading.indicators import model_features
+from src.trading.model.artifacts import DEFAULT_REGISTRY, MANIFEST, ModelRegistry, load_artifact
+from src.trading.model.dataset import train_split_index
+from src.trading.model.ml_models import load_model
+from src.trading.price_store import load_prices
+
 
 class MLStrategy(bt.Strategy):
+    """
+    미리 계산한 신호(compute_signals)로 매매하는 전략. next()는 현재 봉 위치의 신호만 읽고 모델을 부르지 않는다.
+    - signals: 데이터 피드 행마다 1(매수·보유) / 0(청산) / -1(거래하지 않음) 시퀀스
+    """
     params = (
-        ("model_path", ""),
-        ("features", []),
-        ("split_idx", 0),
+        ("signals", None),
         ("position_size", 100),
     )
 
     def __init__(self):
-        # 모델과 스케일러 로드
-        with open(self.params.model_path, "rb") as f:
-            loaded = pickle.load(f)
-        self.model = loaded["model"]
-        self.scaler = loaded["scaler"]
-
-        # processed CSV 전체 로드
-        csv_path = self.params.model_path.replace("models\\", "data\\processed\\").replace(".pkl", "_processed.csv")
-        self.df = pd.read_csv(csv_path, index_col=0, parse_dates=True).reset_index()
-        self.current_idx = self.params.split_idx
+        # 봉마다 numpy 원소를 꺼내는 것보다 파이썬 리스트 인덱싱이 빠름
+        self.signals = np.asarray(self.params.signals).tolist()
 
     def next(self):
-        if self.current_idx >= len(self.df):
-            return
-
-        # 현재 pandas 인덱스 기준 행 추출
-        data_row = self.df.loc[self.current_idx, self.params.features].values.reshape(1, -1)
-        scaled_row = self.scaler.transform(data_row)
-        pred = self.model.predict(scaled_row)[0]
-
-        if not self.position and pred == 1:
+        # len(self): 지금까지 처리한 봉 수 → 현재 봉의 데이터 피드 행 번호는 len(self) - 1
+        signal = self.signals[len(self) - 1]
+        if signal == 1 and not self.position:
             self.buy(size=self.params.position_size)
-        elif self.position and pred == 0:
+        elif signal == 0 and self.position:
             self.sell(size=self.params.position_size)
 
-        self.current_idx += 1
 
+def load_signal_model(model: str, registry_root: str = DEFAULT_REGISTRY):
+    """
+    백테스트에 쓸 모델 열기.
+    - model: models 폴더의 pickle 파일 이름(또는 경로), 아티팩트 디렉터리, 레지스트리 모델 "이름[:버전]"
+    반환: (predict, features, source)
+    - predict:  스케일하지 않은 원래 특징 값 배열 → 0/1 예측 배열
+    - features: 모델 입력 특징 목록 (아티팩트 manifest에 없으면 None)
+    - source:   ticker를 주지 않았을 때 읽을 processed 데이터 (load_prices의 source)
+    """
+    path = model if os.path.exists(model) else os.path.join("models", model)
+    if os.path.isfile(path):
+        loaded = load_model(path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        source = os.path.join("data", "processed", f"{stem}_processed.csv")
+        return lambda X: loaded.predict(loaded.scaler.transform(X)), None, source
+    if os.path.isfile(os.path.join(model, MANIFEST)):
+        artifact = load_artifact(model)
+        name = os.path.basename(os.path.dirname(os.path.abspath(model)))
+    else:
+        artifact = ModelRegistry(registry_root).load(model)
+        name = model.split(":", 1)[0]
+    # 레지스트리 이름 규칙: {모델 종류}_{티커} (scripts/train_model.py)
+    prefix = f"{artifact.model_type}_"
+    source = name[len(prefix):] if name.startswith(prefix) else name
+    return artifact.predict, artifact.features, source
+
+
+def compute_signals(predict, df: pd.DataFrame, features, start: int) -> np.ndarray:
+    """
+    백테스트 구간(start 행부터)의 매매 신호를 한 번의 배치 예측으로 계산.
+    반환: df 행마다 1/0 예측, start 이전(학습 구간)은 -1인 int8 배열 (MLStrategy의 signals)
+    """
+    signals = np.full(len(df), -1, dtype=np.int8)
+    if start < len(df):
+        signals[start:] = predict(df[list(features)].iloc[start:].to_numpy(dtype=np.float64))
+    return signals
 
-def run_backtest(model_filename: str, cash=10000000, commission=0.001):
+
+def run_backtest(model: str, ticker: str = None, cash=10000000, commission=0.001,
+                 repository=None, feature_cache=None, registry_root: str = DEFAULT_REGISTRY, plot: bool = True):
     """
-    model_filename: models 폴더 내 pickle 파일 이름 (예: random_forest_model.pkl)
+    model: models 폴더 내 pickle 파일 이름 (예: random_forest_model.pkl), 아티팩트 디렉터리,
+           또는 모델 저장소의 "이름[:버전]" (예: rf_005930, rf_005930:2)
+    ticker: 가격 저장소의 processed 데이터를 쓸 티커. 없으면 모델 이름으로 정함
+            (pickle: data/processed/{파일 이름}_processed.csv, 저장소 모델: 이름의 티커 부분)
+    repository: PriceRepository를 넘기면 krx_daily_price의 ticker 시세로 지표를 계산해 사용
+    feature_cache: FeatureCache를 넘기면 repository 시세의 지표 계산 결과를 캐시에서 재사용
+    plot: 끝난 뒤 차트 표시
+    반환: 최종 포트폴리오 가치
     """
-    cerebro = bt.Cerebro()
-    model_path = os.path.join("models", model_filename)
-    processed_csv = model_path.replace("models\\", "data\\processed\\").replace(".pkl", "_processed.csv")
-    df = pd.read_csv(processed_csv, index_col=0, parse_dates=True)
+    predict, features, source = load_signal_model(model, registry_root)
+    features = features or model_features()
+    if repository is not None:
+        if ticker is None:
+            raise ValueError("ticker is required when backtesting from a PriceRepository")
+        raw = load_raw_csv(ticker, repository=repository)
+        if feature_cache is not None:
+            df = feature_cache.features(raw, name=ticker)
+        else:
+            # 모델이 쓰는 지표만 계산
+            df = calculate_technical_indicators(basic_preprocessing(raw), columns=features)
+    else:
+        df = load_prices(ticker or source, dataset="processed")
 
-    data_feed = bt.feeds.PandasData(dataname=df)
-    cerebro.adddata(data_feed)
+    # 뒤 20%(train_model의 테스트 구간)의 신호를 한 번에 예측 (봉마다 모델을 부르지 않음)
+    split_idx = train_split_index(len(df))
+    signals = compute_signals(predict, df, features, split_idx)
+
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
     cerebro.broker.setcash(cash)
     cerebro.broker.setcommission(commission=commission)
-
-    split_idx = int(len(df) * 0.8)
-    features = ['MA20', 'MA60', 'RSI14', 'MACD_signal', 'Volume']
-
-    cerebro.addstrategy(MLStrategy, model_path=model_path, features=features, split_idx=split_idx)
+    cerebro.addstrategy(MLStrategy, signals=signals)
     print(f"[INFO] Starting Portfolio Value: {cerebro.broker.getvalue():,.0f} KRW")
     cerebro.run()
-    print(f"[INFO] Final Portfolio Value:   {cerebro.broker.getvalue():,.0f} KRW")
-    cerebro.plot()
+    value = cerebro.broker.getvalue()
+    print(f"[INFO] Final Portfolio Value:   {value:,.0f} KRW")
+    if plot:
+        cerebro.plot()
+    return value
 
 
 if __name__ == "__main__":
-    run_backtest("random_forest_model.pkl")
\ No newline at end of file
+    run_backtest("random_forest_model.pkl")
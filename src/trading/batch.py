@@ -0,0 +1,136 @@
+# src/trading/batch.py
+import functools
+import gc
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.trading.price_store import DEFAULT_ROOT, PriceStore, ticker_from_path
+
+
+def resolve_inputs(specs, root: str = DEFAULT_ROOT) -> list:
+    """
+    일괄 처리 입력 목록 만들기 (순서 유지, 중복 제거).
+    spec 하나는 다음 중 하나이며, 쉼표로 여러 개를 이어 쓸 수 있다.
+    - 디렉터리: 가격 저장소 디렉터리(ticker=... 하위 폴더, 예: data/store/raw)면 그 티커 전체,
+                아니면 안의 *.csv 파일 전체
+    - glob 패턴: 예) data/raw/0059*.csv, data/store/raw/ticker=00*
+    - 티커 또는 파일 경로 하나
+    """
+    found = []
+    for spec in specs:
+        for part in (p.strip() for p in spec.split(",")):
+            if not part:
+                continue
+            if os.path.isdir(part):
+                names = sorted(os.listdir(part))
+                if any(name.startswith("ticker=") for name in names):
+                    found += [name.split("=", 1)[1] for name in names if name.startswith("ticker=")]
+                else:
+                    found += [os.path.join(part, name) for name in names if name.endswith(".csv")]
+            elif glob.has_magic(part):
+                for path in sorted(glob.glob(part)):
+                    name = os.path.basename(path.rstrip(os.sep))
+                    found.append(name.split("=", 1)[1] if name.startswith("ticker=") else path)
+            else:
+                found.append(part)
+    return list(dict.fromkeys(found))
+
+
+def is_up_to_date(source: str, root: str = DEFAULT_ROOT) -> bool:
+    """ source(티커 또는 raw CSV)의 processed 결과가 raw 데이터보다 나중에 저장됐는지 """
+    ticker = ticker_from_path(source)
+    done = PriceStore(root, "processed").last_modified(ticker)
+    if done is None:
+        return False
+    if source.endswith(".csv") and os.path.exists(source):
+        changed = os.path.getmtime(source)
+    else:
+        changed = PriceStore(root, "raw").last_modified(ticker)
+    return changed is not None and done >= changed
+
+
+def plan_parallelism(n_tasks: int, workers: int = None, threads: int = None, cores: int = None):
+    """
+    CPU 코어를 프로세스 수(바깥 병렬)와 작업당 스레드 수(안쪽 병렬: RF n_jobs, XGBoost nthread,
+    LightGBM num_threads)로 나눈다. 두 곱이 코어 수를 넘지 않게 해 과다 구독(oversubscription)을 막는다.
+    - 둘 다 생략: 작업이 코어보다 많으면 (코어 수, 1), 적으면 (작업 수, 남는 코어를 나눈 스레드 수)
+    - 하나만 주면 나머지를 코어 수에 맞춰 정함
+    반환: (workers, threads)
+    """
+    cores = cores or os.cpu_count() or 1
+    n_tasks = max(1, n_tasks)
+    if workers is None and threads is None:
+        workers = min(n_tasks, cores)
+    if workers is None:
+        workers = max(1, min(n_tasks, cores // threads))
+    workers = max(1, min(workers, n_tasks))
+    if threads is None:
+        threads = max(1, cores // workers)
+    return workers, threads
+
+
+def limit_threads(threads: int):
+    """ 워커 프로세스의 BLAS/OpenMP 스레드 수 제한 (run_batch의 initializer로 사용) """
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+def _guarded(func, kwargs, item):
+    """ 작업 하나 실행. 예외는 밖으로 던지지 않고 (항목, 성공 여부, 결과 또는 오류, 소요 시간)으로 반환 """
+    start = time.perf_counter()
+    try:
+        return item, True, func(item, **kwargs), time.perf_counter() - start
+    except Exception as e:
+        return item, False, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def run_batch(func, items, workers: int = None, chunksize: int = None, initializer=None,
+              initargs=(), **kwargs) -> dict:
+    """
+    func(item, **kwargs)를 항목마다 프로세스 풀에서 실행.
+    워커 프로세스는 재사용되므로 pandas/scipy 등 import 비용은 워커마다 한 번만 든다.
+    항목 하나가 실패해도 나머지는 계속 처리한다.
+
+    Parameters:
+    - func:      모듈 최상위 함수 (프로세스 간 전달을 위해 pickle 가능해야 함)
+    - workers:   프로세스 수 (기본: CPU 코어 수). 1이면 풀 없이 현재 프로세스에서 실행
+    - chunksize: 워커에 한 번에 넘길 항목 수 (기본: 워커당 4묶음이 되도록)
+    - initializer/initargs: 워커 프로세스 시작 시 한 번 호출 (ProcessPoolExecutor와 같음).
+                 workers=1이면 호출하지 않음 (limit_threads 등이 호출한 쪽 프로세스의 설정을 영구히 바꾸지 않도록)
+
+    반환: {"success": {항목: 결과}, "failed": {항목: 오류 메시지}, "seconds": {항목: 소요 시간}}
+    """
+    items = list(items)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items) or 1))
+    chunksize = chunksize or max(1, len(items) // (workers * 4))
+    call = functools.partial(_guarded, func, kwargs)
+    summary = {"success": {}, "failed": {}, "seconds": {}}
+
+    if workers == 1:
+        results = map(call, items)
+        pool = None
+    else:
+        # fork 전에 부모의 순환 참조 쓰레기를 정리. 안 하면 워커 GC가 부모에서 물려받은 네이티브 핸들
+        # (예: yfinance가 남긴 curl 세션)을 닫다가 segfault로 죽을 수 있다
+        gc.collect()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+        results = pool.map(call, items, chunksize=chunksize)
+    try:
+        for done, (item, ok, value, seconds) in enumerate(results, 1):
+            summary["success" if ok else "failed"][item] = value
+            summary["seconds"][item] = seconds
+            if not ok:
+                print(f"[ERROR] {item}: {value}")
+            if done % 50 == 0 or done == len(items):
+                print(f"[INFO] {done}/{len(items)} done ({len(summary['failed'])} failed)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return summary
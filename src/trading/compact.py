@@ -0,0 +1,78 @@
+# src/trading/compact.py
+"""
+전 종목·다년 데이터를 메모리에 올릴 때 쓰는 compact dtype 모드.
+- 가격·특징: float32 (지표 계산 자체는 float64로 하고 저장만 float32)
+- 거래량 등 정수: 값 범위에 맞는 가장 작은 부호 있는 정수 (int8/16/32/64)
+- Ticker·Name 등 반복되는 문자열: category
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+FLOAT_DTYPE = np.float32
+CATEGORY_COLUMNS = ("Ticker", "Name")
+
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def smallest_int_dtype(values) -> np.dtype:
+    """
+    값을 잃지 않고 담을 수 있는 가장 작은 부호 있는 정수 dtype.
+    (거래량 차분 등에서 음수가 나와도 넘치지 않도록 unsigned는 쓰지 않음)
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.dtype(np.int8)
+    lo, hi = values.min(), values.max()
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def compact_frame(df: pd.DataFrame, categories=CATEGORY_COLUMNS) -> pd.DataFrame:
+    """
+    df의 컬럼을 compact dtype으로 바꿔 끼운다 (컬럼 단위로 교체하므로 전체 복사본을 만들지 않음).
+    - float64 → float32, 정수 → smallest_int_dtype (결측 가능한 Int64 등은 Int8/16/32/64), categories에 있는 문자열 컬럼 → category
+    반환: df (같은 객체)
+    """
+    for col in df.columns:
+        series = df[col]
+        if col in categories:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[col] = series.astype("category")
+        elif series.dtype == np.float64:
+            df[col] = series.astype(FLOAT_DTYPE)
+        elif pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            target = smallest_int_dtype(series.dropna().to_numpy(dtype=np.int64))
+            if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+                # 결측 가능한 정수(Int64 등)는 같은 계열의 작은 폭(Int32 등)으로
+                target = pd.api.types.pandas_dtype(target.name.capitalize())
+            if target != series.dtype:
+                df[col] = series.astype(target)
+    return df
+
+
+def is_compact(df: pd.DataFrame, columns=None) -> bool:
+    """ columns(기본: 전체)의 실수 컬럼이 모두 float32인지 """
+    dtypes = df.dtypes if columns is None else df.dtypes[list(columns)]
+    floats = [d for d in dtypes if pd.api.types.is_float_dtype(d)]
+    return bool(floats) and all(d == FLOAT_DTYPE for d in floats)
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """ 인덱스와 문자열 객체까지 포함한 DataFrame 메모리 사용량 (바이트) """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def peak_rss_bytes():
+    """ 현재 프로세스의 최대 RSS (바이트). resource 모듈이 없는 Windows에서는 None """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -1,24 +1,24 @@
 import yfinance as yf
 import pandas as pd
-import os
-from datetime import datetime
+
+from src.trading.price_store import save_prices
+from src.trading.response_cache import cached_call
 
 def download_stock_data(ticker: str, start: str, end: str) -> pd.DataFrame:
     """
     yfinance를 이용해 ticker의 데이터를 DataFrame으로 반환.
     start, end는 'YYYY-MM-DD' 형식 문자열.
+    응답은 src.trading.response_cache 설정(TRADE_CACHE_MODE)에 따라 디스크 캐시를 거친다.
     """
-    df = yf.download(ticker, start=start, end=end, progress=False)
+    df = cached_call("yfinance", "download",
+                     lambda: yf.download(ticker, start=start, end=end, progress=False),
+                     ticker=ticker, start=start, end=end)
     if df.empty:
         raise ValueError(f"No data fetched for {ticker} between {start} and {end}")
     return df
 
-def save_raw_csv(df: pd.DataFrame, ticker: str):
+def save_raw(df: pd.DataFrame, ticker: str):
     """
-    data/raw/{ticker}_{YYYYMMDD_HHMMSS}.csv 형태로 저장.
+    data/store/raw/ticker={ticker}/year=YYYY/ 파티션에 병합 저장 (같은 날짜는 최신 값으로 갱신).
     """
-    os.makedirs("data/raw", exist_ok=True)
-    date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"data/raw/{ticker}_{date_str}.csv"
-    df.to_csv(filename, encoding="utf-8-sig")
-    print(f"[INFO] Saved raw data to {filename}")
\ No newline at end of file
+    save_prices(df, ticker, dataset="raw", mode="upsert")
\ No newline at end of file
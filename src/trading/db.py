@@ -0,0 +1,321 @@
+# src/trading/db.py
+import io
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+import psycopg2
+from psycopg2 import pool
+
+from src.trading.utils import call_with_retry
+
+PRICE_COLUMNS = ["ticker", "price_date", "open_price", "high_price", "low_price",
+                 "close_price", "adj_close", "volume"]
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_conn_params() -> dict:
+    """
+    환경 변수에서 PostgreSQL 접속 정보를 읽어 dict로 반환
+    """
+    return {
+        "host":     os.getenv("PGHOST", "localhost"),
+        "port":     os.getenv("PGPORT", "5432"),
+        "dbname":   os.getenv("PGDATABASE", "postgres"),
+        "user":     os.getenv("PGUSER", "postgres"),
+        "password": os.getenv("PDB_KEY", ""),
+        "options":  "-c client_encoding=UTF8 -c lc_messages=C"
+    }
+
+
+class _BlockingPool:
+    """
+    ThreadedConnectionPool은 연결이 모두 사용 중이면 예외를 던지므로,
+    세마포어로 감싸 빈 연결이 생길 때까지 대기하도록 한 풀
+    """
+    def __init__(self, conn_params: dict, maxconn: int):
+        self._pool = pool.ThreadedConnectionPool(1, maxconn, **conn_params)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self):
+        self._slots.acquire()
+        try:
+            return self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close=False):
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+def get_pool(conn_params: dict, maxconn: int = 8) -> _BlockingPool:
+    """
+    접속 정보별로 하나씩 공유되는 커넥션 풀을 반환 (최초 호출 시 생성)
+    """
+    key = tuple(sorted(conn_params.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = _BlockingPool(conn_params, maxconn)
+        return _pools[key]
+
+
+def close_pools():
+    """ 생성된 모든 커넥션 풀을 닫는다 """
+    with _pools_lock:
+        for p in _pools.values():
+            p.closeall()
+        _pools.clear()
+
+
+@contextmanager
+def pooled_connection(conn_params: dict):
+    """
+    풀에서 연결을 빌려오고, 블록이 끝나면 반납하는 컨텍스트 매니저.
+    예외가 발생하면 롤백 후 반납한다.
+    """
+    p = get_pool(conn_params)
+    conn = p.getconn()
+    broken = False
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        p.putconn(conn, close=broken or conn.closed != 0)
+
+
+def fetch_watermarks(conn_params: dict, table: str = "krx_daily_price") -> dict:
+    """
+    한 번의 GROUP BY 쿼리로 티커별 마지막 적재일(max(price_date))을 조회.
+    반환: {ticker: datetime.date}
+    """
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT ticker, max(price_date) FROM {table} GROUP BY ticker;")
+            rows = cur.fetchall()
+        conn.commit()
+    return dict(rows)
+
+
+def copy_query_chunks(conn_params: dict, sql: str, params=None, chunksize: int = 1_000_000,
+                      dtype=None, parse_dates=None):
+    """
+    COPY (sql) TO STDOUT (CSV) 결과를 임시 파일로 받은 뒤 pandas C 파서로 chunk 단위 DataFrame 생성.
+    행마다 Python 객체를 만드는 fetchall보다 빠르고, 메모리는 chunksize에 비례한다.
+    sql 끝에 세미콜론을 붙이지 말 것.
+    """
+    with tempfile.TemporaryFile(mode="w+b") as tmp:
+        with pooled_connection(conn_params) as conn:
+            with conn.cursor() as cur:
+                query = cur.mogrify(sql, params).decode("utf-8") if params else sql
+                cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", tmp)
+            conn.commit()
+        tmp.seek(0)
+        for chunk in pd.read_csv(tmp, chunksize=chunksize, dtype=dtype, parse_dates=parse_dates):
+            yield chunk
+
+
+def _format_copy_value(value) -> str:
+    """ COPY text 포맷에 맞게 값 하나를 문자열로 변환 """
+    if value is None:
+        return "\\N"
+    return str(value)
+
+
+def records_to_copy_buffer(records) -> io.StringIO:
+    """
+    (ticker, date, open, high, low, close, adj_close, volume) 튜플 목록을
+    COPY FROM STDIN (text 포맷)용 버퍼로 변환
+    """
+    buf = io.StringIO()
+    buf.writelines(
+        "\t".join(_format_copy_value(v) for v in rec) + "\n" for rec in records
+    )
+    buf.seek(0)
+    return buf
+
+
+class BulkLoadError(Exception):
+    """ 재시도 후에도 병합·커밋하지 못해 버린 배치. keys: 그 배치에 레코드가 있던 키 (add의 key) """
+    def __init__(self, keys, cause):
+        super().__init__(f"batch of {len(keys)} keys was not loaded: {cause}")
+        self.keys = keys
+
+
+class PriceBulkLoader:
+    """
+    krx_daily_price 대량 적재기.
+    레코드를 batch_size 단위로 모아 UNLOGGED 스테이징 테이블에 COPY FROM STDIN으로
+    밀어넣고, 배치마다 한 번의 INSERT ... SELECT ... ON CONFLICT 로 본 테이블에 병합한다.
+    commit_every 배치마다 커밋하며, 여러 스레드에서 add()를 호출해도 안전하다.
+    병합·커밋이 실패하면 롤백된(커밋되지 않은) 레코드 전체를 같은 배치로 retries회까지 다시 병합하고,
+    그래도 실패하면 그 배치를 버리고 배치에 레코드가 있던 키 목록과 함께 BulkLoadError를 던진다
+    (버린 레코드가 나중 flush에서 커밋되지 않으므로 실패로 보고한 키와 DB 내용이 일치한다).
+
+    Parameters:
+    - conn_params:  psycopg2 접속 정보
+    - batch_size:   스테이징 → 본 테이블 병합 단위 레코드 수
+    - commit_every: 몇 배치마다 커밋할지 (1이면 배치마다 커밋)
+    - on_commit:    커밋이 끝날 때마다 호출할 함수 (체크포인트 기록 등)
+    - retries:      병합·커밋 실패 시 재시도 횟수 (retry_delay초부터 지수 백오프)
+    """
+    def __init__(self, conn_params: dict, batch_size: int = 50000, commit_every: int = 1,
+                 table: str = "krx_daily_price", staging_table: str = "krx_daily_price_staging",
+                 on_commit=None, retries: int = 3, retry_delay: float = 1.0):
+        self.conn_params = conn_params
+        self.on_commit = on_commit
+        self.batch_size = batch_size
+        self.commit_every = max(1, commit_every)
+        self.table = table
+        self.staging_table = staging_table
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.rows_written = 0
+        self._buffer = []
+        self._uncommitted = []
+        self._keys = {}  # 아직 커밋되지 않은 레코드의 키 (순서 유지)
+        self._pending_batches = 0
+        self._conn = None
+        self._lock = threading.Lock()
+        self._staging_ready = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._release(commit=False)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = get_pool(self.conn_params).getconn()
+        return self._conn
+
+    def _ensure_staging(self, cur):
+        if self._staging_ready:
+            return
+        cur.execute(f"""
+        CREATE UNLOGGED TABLE IF NOT EXISTS {self.staging_table} (
+            ticker      VARCHAR(10),
+            price_date  DATE,
+            open_price  DOUBLE PRECISION,
+            high_price  DOUBLE PRECISION,
+            low_price   DOUBLE PRECISION,
+            close_price DOUBLE PRECISION,
+            adj_close   DOUBLE PRECISION,
+            volume      BIGINT
+        );
+        """)
+        self._staging_ready = True
+
+    def add(self, records, key=None):
+        """
+        레코드를 버퍼에 추가하고, batch_size를 넘으면 병합까지 수행.
+        key: 레코드의 출처(티커·날짜). 배치가 실패하면 BulkLoadError.keys로 돌려준다
+        """
+        with self._lock:
+            self._buffer.extend(records)
+            if key is not None:
+                self._keys[key] = None
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """ 버퍼에 남은 레코드를 즉시 병합 (커밋은 commit_every 규칙을 따름) """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self, commit: bool = False):
+        try:
+            call_with_retry(self._merge_locked, (commit,), retries=self.retries, base_delay=self.retry_delay,
+                            label=f"{self.table} 병합")
+        except Exception as e:
+            keys = list(self._keys)
+            self._buffer = []
+            self._keys = {}
+            raise BulkLoadError(keys, e) from e
+
+    def _merge_locked(self, commit: bool = False):
+        """ 버퍼를 한 배치로 병합하고, commit_every에 도달했거나 commit=True면 커밋 """
+        cols = ", ".join(PRICE_COLUMNS)
+        updates = ",\n              ".join(
+            f"{c} = EXCLUDED.{c}" for c in PRICE_COLUMNS[2:]
+        )
+        try:
+            if self._buffer:
+                with self._connection().cursor() as cur:
+                    self._ensure_staging(cur)
+                    cur.execute(f"TRUNCATE {self.staging_table};")
+                    cur.copy_expert(
+                        f"COPY {self.staging_table} ({cols}) FROM STDIN",
+                        records_to_copy_buffer(self._buffer),
+                    )
+                    # 같은 (ticker, price_date)가 배치 안에 중복되면 ON CONFLICT가 실패하므로 하나만 남김
+                    cur.execute(f"""
+                    INSERT INTO {self.table} ({cols})
+                    SELECT DISTINCT ON (ticker, price_date) {cols}
+                      FROM {self.staging_table}
+                    ON CONFLICT (ticker, price_date) DO UPDATE
+                      SET {updates};
+                    """)
+                self._uncommitted.extend(self._buffer)
+                self._buffer = []
+                self._pending_batches += 1
+            if self._uncommitted and (commit or self._pending_batches >= self.commit_every):
+                self._commit_locked()
+        except Exception:
+            # 롤백된 레코드까지 버퍼로 되돌려 같은 배치로 다시 병합
+            self._buffer = self._uncommitted + self._buffer
+            self._uncommitted = []
+            self._release(commit=False)
+            raise
+
+    def _commit_locked(self):
+        self._conn.commit()
+        self.rows_written += len(self._uncommitted)
+        self._uncommitted = []
+        self._keys = {}
+        self._pending_batches = 0
+        if self.on_commit is not None:
+            self.on_commit()
+
+    def _release(self, commit: bool):
+        if self._conn is None:
+            return
+        broken = False
+        try:
+            if commit:
+                self._commit_locked()
+            else:
+                self._conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        get_pool(self.conn_params).putconn(self._conn, close=broken or self._conn.closed != 0)
+        self._conn = None
+        self._pending_batches = 0
+        self._staging_ready = False
+
+    def close(self):
+        """ 남은 버퍼를 병합하고 커밋한 뒤 연결을 풀에 반납 (커밋도 재시도, 끝내 실패하면 BulkLoadError) """
+        with self._lock:
+            try:
+                self._flush_locked(commit=True)
+            finally:
+                self._release(commit=False)
@@ -0,0 +1,150 @@
+# src/trading/feature_cache.py
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.trading import compact, incremental, indicators, kernels
+from src.trading.feature_engineering import basic_preprocessing, calculate_technical_indicators
+from src.trading.incremental import INDICATOR_COLUMNS, IndicatorState
+from src.trading.indicators import DEFAULT_INDICATORS, IndicatorRegistry, default_registry, indicator_backend
+from src.trading.response_cache import ResponseCache
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "features")
+
+
+def _digest(*parts) -> str:
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _package_version(name: str):
+    """ 설치된 패키지 버전 (없으면 None) """
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def code_version(*objects) -> str:
+    """
+    특징 계산 함수·모듈들의 소스와 pandas·ta 버전 해시. 코드가 바뀌면 캐시 키도 바뀐다
+    (ta는 "ta" backend에서만 import하지만 설치 버전이 바뀌면 그 결과도 달라질 수 있어 항상 포함)
+    """
+    sources = [inspect.getsource(obj) for obj in objects]
+    return _digest(sources, pd.__version__, _package_version("ta"))[:12]
+
+
+class FeatureCache:
+    """
+    전처리 + 기술적 지표 결과를 (입력 데이터 해시, 지표 설정, 코드 버전) 키로 저장하는 캐시.
+
+    - 같은 입력·설정·코드면 저장된 특징 행렬을 그대로 반환 (계산 생략)
+    - 이전에 계산한 입력 뒤에 새 봉만 붙은 경우, 저장해 둔 IndicatorState로 새 봉의 지표만 이어서 계산
+    - 저장소는 ResponseCache(디스크, 크기 상한 LRU)를 그대로 사용
+
+    Parameters:
+    - root:      캐시 디렉터리
+    - max_bytes: 캐시 전체 크기 상한. 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    - registry:  IndicatorRegistry (기본: config.yaml 정의). 지표 정의가 키에 포함되며,
+                 기본 지표 구성일 때만 꼬리 재계산을 사용 (IndicatorState가 그 구성을 구현)
+    - backend:   지표 계산 backend (기본: config.yaml의 features.backend). 키에 포함되며,
+                 "pandas"일 때만 꼬리 재계산을 사용 (IndicatorState와 비트 단위로 같은 값)
+    """
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = 2 << 30,
+                 registry: IndicatorRegistry = None, backend: str = None):
+        self.store = ResponseCache(root=root, mode="on", max_bytes=max_bytes)
+        self.registry = registry or default_registry()
+        self.config = self.registry.spec
+        self.backend = backend or indicator_backend()
+        self.version = code_version(basic_preprocessing, calculate_technical_indicators, indicators, kernels,
+                                    incremental, compact)
+        self.stats = {"hit": 0, "tail": 0, "miss": 0}
+
+    @staticmethod
+    def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(df, index=True).to_numpy()
+
+    def _keys(self, df: pd.DataFrame, row_hashes: np.ndarray, n: int, name: str):
+        """ (내용 키, 시리즈 인덱스 키) """
+        setting = [list(map(str, df.columns)), self.config, self.backend, self.version]
+        content = _digest(b"features", setting, row_hashes[:n].tobytes())
+        series = _digest(b"series", setting, name)
+        return content, series
+
+    def features(self, raw: pd.DataFrame, name: str = None) -> pd.DataFrame:
+        """
+        raw(원본 가격 DataFrame)의 특징 행렬 반환: calculate_technical_indicators(basic_preprocessing(raw))와 같음.
+        name(티커 등)을 주면 같은 시리즈의 이전 결과를 찾아 새로 붙은 봉만 계산한다.
+        반환된 DataFrame은 새 객체이므로 수정해도 캐시에는 영향이 없다.
+        """
+        row_hashes = self._row_hashes(raw)
+        key, series_key = self._keys(raw, row_hashes, len(raw), name)
+        found, entry = self.store.get(key)
+        if found:
+            self.stats["hit"] += 1
+            return entry["features"].copy()
+
+        entry = None
+        if name is not None and self.extendable:
+            entry = self._extend(raw, row_hashes, series_key)
+        if entry is None:
+            self.stats["miss"] += 1
+            entry = self._compute(raw)
+        else:
+            self.stats["tail"] += 1
+
+        self.store.put(key, entry, meta={"name": name, "rows": len(raw)})
+        if name is not None:
+            self.store.put(series_key, {"key": key, "rows": len(raw)})
+        return entry["features"].copy()
+
+    @property
+    def extendable(self) -> bool:
+        """ 꼬리 재계산을 쓸 수 있는 설정인지 (IndicatorState가 구현한 기본 지표 + pandas backend) """
+        return self.config == DEFAULT_INDICATORS and self.backend == "pandas"
+
+    def _compute(self, raw: pd.DataFrame) -> dict:
+        clean = basic_preprocessing(raw.copy())
+        features = calculate_technical_indicators(clean.copy(), registry=self.registry, backend=self.backend)
+        # 꼬리 재계산에만 쓰는 상태라 쓸 수 없는 설정에서는 만들지 않음 (전체 종가를 도는 파이썬 루프)
+        state = None
+        if self.extendable:
+            last_date = clean.index[-1] if len(clean) else None
+            state = IndicatorState.from_history(clean["Close"].to_numpy(), last_date=last_date).to_dict()
+        return {"features": features, "kept": clean.index, "state": state}
+
+    def _extend(self, raw: pd.DataFrame, row_hashes: np.ndarray, series_key: str):
+        """ 같은 시리즈의 이전 항목이 raw의 앞부분이면 뒤에 붙은 봉만 계산. 불가능하면 None """
+        found, latest = self.store.get(series_key)
+        if not found or latest["rows"] >= len(raw):
+            return None
+        prev_key, _ = self._keys(raw, row_hashes, latest["rows"], None)
+        if prev_key != latest["key"]:
+            return None  # 과거 구간이 수정됨 (수정주가 반영 등)
+        found, prev = self.store.get(prev_key)
+        if not found or prev.get("state") is None:
+            return None
+
+        # z-score 이상치 제거는 전체 기간 통계를 쓰므로 전처리는 다시 하고,
+        # 이전 구간에서 남은 행이 그대로일 때만 지표를 이어서 계산
+        clean = basic_preprocessing(raw.copy())
+        n_old = len(prev["kept"])
+        if len(clean) < n_old or not clean.index[:n_old].equals(prev["kept"]):
+            return None
+
+        state = IndicatorState.from_dict(prev["state"])
+        tail = clean.iloc[n_old:].copy()
+        rows = [state.update(close, date=date) for date, close in zip(tail.index, tail["Close"])]
+        values = pd.DataFrame(rows, index=tail.index, columns=INDICATOR_COLUMNS)
+        for col in INDICATOR_COLUMNS:
+            tail[col] = values[col].astype(prev["features"][col].dtype, copy=False)  # compact 모드면 float32
+        tail.dropna(inplace=True)
+        features = pd.concat([prev["features"], tail])
+        return {"features": features, "kept": clean.index, "state": state.to_dict()}
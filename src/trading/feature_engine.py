@@ -0,0 +1,99 @@
+# src/trading/feature_engine.py
+import numpy as np
+import pandas as pd
+
+from src.trading.compact import FLOAT_DTYPE, is_compact
+from src.trading.indicators import default_registry, indicator_backend
+
+INDICATOR_COLUMNS = ["MA20", "MA60", "RSI14", "MACD", "MACD_signal", "BB_High", "BB_Low"]
+
+
+def pack_columns(values: np.ndarray):
+    """
+    (날짜 × 티커) 배열에서 티커마다 값이 있는 행만 위로 모아(순서 유지) 붙인다.
+    상장 전·상장폐지 후·거래정지 등 NaN 구간을 건너뛰고, 티커별로 존재하는 봉만 이어 붙인
+    per-ticker 계산과 같은 시계열을 만든다. 빈 자리는 아래쪽에 NaN으로 남는다.
+    반환: (packed, order, counts)
+    - order:  packed[i, j] = values[order[i, j], j] 인 원래 행 번호
+    - counts: 티커별 유효 값 개수
+    """
+    mask = ~np.isnan(values)
+    order = np.argsort(~mask, axis=0, kind="stable")
+    packed = np.take_along_axis(values, order, axis=0)
+    return packed, order, mask.sum(axis=0)
+
+
+def _pad_mask(shape, counts) -> np.ndarray:
+    """ packed 배열에서 티커별 유효 길이를 넘는 (패딩) 칸 """
+    return np.arange(shape[0])[:, None] >= np.asarray(counts)[None, :]
+
+
+def packed_indicators(packed, counts, columns=None, registry=None, backend=None) -> dict:
+    """
+    packed (봉 × 티커) 종가 배열(또는 {입력 컬럼명: 배열})로 전 종목 지표를 한 번에 계산.
+    IndicatorRegistry의 pandas rolling/ewm 연산을 2차원 그대로 적용하므로 (열마다 독립 계산)
+    calculate_technical_indicators의 티커별 결과와 같은 값이 나온다.
+    - columns/registry/backend: calculate_technical_indicators와 같음 (기본: config.yaml 설정)
+    반환: {지표명: packed와 같은 모양의 배열}. 패딩 칸과 기간이 모자란 앞부분은 NaN
+    """
+    registry = registry or default_registry()
+    if not isinstance(packed, dict):
+        packed = {"Close": packed}
+    out = registry.compute({name: pd.DataFrame(arr) for name, arr in packed.items()}, columns,
+                           backend=backend or indicator_backend())
+
+    # ewm은 NaN 입력에서도 직전 값을 이어가므로 패딩 칸은 명시적으로 비움
+    pad = _pad_mask(next(iter(packed.values())).shape, counts)
+    result = {}
+    for name, frame in out.items():
+        arr = frame.to_numpy(dtype=np.float64, copy=True)
+        arr[pad] = np.nan
+        result[name] = arr
+    return result
+
+
+def wide_indicators(close: pd.DataFrame, columns=None, registry=None, backend=None) -> dict:
+    """
+    (날짜 × 티커) 종가 표로 전 종목 지표 계산.
+    NaN 칸(상장 전, 거래정지, 상장폐지 후)은 건너뛰고 티커별로 존재하는 봉만 이어서 계산하며,
+    결과에서도 NaN으로 남는다.
+    반환: {지표명: close와 같은 인덱스·컬럼의 DataFrame}
+    """
+    values = close.to_numpy(dtype=np.float64)
+    packed, order, counts = pack_columns(values)
+    result = {}
+    for name, arr in packed_indicators(packed, counts, columns, registry, backend).items():
+        unpacked = np.full(values.shape, np.nan)
+        np.put_along_axis(unpacked, order, arr, axis=0)
+        result[name] = pd.DataFrame(unpacked, index=close.index, columns=close.columns)
+    return result
+
+
+def add_indicators_long(df: pd.DataFrame, ticker_col: str = "Ticker", date_col: str = "Date",
+                        dropna: bool = True, columns=None, registry=None, backend=None) -> pd.DataFrame:
+    """
+    long-format(티커·날짜·가격 컬럼) DataFrame 전체에 지표 컬럼을 한 번에 추가.
+    티커마다 calculate_technical_indicators를 호출해 이어 붙인 것과 같은 결과를 낸다
+    (행 순서는 티커, 날짜 순. dropna=True면 지표 기간이 모자란 행과 결측 행 제거).
+    티커별 이력 길이가 달라도 되며, 날짜가 빠진 구간은 있는 봉끼리 이어서 계산한다.
+    """
+    df = df.sort_values([ticker_col, date_col], kind="stable").reset_index(drop=True)
+    codes, _ = pd.factorize(df[ticker_col], sort=True)
+    counts = np.bincount(codes)
+    # 티커별로 이어 붙인 행 번호: 정렬된 상태라 (행 번호 - 티커 시작 행)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    pos = np.arange(len(df)) - starts[codes]
+
+    registry = registry or default_registry()
+    shape = (counts.max() if len(counts) else 0, len(counts))
+    packed = {}
+    for name in registry.inputs(columns):
+        packed[name] = np.full(shape, np.nan)
+        packed[name][pos, codes] = df[name].to_numpy(dtype=np.float64)
+    # compact 모드(입력이 float32)면 지표도 float32로 저장 (계산은 float64)
+    dtype = FLOAT_DTYPE if is_compact(df, registry.inputs(columns)) else np.float64
+    for name, arr in packed_indicators(packed, counts, columns, registry, backend).items():
+        df[name] = arr[pos, codes].astype(dtype, copy=False)
+    if dropna:
+        df = df.dropna().reset_index(drop=True)
+    return df
@@ -1,48 +1,65 @@
 import pandas as pd
 import numpy as np
-import os
 from scipy import stats
-import ta
 
-def load_raw_csv(file_path: str) -> pd.DataFrame:
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    return df
+from src.trading.compact import FLOAT_DTYPE, is_compact
+from src.trading.indicators import default_registry, indicator_backend
+from src.trading.price_store import load_prices, save_prices, ticker_from_path
+
+def load_raw_csv(source: str, start=None, end=None, columns=None, repository=None,
+                 compact: bool = False) -> pd.DataFrame:
+    """
+    원본 가격 데이터 읽기. source는 티커(가격 저장소) 또는 예전 raw CSV 경로.
+    repository(PriceRepository)를 넘기면 krx_daily_price에서 티커 source를 읽는다
+    (이때 dtype은 repository의 compact 설정을 따름).
+    compact=True면 float32 가격, 최소 폭 정수 거래량, category 종목명으로 읽는다 (src.trading.compact).
+    """
+    if repository is not None:
+        # 저장소 캐시와 공유되는 객체이므로 이후 전처리에서 수정해도 되도록 복사
+        return repository.get(source, start=start, end=end, fields=columns).copy()
+    return load_prices(source, dataset="raw", start=start, end=end, columns=columns, compact=compact)
 
 def basic_preprocessing(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    결측 행 제거 → 로그 수익률(LogReturn) 추가 → z-score 3 이상 이상치 행 제거.
+    남길 행을 배열로 먼저 정하고 마지막에 한 번만 골라내므로 중간 사본(임시 zscore 컬럼 등)이 없다.
+    LogReturn은 float64로 계산하고, 입력 가격이 float32(compact 모드)면 float32로 저장한다.
+    """
     # 결측치 제거
-    df = df.dropna()
-    # 로그 수익률 계산
-    df['LogReturn'] = np.log(df['Adj Close'] / df['Adj Close'].shift(1))
-    df = df.dropna(subset=['LogReturn'])
+    rows = np.flatnonzero(df.notna().all(axis=1).to_numpy())
+    # 로그 수익률 계산 (결측 행을 뺀 직전 행 기준)
+    adj = df['Adj Close'].to_numpy(dtype=np.float64)[rows]
+    log_return = np.full(len(rows), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_return[1:] = np.log(adj[1:] / adj[:-1])
+    valid = ~np.isnan(log_return)
     # 이상치 제거 (z-score 기준)
-    df['zscore'] = stats.zscore(df['LogReturn'])
-    df = df[df['zscore'].abs() < 3]
-    df.drop(columns=['zscore'], inplace=True)
+    keep = np.zeros(len(rows), dtype=bool)
+    keep[valid] = np.abs(stats.zscore(log_return[valid])) < 3
+    df = df.take(rows[keep])
+    df['LogReturn'] = log_return[keep].astype(df['Adj Close'].dtype if is_compact(df) else np.float64)
     return df
 
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    # 단순 이동평균
-    df['MA20'] = ta.trend.sma_indicator(close=df['Close'], window=20)
-    df['MA60'] = ta.trend.sma_indicator(close=df['Close'], window=60)
-    # RSI
-    df['RSI14'] = ta.momentum.rsi(close=df['Close'], window=14)
-    # MACD
-    macd = ta.trend.MACD(close=df['Close'], window_slow=26, window_fast=12, window_sign=9)
-    df['MACD'] = macd.macd()
-    df['MACD_signal'] = macd.macd_signal()
-    # 볼린저 밴드
-    bb = ta.volatility.BollingerBands(close=df['Close'], window=20, window_dev=2)
-    df['BB_High'] = bb.bollinger_hband()
-    df['BB_Low']  = bb.bollinger_lband()
+def calculate_technical_indicators(df: pd.DataFrame, columns=None, registry=None, backend=None) -> pd.DataFrame:
+    """
+    config/config.yaml(features.indicators)에 정의된 기술적 지표 컬럼을 추가하고 결측 행을 제거.
+    - columns: 계산할 지표 이름 목록 (None이면 정의된 지표 전체). 지표가 아닌 이름은 무시
+    - registry: IndicatorRegistry (기본: config.yaml 정의)
+    - backend: "pandas" | "numpy" | "ta" (기본: config.yaml의 features.backend, 없으면 "pandas")
+    공유되는 중간 결과(이동평균, 이동표준편차, EMA)는 한 번만 계산한다.
+    """
+    registry = registry or default_registry()
+    # compact 모드(입력이 float32)면 지표도 float32로 저장 (계산은 float64)
+    compact = is_compact(df, registry.inputs(columns))
+    for name, values in registry.compute(df, columns, backend=backend or indicator_backend()).items():
+        df[name] = values.astype(FLOAT_DTYPE) if compact else values
     df.dropna(inplace=True)
     return df
 
 def save_processed_csv(df: pd.DataFrame, raw_filename: str):
     """
-    data/processed/{raw_filename}_processed.csv 형태로 저장
+    가격 저장소의 processed 데이터셋(data/store/processed/ticker={티커}/...)에 저장.
+    raw_filename은 티커 또는 예전 raw CSV 경로 (파일명에서 티커를 추출).
+    지표는 전체 기간으로 다시 계산되므로 티커의 기존 processed 데이터를 교체한다.
     """
-    os.makedirs("data/processed", exist_ok=True)
-    base = os.path.basename(raw_filename).replace(".csv", "")
-    out_name = f"data/processed/{base}_processed.csv"
-    df.to_csv(out_name, encoding="utf-8-sig")
-    print(f"[INFO] Saved processed data to {out_name}")
\ No newline at end of file
+    save_prices(df, ticker_from_path(raw_filename), dataset="processed", mode="overwrite")
\ No newline at end of file
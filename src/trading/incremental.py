@@ -0,0 +1,378 @@
+# src/trading/incremental.py
+import json
+import math
+import os
+from collections import deque
+
+INDICATOR_COLUMNS = ["MA20", "MA60", "RSI14", "MACD", "MACD_signal", "BB_High", "BB_Low"]
+
+NAN = float("nan")
+
+
+class RollingMean:
+    """
+    고정 창 단순 이동평균. 새 값 하나마다 O(1)로 갱신한다.
+    pandas rolling().mean()과 같은 순서로 Kahan 보정 합계를 더하고 빼므로 배치 계산과 같은 값이 나온다.
+    """
+    def __init__(self, window: int, min_periods: int = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = NAN
+
+    def _add(self, val):
+        if val != val:
+            return
+        self.nobs += 1
+        y = val - self.comp_add
+        t = self.sum_x + y
+        self.comp_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct += 1
+        self.same_count = self.same_count + 1 if val == self.prev_value else 1
+        self.prev_value = val
+
+    def _remove(self, val):
+        if val != val:
+            return
+        self.nobs -= 1
+        y = -val - self.comp_remove
+        t = self.sum_x + y
+        self.comp_remove = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct -= 1
+
+    def update(self, val: float) -> float:
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(val)
+        self._add(val)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.nobs < self.min_periods or self.nobs == 0:
+            return NAN
+        result = self.sum_x / self.nobs
+        # 같은 값이 창 전체에 이어지면 부동소수점 잔차 없이 그 값을 그대로 (pandas와 동일)
+        if self.same_count >= self.nobs:
+            return self.prev_value
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+    def to_dict(self) -> dict:
+        state = dict(vars(self))
+        state["values"] = list(self.values)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(state["window"], state["min_periods"])
+        obj.__dict__.update({k: v for k, v in state.items() if k != "values"})
+        obj.values = deque(state["values"], maxlen=state["window"])
+        return obj
+
+
+class RollingStd:
+    """
+    고정 창 이동 표준편차 (Welford + Kahan 보정, pandas rolling().std()와 같은 갱신 순서). 값 하나마다 O(1).
+    """
+    def __init__(self, window: int, ddof: int = 0, min_periods: int = None):
+        self.window = window
+        self.ddof = ddof
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.nobs = 0.0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = NAN
+
+    def _add(self, val):
+        if val != val:
+            return
+        self.nobs += 1
+        self.same_count = self.same_count + 1 if val == self.prev_value else 1
+        self.prev_value = val
+        prev_mean = self.mean_x - self.comp_add
+        y = val - self.comp_add
+        t = y - self.mean_x
+        self.comp_add = t + self.mean_x - y
+        if self.nobs:
+            self.mean_x = self.mean_x + t / self.nobs
+        else:
+            self.mean_x = 0.0
+        self.ssqdm_x = self.ssqdm_x + (val - prev_mean) * (val - self.mean_x)
+
+    def _remove(self, val):
+        if val != val:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean_x - self.comp_remove
+            y = val - self.comp_remove
+            t = y - self.mean_x
+            self.comp_remove = t + self.mean_x - y
+            self.mean_x = self.mean_x - t / self.nobs
+            self.ssqdm_x = self.ssqdm_x - (val - prev_mean) * (val - self.mean_x)
+        else:
+            self.mean_x = 0.0
+            self.ssqdm_x = 0.0
+
+    def update(self, val: float) -> float:
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(val)
+        self._add(val)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.nobs < self.min_periods or self.nobs <= self.ddof:
+            return NAN
+        if self.nobs == 1 or self.same_count >= self.nobs:
+            return 0.0
+        var = self.ssqdm_x / (self.nobs - self.ddof)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        state = dict(vars(self))
+        state["values"] = list(self.values)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(state["window"], state["ddof"], state["min_periods"])
+        obj.__dict__.update({k: v for k, v in state.items() if k != "values"})
+        obj.values = deque(state["values"], maxlen=state["window"])
+        return obj
+
+
+class EWM:
+    """
+    지수 이동평균 (adjust=False). span 또는 alpha 중 하나로 지정.
+    pandas ewm().mean()과 같은 식(가중 평균 후 정규화)으로 갱신하며, NaN 입력은 건너뛴다.
+    """
+    def __init__(self, span: float = None, alpha: float = None, min_periods: int = 0):
+        if (span is None) == (alpha is None):
+            raise ValueError("exactly one of span or alpha must be given")
+        self.span = span
+        self.alpha = alpha
+        # pandas와 같이 com을 거쳐 alpha를 구해야 마지막 비트까지 일치
+        com = (span - 1) / 2.0 if span is not None else 1.0 / alpha - 1
+        self._alpha = 1.0 / (1.0 + com)
+        self.min_periods = min_periods
+        self.weighted = NAN
+        self.nobs = 0
+
+    def update(self, val: float) -> float:
+        is_obs = val == val
+        self.nobs += is_obs
+        if self.weighted == self.weighted:
+            if is_obs and self.weighted != val:
+                old_wt = 1.0 - self._alpha
+                self.weighted = (old_wt * self.weighted + self._alpha * val) / (old_wt + self._alpha)
+        elif is_obs:
+            self.weighted = val
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted if self.nobs >= max(self.min_periods, 1) else NAN
+
+    def to_dict(self) -> dict:
+        return {"span": self.span, "alpha": self.alpha, "min_periods": self.min_periods,
+                "weighted": self.weighted, "nobs": self.nobs}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(span=state["span"], alpha=state["alpha"], min_periods=state["min_periods"])
+        obj.weighted = state["weighted"]
+        obj.nobs = state["nobs"]
+        return obj
+
+
+class RSI:
+    """ Wilder RSI (ta.momentum.rsi와 같은 정의) """
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close = NAN
+        self.up = EWM(alpha=1 / window, min_periods=window)
+        self.down = EWM(alpha=1 / window, min_periods=window)
+
+    def update(self, close: float) -> float:
+        diff = close - self.prev_close
+        # 첫 봉의 diff는 NaN이지만 ta와 같이 상승/하락 0으로 취급
+        self.up.update(diff if diff > 0 else 0.0)
+        self.down.update(-diff if diff < 0 else -0.0)
+        self.prev_close = close
+        return self.value
+
+    @property
+    def value(self) -> float:
+        up, down = self.up.value, self.down.value
+        if down == 0:
+            return 100.0
+        return 100 - (100 / (1 + up / down))
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "prev_close": self.prev_close,
+                "up": self.up.to_dict(), "down": self.down.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(state["window"])
+        obj.prev_close = state["prev_close"]
+        obj.up = EWM.from_dict(state["up"])
+        obj.down = EWM.from_dict(state["down"])
+        return obj
+
+
+class MACD:
+    """ MACD와 시그널선 (빠른/느린 EMA 차이, 그 EMA) """
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EWM(span=fast, min_periods=fast)
+        self.slow = EWM(span=slow, min_periods=slow)
+        self.signal = EWM(span=signal, min_periods=signal)
+
+    def update(self, close: float):
+        macd = self.fast.update(close) - self.slow.update(close)
+        self.signal.update(macd)
+        return self.value
+
+    @property
+    def value(self):
+        """ (MACD, 시그널) """
+        return self.fast.value - self.slow.value, self.signal.value
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls.__new__(cls)
+        obj.fast = EWM.from_dict(state["fast"])
+        obj.slow = EWM.from_dict(state["slow"])
+        obj.signal = EWM.from_dict(state["signal"])
+        return obj
+
+
+class BollingerBands:
+    """ 볼린저 밴드 (이동평균 ± window_dev × 모표준편차) """
+    def __init__(self, window: int = 20, window_dev: float = 2):
+        self.window_dev = window_dev
+        self.mean = RollingMean(window)
+        self.std = RollingStd(window, ddof=0)
+
+    def update(self, close: float):
+        self.mean.update(close)
+        self.std.update(close)
+        return self.value
+
+    @property
+    def value(self):
+        """ (상단, 하단) """
+        mavg, mstd = self.mean.value, self.std.value
+        return mavg + self.window_dev * mstd, mavg - self.window_dev * mstd
+
+    def to_dict(self) -> dict:
+        return {"window_dev": self.window_dev, "mean": self.mean.to_dict(), "std": self.std.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls.__new__(cls)
+        obj.window_dev = state["window_dev"]
+        obj.mean = RollingMean.from_dict(state["mean"])
+        obj.std = RollingStd.from_dict(state["std"])
+        return obj
+
+
+class IndicatorState:
+    """
+    calculate_technical_indicators와 같은 지표(MA20/MA60, RSI14, MACD/MACD_signal, BB_High/BB_Low)를
+    봉 하나씩 O(1)로 갱신하는 상태 묶음. 실시간 경로에서 전체 이력을 다시 계산하지 않기 위해 쓴다.
+    - from_history(closes): 과거 종가로 상태를 채움
+    - update(close):        새 봉 확정. 그 봉의 지표 dict 반환 (기간이 모자라면 NaN)
+    - peek(close):          상태를 바꾸지 않고 아직 확정되지 않은 봉(장중 현재가)의 지표를 계산
+    - save(path)/load(path): JSON으로 저장·복원 (재시작 후 이어서 갱신)
+    """
+    def __init__(self):
+        self.ma20 = RollingMean(20)
+        self.ma60 = RollingMean(60)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bb = BollingerBands(20, 2)
+        self.last_date = None
+        self.bars = 0
+
+    @classmethod
+    def from_history(cls, closes, last_date=None) -> "IndicatorState":
+        state = cls()
+        for close in closes:
+            state.update(float(close))
+        state.last_date = None if last_date is None else str(last_date)
+        return state
+
+    def update(self, close: float, date=None) -> dict:
+        close = float(close)
+        self.ma20.update(close)
+        self.ma60.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bb.update(close)
+        self.bars += 1
+        if date is not None:
+            self.last_date = str(date)
+        return self.values()
+
+    def peek(self, close: float) -> dict:
+        return IndicatorState.from_dict(self.to_dict()).update(close)
+
+    def values(self) -> dict:
+        macd, signal = self.macd.value
+        bb_high, bb_low = self.bb.value
+        return {"MA20": self.ma20.value, "MA60": self.ma60.value, "RSI14": self.rsi.value,
+                "MACD": macd, "MACD_signal": signal, "BB_High": bb_high, "BB_Low": bb_low}
+
+    def to_dict(self) -> dict:
+        return {"ma20": self.ma20.to_dict(), "ma60": self.ma60.to_dict(), "rsi": self.rsi.to_dict(),
+                "macd": self.macd.to_dict(), "bb": self.bb.to_dict(),
+                "last_date": self.last_date, "bars": self.bars}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "IndicatorState":
+        obj = cls.__new__(cls)
+        obj.ma20 = RollingMean.from_dict(state["ma20"])
+        obj.ma60 = RollingMean.from_dict(state["ma60"])
+        obj.rsi = RSI.from_dict(state["rsi"])
+        obj.macd = MACD.from_dict(state["macd"])
+        obj.bb = BollingerBands.from_dict(state["bb"])
+        obj.last_date = state["last_date"]
+        obj.bars = state["bars"]
+        return obj
+
+    def save(self, path: str):
+        """ 상태를 JSON으로 원자적 저장 (float는 repr 왕복이라 값이 그대로 복원됨) """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IndicatorState":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
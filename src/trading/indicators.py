@@ -0,0 +1,284 @@
+# src/trading/indicators.py
+import numpy as np
+import pandas as pd
+
+from src.trading import kernels
+
+# config/config.yaml에 features.indicators가 없을 때 쓰는 기본 지표 (calculate_technical_indicators 원래 구성)
+DEFAULT_INDICATORS = {
+    "MA20":        {"op": "sma", "input": "Close", "window": 20},
+    "MA60":        {"op": "sma", "input": "Close", "window": 60},
+    "RSI14":       {"op": "rsi", "input": "Close", "window": 14},
+    "MACD":        {"op": "macd", "input": "Close", "fast": 12, "slow": 26},
+    "MACD_signal": {"op": "macd_signal", "input": "Close", "fast": 12, "slow": 26, "signal": 9},
+    "BB_High":     {"op": "bb_high", "input": "Close", "window": 20, "dev": 2},
+    "BB_Low":      {"op": "bb_low", "input": "Close", "window": 20, "dev": 2},
+}
+DEFAULT_MODEL_FEATURES = ["MA20", "MA60", "RSI14", "MACD_signal", "Volume"]
+
+
+# ---------------------------------------------------------------------------
+# 중간 결과(노드) 계산 함수: 노드는 (종류, 입력 노드..., 파라미터...) 튜플이고,
+# 값은 Series(한 티커) 또는 DataFrame(열마다 티커)이다. pandas 연산은 열마다 독립적으로 적용된다.
+# ---------------------------------------------------------------------------
+
+def _wrap(like, values):
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    return pd.Series(values, index=like.index)
+
+
+def _rolling_mean(x, window):
+    return x.rolling(window=window, min_periods=window).mean()
+
+
+def _rolling_std(x, window, ddof):
+    return x.rolling(window=window, min_periods=window).std(ddof=ddof)
+
+
+def _ema_span(x, span):
+    return x.ewm(span=span, min_periods=span, adjust=False).mean()
+
+
+def _ema_alpha(x, window):
+    # Wilder 평활 (alpha = 1 / window)
+    return x.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+
+
+def _gain(diff):
+    return diff.where(diff > 0, 0.0)
+
+
+def _loss(diff):
+    return -diff.where(diff < 0, 0.0)
+
+
+def _rsi(up, down):
+    return _wrap(up, np.where(down == 0, 100, 100 - (100 / (1 + up / down))))
+
+
+PRIMITIVES = {
+    "diff": lambda x: x.diff(1),
+    "gain": _gain,
+    "loss": _loss,
+    "rolling_mean": _rolling_mean,
+    "rolling_std": _rolling_std,
+    "ema_span": _ema_span,
+    "ema_alpha": _ema_alpha,
+    "sub": lambda a, b: a - b,
+    "band": lambda mean, std, k: mean + k * std,
+    "rsi": _rsi,
+}
+
+# 같은 노드를 NumPy 커널로 계산 (값은 ndarray, 시간 축 0). 누적합·lfilter 기반이라 결과는 pandas와
+# 부동소수점 오차 범위(상대 1e-9 안팎)에서 같다. 내부 NaN 구간은 건너뛴다 (ewm ignore_na=True와 같음)
+NUMPY_PRIMITIVES = {
+    "diff": kernels.diff,
+    "gain": kernels.gain,
+    "loss": kernels.loss,
+    "rolling_mean": kernels.rolling_mean,
+    "rolling_std": kernels.rolling_std,
+    "ema_span": kernels.ema,
+    "ema_alpha": kernels.wilder,
+    "sub": lambda a, b: a - b,
+    "band": lambda mean, std, k: mean + k * std,
+    "rsi": kernels.rsi,
+}
+
+# backend 이름 → 노드 계산 함수 표 ("ta"는 노드 그래프 없이 ta 라이브러리로 지표마다 계산하는 기준 구현)
+BACKENDS = {"pandas": PRIMITIVES, "numpy": NUMPY_PRIMITIVES, "ta": None}
+
+
+# ---------------------------------------------------------------------------
+# 지표 정의(op): 설정의 파라미터로 노드 그래프를 만들어 최종 노드를 반환
+# ---------------------------------------------------------------------------
+
+OPS = {}
+
+
+def register(name):
+    """ 지표 op 등록 데코레이터. 함수는 (입력 노드, **파라미터) → 결과 노드 """
+    def decorator(func):
+        OPS[name] = func
+        return func
+    return decorator
+
+
+@register("sma")
+def _op_sma(x, window):
+    return ("rolling_mean", x, window)
+
+
+@register("ema")
+def _op_ema(x, span):
+    return ("ema_span", x, span)
+
+
+@register("rsi")
+def _op_rsi(x, window=14):
+    diff = ("diff", x)
+    return ("rsi", ("ema_alpha", ("gain", diff), window), ("ema_alpha", ("loss", diff), window))
+
+
+@register("macd")
+def _op_macd(x, fast=12, slow=26):
+    return ("sub", ("ema_span", x, fast), ("ema_span", x, slow))
+
+
+@register("macd_signal")
+def _op_macd_signal(x, fast=12, slow=26, signal=9):
+    return ("ema_span", _op_macd(x, fast, slow), signal)
+
+
+@register("macd_diff")
+def _op_macd_diff(x, fast=12, slow=26, signal=9):
+    macd = _op_macd(x, fast, slow)
+    return ("sub", macd, ("ema_span", macd, signal))
+
+
+@register("rolling_std")
+def _op_rolling_std(x, window, ddof=0):
+    return ("rolling_std", x, window, ddof)
+
+
+@register("bb_high")
+def _op_bb_high(x, window=20, dev=2):
+    return ("band", ("rolling_mean", x, window), ("rolling_std", x, window, 0), dev)
+
+
+@register("bb_low")
+def _op_bb_low(x, window=20, dev=2):
+    return ("band", ("rolling_mean", x, window), ("rolling_std", x, window, 0), -dev)
+
+
+class IndicatorRegistry:
+    """
+    설정(지표명 → {op, input, 파라미터})으로 정의한 지표 모음.
+    지표마다 중간 결과 노드(이동평균, 이동표준편차, EMA 등)의 그래프를 만들고,
+    같은 노드(종류·입력·파라미터가 같은 것)는 여러 지표가 함께 써도 한 번만 계산한다.
+    예) MA20과 BB_High/BB_Low는 같은 20일 이동평균을, MACD와 MACD_signal은 같은 EMA를 공유한다.
+
+    Parameters:
+    - spec: {지표명: {"op": ..., "input": 입력 컬럼, 파라미터...}} (기본: config.yaml의 features.indicators)
+    """
+    def __init__(self, spec: dict = None):
+        self.spec = dict(spec if spec is not None else load_indicator_spec())
+        self.outputs = {}
+        for name, definition in self.spec.items():
+            params = dict(definition)
+            op = params.pop("op")
+            if op not in OPS:
+                raise ValueError(f"unknown indicator op {op!r} for {name}")
+            source = ("input", params.pop("input", "Close"))
+            self.outputs[name] = OPS[op](source, **params)
+
+    @property
+    def columns(self) -> list:
+        return list(self.spec)
+
+    def plan(self, columns=None) -> list:
+        """ 요청한 지표를 만드는 데 필요한 노드만, 의존 순서대로 (중복 없이) 나열 """
+        order, seen = [], set()
+
+        def visit(node):
+            if node in seen:
+                return
+            seen.add(node)
+            if node[0] != "input":
+                for arg in node[1:]:
+                    if isinstance(arg, tuple):
+                        visit(arg)
+            order.append(node)
+
+        for name in (self.columns if columns is None else columns):
+            visit(self.outputs[name])
+        return order
+
+    def inputs(self, columns=None) -> list:
+        """ 요청한 지표 계산에 필요한 입력 컬럼 이름 """
+        return [node[1] for node in self.plan(columns) if node[0] == "input"]
+
+    def compute(self, data, columns=None, backend: str = "pandas") -> dict:
+        """
+        data(입력 컬럼을 가진 DataFrame, 또는 {입력명: Series/DataFrame})로 지표 계산.
+        columns를 주면 그 지표와 필요한 중간 결과만 계산한다.
+        - backend: "pandas" (ta와 비트 단위로 같은 값), "numpy" (NumPy 커널, 더 빠름),
+                   "ta" (ta 라이브러리로 지표마다 계산하는 기준 구현, 비교용)
+        반환: {지표명: 값} (입력과 같은 인덱스의 Series/DataFrame)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown indicator backend {backend!r} (choose from {', '.join(BACKENDS)})")
+        columns = self.columns if columns is None else [c for c in columns if c in self.outputs]
+        if backend == "ta":
+            return {name: _ta_indicator(data, self.spec[name]) for name in columns}
+
+        primitives = BACKENDS[backend]
+        values, inputs = {}, {}
+        for node in self.plan(columns):
+            if node[0] == "input":
+                inputs[node] = data[node[1]]
+                values[node] = inputs[node] if backend == "pandas" else inputs[node].to_numpy(dtype=np.float64)
+                continue
+            args = [values[a] if isinstance(a, tuple) else a for a in node[1:]]
+            values[node] = primitives[node[0]](*args)
+        if backend == "pandas":
+            return {name: values[self.outputs[name]] for name in columns}
+        like = next(iter(inputs.values()), None)
+        return {name: _wrap(like, values[self.outputs[name]]) for name in columns}
+
+
+def _ta_indicator(data, definition: dict):
+    """ ta 라이브러리로 지표 하나 계산 (DataFrame 입력이면 열마다) """
+    import ta
+
+    p = dict(definition)
+    op = p.pop("op")
+    x = data[p.pop("input", "Close")]
+    macd = {"window_fast": p.get("fast", 12), "window_slow": p.get("slow", 26)}
+    bb = {"window": p.get("window", 20), "window_dev": p.get("dev", 2)}
+    reference = {
+        "sma": lambda s: ta.trend.sma_indicator(s, window=p.get("window")),
+        "ema": lambda s: ta.trend.ema_indicator(s, window=p.get("span")),
+        "rsi": lambda s: ta.momentum.rsi(s, window=p.get("window", 14)),
+        "macd": lambda s: ta.trend.macd(s, **macd),
+        "macd_signal": lambda s: ta.trend.macd_signal(s, window_sign=p.get("signal", 9), **macd),
+        "macd_diff": lambda s: ta.trend.macd_diff(s, window_sign=p.get("signal", 9), **macd),
+        "bb_high": lambda s: ta.volatility.bollinger_hband(s, **bb),
+        "bb_low": lambda s: ta.volatility.bollinger_lband(s, **bb),
+    }
+    if op not in reference:
+        raise ValueError(f"no ta reference implementation for op {op!r}")
+    if isinstance(x, pd.DataFrame):
+        return x.apply(reference[op])
+    return reference[op](x)
+
+
+def _features_config() -> dict:
+    from src.config import config
+    return (config or {}).get("features") or {}
+
+
+def indicator_backend() -> str:
+    """ config/config.yaml의 features.backend (없으면 "pandas") """
+    return _features_config().get("backend") or "pandas"
+
+
+def load_indicator_spec() -> dict:
+    """ config/config.yaml의 features.indicators (없으면 DEFAULT_INDICATORS) """
+    return _features_config().get("indicators") or DEFAULT_INDICATORS
+
+
+def model_features() -> list:
+    """ 모델 입력 특징 목록: config/config.yaml의 features.model_features (없으면 기본 목록) """
+    return list(_features_config().get("model_features") or DEFAULT_MODEL_FEATURES)
+
+
+_default_registry = None
+
+
+def default_registry() -> IndicatorRegistry:
+    """ config.yaml 지표 정의로 만든 공용 registry (최초 호출 시 생성) """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = IndicatorRegistry()
+    return _default_registry
@@ -0,0 +1,170 @@
+# src/trading/kernels.py
+"""
+기술적 지표용 NumPy 커널. 입력은 1차원(봉) 또는 2차원(봉 × 티커) float 배열이며 시간 축은 0번 축.
+원소마다 도는 Python 루프 없이 누적합(이동평균·분산)과 scipy lfilter(EMA·Wilder 재귀식)로 계산한다.
+min_periods 규칙과 값은 pandas rolling/ewm(adjust=False)과 부동소수점 오차 범위에서 같다.
+단, ewm 중간의 NaN 구간은 ignore_na=True처럼 건너뛴다 (pandas 기본값은 공백 길이만큼 이전 가중치를 줄임).
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+# 누적합을 이 길이의 블록마다 새로 시작해 긴 시계열에서도 합계가 커지며 생기는 오차를 막는다
+BLOCK = 1024
+
+
+def _windowed(x: np.ndarray, window: int) -> np.ndarray:
+    """ 마지막 축의 누적합 차이로 길이 window 창의 합 (창이 끝나는 위치부터). x는 누적합으로 덮어씀 """
+    cs = np.cumsum(x, axis=-1, out=x)
+    out = cs[..., window - 1:].copy()
+    out[..., 1:] -= cs[..., :-window]
+    return out
+
+
+def _window_sums(values: np.ndarray, window: int, power: int = 1):
+    """
+    각 위치(창의 끝)마다 길이 window 창의 (중심화된 값의 합[, 제곱합], 기준값, 유효 개수) 계산.
+    시계열을 BLOCK 단위로 나누고, 블록마다 직전 window-1 봉을 붙인 행에서 블록 평균을 빼고
+    누적합을 구한다. 누적합이 블록 길이 이상 커지지 않아 긴 시계열에서도 자릿수 손실이 없다.
+    """
+    n = values.shape[0]
+    tail_shape = values.shape[1:]
+    n_blocks = max(1, -(-n // BLOCK))
+    has_nan = bool(np.isnan(values).any())
+    padded = np.empty((window - 1 + n_blocks * BLOCK,) + tail_shape)
+    padded[window - 1:window - 1 + n] = values
+    if has_nan:
+        padded[:window - 1] = np.nan
+        padded[window - 1 + n:] = np.nan
+    elif n:
+        # 결측이 없으면 앞뒤를 끝 값으로 채워 블록 평균이 치우치지 않게 (채운 칸의 결과는 버려짐)
+        padded[:window - 1] = values[0]
+        padded[window - 1 + n:] = values[-1]
+    rows = sliding_window_view(padded, BLOCK + window - 1, axis=0)[::BLOCK]  # (블록, ..., 행 길이)
+
+    if has_nan:
+        valid = ~np.isnan(rows)
+        count = _windowed(valid.astype(np.float64), window)
+        centered = np.where(valid, rows, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ref = centered.sum(axis=-1, keepdims=True) / valid.sum(axis=-1, keepdims=True)
+        ref = np.where(np.isfinite(ref), ref, 0.0)
+        centered -= ref
+        centered[~valid] = 0.0
+    else:
+        ref = rows.mean(axis=-1, keepdims=True)
+        centered = rows - ref
+
+    def unblock(x):
+        x = np.moveaxis(x, -1, 1)  # (블록, BLOCK, ...)
+        return x.reshape((n_blocks * BLOCK,) + tail_shape)[:n]
+
+    squared = centered * centered if power == 2 else None
+    sums = [_windowed(centered, window)]
+    if power == 2:
+        sums.append(_windowed(squared, window))
+    ref = unblock(np.broadcast_to(ref, sums[0].shape))
+    if has_nan:
+        count = unblock(count)
+    else:
+        # 결측이 없으면 유효 개수는 위치로 정해짐 (시간 축으로만 변하므로 뒤 축은 브로드캐스트)
+        count = np.minimum(np.arange(1, n + 1), window).astype(np.float64).reshape((n,) + (1,) * len(tail_shape))
+    return tuple(unblock(x) for x in sums) + (ref, count)
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    """ 이동평균 (창 안의 유효 값이 min_periods 미만이면 NaN) """
+    min_periods = window if min_periods is None else min_periods
+    s1, ref, count = _window_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s1 /= count
+    s1 += ref
+    s1[np.broadcast_to((count < min_periods) | (count == 0), s1.shape)] = np.nan
+    return s1
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0, min_periods: int = None) -> np.ndarray:
+    """ 이동표준편차 """
+    min_periods = window if min_periods is None else min_periods
+    s1, s2, _, count = _window_sums(values, window, power=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s1 *= s1
+        s1 /= count
+        s2 -= s1
+        s2 /= count - ddof
+    np.maximum(s2, 0.0, out=s2)  # 누적합 오차로 생기는 아주 작은 음수 제거
+    s2[np.broadcast_to(count == 1, s2.shape)] = 0.0  # 값 하나짜리 창은 정확히 0
+    np.sqrt(s2, out=s2)
+    s2[np.broadcast_to((count < min_periods) | (count <= ddof), s2.shape)] = np.nan
+    return s2
+
+
+def ewm_mean(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    adjust=False 지수 가중 평균: y[t] = (1 - alpha) * y[t-1] + alpha * x[t], y[첫 유효값] = x.
+    NaN 입력은 건너뛰고(직전 값 유지, ignore_na=True와 같음), 유효 관측 수가 min_periods 미만이면 NaN.
+    유효 값만 앞으로 모아 lfilter로 한 번에 재귀 계산한 뒤 원래 위치로 돌려놓는다.
+    """
+    valid = ~np.isnan(values)
+    if values.ndim == 1 and len(values):
+        first = int(valid.argmax())
+        if valid[first:].all():
+            # 흔한 경우(앞쪽 NaN만 있음): 모으기·되돌리기 없이 바로 계산
+            out = np.full(values.shape, np.nan)
+            out[first:] = _ema_filter(values[first:], alpha)
+            out[:first + max(min_periods, 1) - 1] = np.nan
+            return out
+    nobs = np.cumsum(valid, axis=0)
+    if values.ndim == 1:
+        packed = values[valid]
+        y = _ema_filter(packed, alpha)
+        out = np.where(nobs >= 1, y[np.maximum(nobs - 1, 0)] if len(y) else np.nan, np.nan)
+    else:
+        cols = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+        packed = np.full(values.shape, np.nan)
+        packed[nobs[valid] - 1, cols[valid]] = values[valid]
+        y = _ema_filter(np.where(np.isnan(packed), 0.0, packed), alpha)
+        out = np.where(nobs >= 1, y[np.maximum(nobs - 1, 0), cols], np.nan)
+    out[nobs < max(min_periods, 1)] = np.nan
+    return out
+
+
+def _ema_filter(x: np.ndarray, alpha: float) -> np.ndarray:
+    if x.shape[0] == 0:
+        return x.astype(np.float64)
+    decay = 1.0 - alpha
+    zi = (decay * x[0])[np.newaxis, ...]
+    y, _ = lfilter([alpha], [1.0, -decay], x, axis=0, zi=zi)
+    return y
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """ ta/pandas ewm(span, min_periods=span, adjust=False) """
+    return ewm_mean(values, 2.0 / (span + 1.0), min_periods=span)
+
+
+def wilder(values: np.ndarray, window: int) -> np.ndarray:
+    """ Wilder 평활: ewm(alpha=1/window, min_periods=window, adjust=False) """
+    return ewm_mean(values, 1.0 / window, min_periods=window)
+
+
+def diff(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values, dtype=np.float64)
+    if len(out) == 0:
+        return out
+    out[0] = np.nan
+    np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def gain(d: np.ndarray) -> np.ndarray:
+    return np.where(d > 0, d, 0.0)
+
+
+def loss(d: np.ndarray) -> np.ndarray:
+    return np.where(d < 0, -d, 0.0)
+
+
+def rsi(up: np.ndarray, down: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(down == 0, 100.0, 100.0 - 100.0 / (1.0 + up / down))
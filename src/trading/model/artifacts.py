@@ -0,0 +1,253 @@
+# src/trading/model/artifacts.py
+import functools
+import json
+import os
+import platform
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import sklearn
+import lightgbm as lgb
+import xgboost as xgb
+
+from src.trading.model.tree_ensemble import TreeEnsemble
+
+# manifest 형식 버전. 다른 형식이면 load_artifact가 거부한다 (2: 스케일러를 합친 추론 엔진 배열)
+FORMAT_VERSION = 2
+DEFAULT_REGISTRY = os.path.join("models", "registry")
+MANIFEST = "manifest.json"
+# 모델 종류별 네이티브 모델 파일 (rf는 추론 엔진 배열이 곧 모델)
+MODEL_FILES = {"rf": None, "xgb": "model.ubj", "lgb": "model.txt"}
+ENGINE_DIR = "engine"
+# xgb/lgb 아티팩트는 이 행 수 이상이면 네이티브 부스터로 예측 (큰 배치는 라이브러리 C 구현이 더 빠름,
+# 기준은 benchmarks/bench_inference.py의 crossover 측정 참고)
+NATIVE_MIN_ROWS = 256
+
+
+def _versions(model_type: str) -> dict:
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "sklearn": sklearn.__version__}
+    if model_type == "xgb":
+        versions["xgboost"] = xgb.__version__
+    elif model_type == "lgb":
+        versions["lightgbm"] = lgb.__version__
+    return versions
+
+
+def _model_params(model) -> dict:
+    if model.model_type == "rf":
+        return model.model.get_params()
+    return {**model.params, "num_boost_round": model.num_boost_round}
+
+
+def write_artifact(model, directory: str, features=None, data_hash: str = None, metrics: dict = None,
+                   train_window: dict = None) -> dict:
+    """
+    학습된 모델(BaseModel)을 directory에 아티팩트로 저장하고 manifest를 반환.
+    - 스케일러: scaler_mean.npy / scaler_scale.npy (memmap으로 읽음)
+    - engine/*.npy: 스케일러를 분할 기준값에 합친 TreeEnsemble 노드 배열 (memmap으로 읽어 원래 특징 값으로 바로 예측)
+    - XGBoost: model.ubj (Booster.save_model), LightGBM: model.txt (Booster.save_model)
+    - manifest.json: 특징 목록, 데이터 해시, 지표, 하이퍼파라미터, 학습 구간, 라이브러리 버전, 파일 목록
+
+    Parameters:
+    - features:     특징 이름 목록 (입력 열 순서)
+    - data_hash:    학습 데이터 해시 (dataset_cache.data_hash)
+    - metrics:      평가 지표 dict (예: {"accuracy": 0.53})
+    - train_window: 학습 구간 dict (예: {"start": "2015-01-02", "end": "2022-12-29", "rows": 1900})
+    """
+    model_type = model.model_type
+    if model_type not in MODEL_FILES:
+        raise ValueError(f"Unsupported model type for artifacts: {model_type}")
+    os.makedirs(directory, exist_ok=True)
+    files = {"engine": ENGINE_DIR}
+    if MODEL_FILES[model_type]:
+        files["model"] = MODEL_FILES[model_type]
+    if getattr(model.scaler, "mean_", None) is not None:
+        np.save(os.path.join(directory, "scaler_mean.npy"), model.scaler.mean_)
+        files["scaler_mean"] = "scaler_mean.npy"
+    if getattr(model.scaler, "scale_", None) is not None:
+        np.save(os.path.join(directory, "scaler_scale.npy"), model.scaler.scale_)
+        files["scaler_scale"] = "scaler_scale.npy"
+
+    manifest = {"format_version": FORMAT_VERSION, "model_type": model_type,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "features": list(features) if features is not None else None,
+                "data_hash": data_hash, "metrics": metrics or {}, "params": _model_params(model),
+                "train_window": train_window, "versions": _versions(model_type), "files": files}
+    manifest["engine"] = model.compile(fuse_scaler=True).save(os.path.join(directory, ENGINE_DIR))
+    if model_type == "xgb":
+        model.model.save_model(os.path.join(directory, files["model"]))
+        manifest["best_iteration"] = getattr(model.model, "best_iteration", None)
+    elif model_type == "lgb":
+        # 조기 종료했으면 최적 라운드까지만 저장 (LightGBMModel.predict와 같은 라운드)
+        model.model.save_model(os.path.join(directory, files["model"]))
+        manifest["best_iteration"] = model.model.best_iteration or None
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+    return manifest
+
+
+class ModelArtifact:
+    """
+    저장된 모델 아티팩트. 생성 시에는 manifest만 읽고 추론 엔진·스케일러·네이티브 모델은 처음 쓸 때 불러온다.
+    예측은 스케일러를 합친 추론 엔진(TreeEnsemble)으로 원래 특징 값에서 바로 계산한다 (transform 단계 없음).
+    xgb/lgb는 NATIVE_MIN_ROWS 행 이상의 배치를 transform 후 네이티브 부스터로 예측한다
+    (라벨은 같고 확률은 마지막 자리(1ulp)까지 다를 수 있음, TreeEnsemble.predict_proba 참고).
+    엔진 배열과 스케일러는 읽기 전용 memmap이라 같은 아티팩트를 여는 프로세스들이 페이지 캐시를 공유한다.
+    """
+    def __init__(self, directory: str, manifest: dict):
+        self.directory = directory
+        self.manifest = manifest
+        self.model_type = manifest["model_type"]
+        self.features = manifest.get("features")
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, self.manifest["files"][name])
+
+    @functools.cached_property
+    def scaler(self):
+        """ (mean, scale) memmap 배열. 저장된 스케일러가 없으면 None """
+        if "scaler_mean" not in self.manifest["files"]:
+            return None
+        return np.load(self._path("scaler_mean"), mmap_mode="r"), np.load(self._path("scaler_scale"), mmap_mode="r")
+
+    @functools.cached_property
+    def engine(self) -> TreeEnsemble:
+        return TreeEnsemble.load(self._path("engine"), self.manifest["engine"])
+
+    @functools.cached_property
+    def model(self):
+        """ xgb.Booster / lgb.Booster (rf는 엔진 배열만 저장하므로 engine) """
+        if "model" not in self.manifest["files"]:
+            return self.engine
+        path = self._path("model")
+        if self.model_type == "xgb":
+            booster = xgb.Booster()
+            booster.load_model(path)
+            return booster
+        return lgb.Booster(model_file=path)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """ 학습 때의 StandardScaler 변환 (스케일러가 없으면 그대로) """
+        X = np.asarray(X, dtype=np.float64)
+        if self.scaler is None:
+            return X
+        mean, scale = self.scaler
+        return (X - mean) / scale
+
+    def _native(self, X) -> bool:
+        return "model" in self.manifest["files"] and len(X) >= NATIVE_MIN_ROWS
+
+    def _native_proba(self, X: np.ndarray) -> np.ndarray:
+        scaled = self.transform(X)
+        if self.model_type == "xgb":
+            # 엔진과 같은 라운드까지 (조기 종료한 모델은 best_iteration)
+            best = self.manifest.get("best_iteration")
+            return self.model.predict(xgb.DMatrix(scaled), iteration_range=(0, best + 1) if best is not None else (0, 0))
+        return self.model.predict(scaled)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """ 상승(클래스 1) 확률, shape (n_rows,). X: 스케일하지 않은 원래 특징 값 """
+        if self._native(X):
+            return self._native_proba(X)
+        classes = list(self.engine.classes)
+        proba = self.engine.predict_proba(X)
+        return proba[:, classes.index(1)] if 1 in classes else np.zeros(len(proba))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """ 0/1 예측 (ml_models 모델에 스케일한 입력을 넣은 predict와 같은 값) """
+        if self._native(X):
+            return (self._native_proba(X) > 0.5).astype(int)
+        return self.engine.predict(X)
+
+
+def load_artifact(directory: str) -> ModelArtifact:
+    """ 아티팩트 디렉터리 열기 (manifest만 읽음) """
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{directory}: artifact format {manifest.get('format_version')} is not supported "
+                         f"(expected {FORMAT_VERSION}), re-register the model")
+    return ModelArtifact(directory, manifest)
+
+
+class ModelRegistry:
+    """
+    모델 아티팩트 로컬 저장소. root/{이름}/v{번호}/ 에 버전별로 저장한다.
+    등록은 임시 디렉터리에 모두 쓴 뒤 rename으로 옮기므로 읽는 쪽은 완성된 버전만 보고,
+    여러 프로세스가 같은 이름을 동시에 등록해도 서로 다른 버전 번호를 받는다.
+    """
+    def __init__(self, root: str = DEFAULT_REGISTRY):
+        self.root = root
+
+    def _dir(self, name: str) -> str:
+        if not name or ":" in name or os.sep in name or "/" in name or name.startswith("."):
+            raise ValueError(f"Invalid model name: {name!r}")
+        return os.path.join(self.root, name)
+
+    def names(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(n for n in os.listdir(self.root) if not n.startswith(".") and self.versions(n))
+
+    def versions(self, name: str) -> list:
+        """ 등록된 버전 번호 (오름차순) """
+        directory = self._dir(name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(d[1:]) for d in os.listdir(directory) if d.startswith("v") and d[1:].isdigit())
+
+    def register(self, name: str, model, **manifest) -> tuple:
+        """
+        모델을 새 버전으로 등록. manifest: write_artifact의 features, data_hash, metrics, train_window
+        반환: (버전 번호, 아티팩트 디렉터리)
+        """
+        directory = self._dir(name)
+        os.makedirs(directory, exist_ok=True)
+        tmp = os.path.join(directory, f".tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        try:
+            write_artifact(model, tmp, **manifest)
+            while True:
+                version = (self.versions(name) or [0])[-1] + 1
+                path = os.path.join(directory, f"v{version}")
+                try:
+                    os.rename(tmp, path)
+                    break
+                except OSError:
+                    # 다른 프로세스가 같은 번호를 먼저 등록함
+                    if not os.path.isdir(path):
+                        raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print(f"[INFO] Registered model {name}:{version} at {path}")
+        return version, path
+
+    def resolve(self, name: str, version: int = None) -> str:
+        """ "이름" 또는 "이름:버전" → 아티팩트 디렉터리 (버전 생략 시 최신) """
+        if version is None and ":" in name:
+            name, version = name.split(":", 1)
+        versions = self.versions(name)
+        if not versions:
+            raise FileNotFoundError(f"No registered model named {name!r} in {self.root}")
+        version = int(version) if version is not None else versions[-1]
+        if version not in versions:
+            raise FileNotFoundError(f"{name} has no version {version} (available: {versions})")
+        return os.path.join(self._dir(name), f"v{version}")
+
+    def load(self, name: str, version: int = None) -> ModelArtifact:
+        return load_artifact(self.resolve(name, version))
+
+    def list(self) -> pd.DataFrame:
+        """ 등록된 전체 버전 표 (이름, 버전, 모델 종류, 생성 시각, 학습 행 수, 지표) """
+        rows = []
+        for name in self.names():
+            for version in self.versions(name):
+                manifest = load_artifact(os.path.join(self._dir(name), f"v{version}")).manifest
+                window = manifest.get("train_window") or {}
+                rows.append({"name": name, "version": version, "model": manifest["model_type"],
+                             "created": manifest["created"], "train_rows": window.get("rows"),
+                             **manifest.get("metrics", {})})
+        return pd.DataFrame(rows)
@@ -0,0 +1,37 @@
+# src/trading/model/dataset.py
+import numpy as np
+import pandas as pd
+
+from src.trading.indicators import model_features
+from src.trading.price_store import load_prices
+
+# 시계열 학습/테스트 분할: 앞 TRAIN_FRACTION이 학습 구간, 나머지가 train_model의 테스트 세트이자 백테스트 매매 구간
+TRAIN_FRACTION = 0.8
+
+
+def create_target(df: pd.DataFrame):
+    # 내일 종가 상승 여부 이진 분류 (1: 상승, 0: 하락/보합)
+    df['Target'] = np.where(df['Adj Close'].shift(-1) > df['Adj Close'], 1, 0)
+    df.dropna(subset=['Target'], inplace=True)
+    return df
+
+
+def features_and_target(source: str):
+    """ processed 데이터(티커 또는 CSV)에서 학습 입력 행렬 X, 타깃 y와 날짜 인덱스 """
+    df = create_target(load_prices(source, dataset="processed"))
+    return df[model_features()].values, df['Target'].values, df.index
+
+
+def train_split_index(n_rows: int) -> int:
+    """ 학습 구간이 끝나는(테스트·백테스트 구간이 시작하는) 행 번호 """
+    return int(n_rows * TRAIN_FRACTION)
+
+
+def training_window(source: str):
+    """
+    features_and_target의 학습 구간(X, y, 날짜)만 반환.
+    하이퍼파라미터 탐색은 이 구간 안에서만 후보를 비교해야 테스트·백테스트 구간에 맞춘 파라미터가 골라지지 않는다.
+    """
+    X, y, dates = features_and_target(source)
+    n_train = train_split_index(len(X))
+    return X[:n_train], y[:n_train], dates[:n_train]
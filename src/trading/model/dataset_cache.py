@@ -0,0 +1,161 @@
+# src/trading/model/dataset_cache.py
+import functools
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import lightgbm as lgb
+import xgboost as xgb
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "datasets")
+
+# Dataset 구성(binning)에 영향을 주는 파라미터와 그 별칭. 키에 포함되며 나머지(학습률 등)는 무시한다
+LGB_DATASET_PARAMS = {
+    "max_bin": ("max_bins",), "max_bin_by_feature": (), "min_data_in_bin": (),
+    "bin_construct_sample_cnt": ("subsample_for_bin",), "data_random_seed": ("data_seed",), "feature_pre_filter": (), "use_missing": (), "zero_as_missing": (),
+    "enable_bundle": ("is_enable_bundle", "bundle"), "is_enable_sparse": ("is_sparse", "enable_sparse", "sparse"),
+    "linear_tree": ("linear_trees",), "categorical_feature": ("cat_feature", "categorical_column", "cat_column"),
+    # feature_pre_filter(기본 켜짐)가 min_data_in_leaf로 분할 불가능한 특징을 미리 걸러낸다
+    "min_data_in_leaf": ("min_data_per_leaf", "min_data", "min_child_samples", "min_samples_leaf"),
+}
+XGB_DATASET_PARAMS = {"max_bin": (), "max_cat_to_onehot": ()}
+
+
+def data_hash(X: np.ndarray, y: np.ndarray = None) -> str:
+    """ 특징 행렬(·타깃)의 내용 해시 """
+    h = hashlib.sha1()
+    for a in (X, y):
+        if a is None:
+            continue
+        a = np.ascontiguousarray(a)
+        h.update(f"{a.dtype}{a.shape}".encode("utf-8"))
+        h.update(a.data)
+    return h.hexdigest()
+
+
+def _dataset_params(params: dict, names: dict) -> dict:
+    """ params 중 names(정식 이름 → 별칭들)에 해당하는 값만 정식 이름으로 """
+    found = {}
+    for name, aliases in names.items():
+        for alias in (name,) + aliases:
+            if alias in (params or {}):
+                found[name] = params[alias]
+    return found
+
+
+class DatasetCache:
+    """
+    XGBoost/LightGBM 학습용 데이터 구조 캐시.
+    키: (특징 행렬·라벨 해시, binning 파라미터, 라이브러리 버전, 검증 세트면 학습 세트 키)
+
+    - LightGBM: binning이 끝난 Dataset을 save_binary로 root/lgb 아래에 저장하고, 다음 학습(다른 프로세스 포함)에서는
+                파일을 바로 읽어 binning을 건너뛴다. 검증 세트는 학습 세트의 bin 경계로 만든 것을 함께 저장한다.
+    - XGBoost:  hist 분위수 스케치를 담은 QuantileDMatrix를 같은 프로세스 안에서 재사용한다. XGBoost는 일반
+                DMatrix만 binary 저장을 지원하고 그렇게 읽은 DMatrix는 학습 때 스케치를 다시 하므로 디스크에는 두지 않는다.
+    최근 사용한 memory_items개 데이터셋은 메모리에도 둔다. 디스크 전체 크기가 max_bytes를 넘으면 오래 안 쓴 파일부터 삭제.
+    """
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, memory_items: int = 8, max_bytes: int = 2 << 30):
+        self.root = root
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self.stats = {"memory": 0, "disk": 0, "built": 0}
+
+    @staticmethod
+    def key(library: str, X: np.ndarray, y: np.ndarray, params: dict, reference: str = None) -> str:
+        names, version = (LGB_DATASET_PARAMS, lgb.__version__) if library == "lgb" else (XGB_DATASET_PARAMS, xgb.__version__)
+        setting = json.dumps([library, version, _dataset_params(params, names), reference], sort_keys=True, default=str)
+        return hashlib.sha1((setting + data_hash(X, y)).encode("utf-8")).hexdigest()
+
+    def _recall(self, key: str):
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory"] += 1
+        return value
+
+    def _remember(self, key: str, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+        return value
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, "lgb", key[:2], key + ".bin")
+
+    def lgb_datasets(self, X_train: np.ndarray, y_train: np.ndarray, X_val=None, y_val=None, params: dict = None):
+        """ (학습 Dataset, 검증 Dataset 또는 None) 반환. 둘 다 구성(construct)이 끝난 상태 """
+        params = dict(params or {})
+        train_key = self.key("lgb", X_train, y_train, params)
+        train = self._lgb_dataset(train_key, X_train, y_train, params)
+        if X_val is None:
+            return train, None
+        val_key = self.key("lgb", X_val, y_val, params, reference=train_key)
+        return train, self._lgb_dataset(val_key, X_val, y_val, params, reference=train)
+
+    def _lgb_dataset(self, key, X, y, params, reference=None):
+        found = self._recall(key)
+        if found is not None:
+            return found
+        path = self._path(key)
+        if os.path.exists(path):
+            try:
+                dataset = lgb.Dataset(path, reference=reference, params=params).construct()
+                os.utime(path)
+                self.stats["disk"] += 1
+                return self._remember(key, dataset)
+            except lgb.basic.LightGBMError as e:
+                print(f"[WARN] 손상된 데이터셋 캐시 {path} 무시: {e}")
+        dataset = lgb.Dataset(X, label=y, reference=reference, params=params).construct()
+        self.stats["built"] += 1
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        dataset.save_binary(tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+        return self._remember(key, dataset)
+
+    def xgb_matrices(self, X_train: np.ndarray, y_train: np.ndarray, X_val=None, y_val=None, params: dict = None):
+        """
+        (학습 QuantileDMatrix, 검증 QuantileDMatrix 또는 None) 반환. 검증 세트는 학습 세트의 분위수를 공유.
+        QuantileDMatrix는 hist 방식 전용이라 다른 tree_method면 캐시 없이 일반 DMatrix를 만든다.
+        """
+        params = dict(params or {})
+        if params.get("tree_method", "hist") not in ("hist", "auto"):
+            return xgb.DMatrix(X_train, label=y_train), None if X_val is None else xgb.DMatrix(X_val, label=y_val)
+        options = {"max_bin": params["max_bin"]} if "max_bin" in params else {}
+        nthread = params.get("nthread")
+        train_key = self.key("xgb", X_train, y_train, params)
+        train = self._recall(train_key)
+        if train is None:
+            train = self._remember(train_key, xgb.QuantileDMatrix(X_train, label=y_train, nthread=nthread, **options))
+            self.stats["built"] += 1
+        if X_val is None:
+            return train, None
+        val_key = self.key("xgb", X_val, y_val, params, reference=train_key)
+        val = self._recall(val_key)
+        if val is None:
+            val = self._remember(val_key, xgb.QuantileDMatrix(X_val, label=y_val, ref=train, nthread=nthread, **options))
+            self.stats["built"] += 1
+        return train, val
+
+    def _evict(self):
+        files = []
+        for dirpath, _, names in os.walk(os.path.join(self.root, "lgb")):
+            files += [os.path.join(dirpath, name) for name in names if name.endswith(".bin")]
+        stats = sorted(((os.stat(f).st_mtime, os.path.getsize(f), f) for f in files))
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in stats:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+@functools.lru_cache(maxsize=None)
+def process_cache(root: str) -> DatasetCache:
+    """ 프로세스마다 하나씩 쓰는 DatasetCache (run_batch 워커가 시험·폴드 사이에 메모리 캐시를 공유하도록) """
+    return DatasetCache(root)
@@ -6,8 +6,16 @@ import xgboost as xgb
 import lightgbm as lgb
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.preprocessing import StandardScaler
+from src.trading.model.tree_ensemble import TreeEnsemble
+
+MODEL_TYPES = ("rf", "xgb", "lgb")
 
 class BaseModel:
+    # 모델 종류 이름 (MODEL_TYPES 중 하나, 모델 아티팩트 manifest에 기록)
+    model_type = None
+    # 검증 세트로 조기 종료하는 모델인지 (XGBoost, LightGBM)
+    early_stopping = False
+
     def __init__(self, scaler: StandardScaler = None):
         self.scaler = scaler or StandardScaler()
         self.model = None
@@ -17,6 +25,38 @@ class BaseModel:
         X_test_scaled  = self.scaler.transform(X_test)
         return X_train_scaled, X_test_scaled
 
+    def fit(self, X_train: np.ndarray, y_train: np.ndarray, valid_fraction: float = 0.2):
+        """
+        학습 구간만으로 학습. 조기 종료 모델은 학습 구간의 마지막 valid_fraction 비율을 검증 세트로 떼어 쓴다
+        (테스트 세트로 조기 종료하면 테스트 정확도가 낙관적으로 나오므로).
+        """
+        if not self.early_stopping or valid_fraction <= 0:
+            return self.train(X_train, y_train)
+        n_fit = int(len(X_train) * (1 - valid_fraction))
+        return self.train(X_train[:n_fit], y_train[:n_fit], X_val=X_train[n_fit:], y_val=y_train[n_fit:])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """ 상승(클래스 1) 확률, shape (n_rows,). X는 학습 때와 같은 스케일 """
+        raise NotImplementedError
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """ 0/1 예측. X는 학습 때와 같은 스케일 """
+        return (self.predict_proba(X) > 0.5).astype(int)
+
+    def compile(self, fuse_scaler: bool = True) -> TreeEnsemble:
+        """
+        학습된 트리를 TreeEnsemble(평탄한 NumPy 노드 배열 추론 엔진)로 변환. predict와 같은 예측을 낸다.
+        fuse_scaler=True면 스케일러의 평균·표준편차를 분할 기준값에 합쳐, 스케일하지 않은 원래 특징 값을 바로 입력받는다.
+        """
+        mean = scale = None
+        if fuse_scaler and hasattr(self.scaler, "scale_"):
+            mean = self.scaler.mean_ if self.scaler.with_mean else None
+            scale = self.scaler.scale_ if self.scaler.with_std else None
+        return self._compile(mean, scale)
+
+    def _compile(self, mean, scale) -> TreeEnsemble:
+        raise NotImplementedError
+
     def save(self, model_path: str):
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         with open(model_path, "wb") as f:
@@ -30,67 +70,145 @@ class BaseModel:
         return data["model"], data["scaler"]
 
 class RandomForestModel(BaseModel):
-    def __init__(self, n_estimators=100, random_state=42):
+    model_type = "rf"
+
+    def __init__(self, n_estimators=100, random_state=42, n_jobs=None, **params):
         super().__init__()
-        self.model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state)
+        # params: max_depth, min_samples_leaf 등 RandomForestClassifier의 나머지 인자
+        self.model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs, **params)
 
     def train(self, X_train: np.ndarray, y_train: np.ndarray):
         print("[INFO] Training RandomForest...")
         self.model.fit(X_train, y_train)
 
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        classes = list(self.model.classes_)
+        return self.model.predict_proba(X)[:, classes.index(1)] if 1 in classes else np.zeros(len(X))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
+
+    def _compile(self, mean, scale) -> TreeEnsemble:
+        return TreeEnsemble.from_sklearn(self.model, mean, scale)
+
     def evaluate(self, X_test: np.ndarray, y_test: np.ndarray):
-        y_pred = self.model.predict(X_test)
+        y_pred = self.predict(X_test)
         acc = accuracy_score(y_test, y_pred)
         print(f"[RESULT] RandomForest Accuracy: {acc:.4f}")
         print(classification_report(y_test, y_pred))
+        return acc
 
 class XGBoostModel(BaseModel):
-    def __init__(self, params=None, num_boost_round=100):
+    model_type = "xgb"
+    early_stopping = True
+
+    def __init__(self, params=None, num_boost_round=100, n_jobs=None, dataset_cache=None):
         super().__init__()
-        self.params = params or {"objective": "binary:logistic", "eval_metric": "error", "verbosity": 0}
+        self.params = dict(params or {"objective": "binary:logistic", "eval_metric": "error", "verbosity": 0})
+        if n_jobs is not None:
+            self.params["nthread"] = n_jobs
         self.num_boost_round = num_boost_round
+        self.dataset_cache = dataset_cache  # DatasetCache: 같은 데이터의 QuantileDMatrix 재사용
         self.model = None
 
     def train(self, X_train: np.ndarray, y_train: np.ndarray, X_val=None, y_val=None):
         print("[INFO] Training XGBoost...")
-        dtrain = xgb.DMatrix(X_train, label=y_train)
+        if self.dataset_cache is not None:
+            dtrain, dval = self.dataset_cache.xgb_matrices(X_train, y_train, X_val, y_val, self.params)
+        else:
+            dtrain = xgb.DMatrix(X_train, label=y_train)
+            dval = xgb.DMatrix(X_val, label=y_val) if X_val is not None else None
         evals = [(dtrain, "train")]
-        if X_val is not None:
-            dval = xgb.DMatrix(X_val, label=y_val)
+        if dval is not None:
             evals.append((dval, "validation"))
-        self.model = xgb.train(self.params, dtrain, num_boost_round=self.num_boost_round, evals=evals, early_stopping_rounds=10)
+        # 검증 세트가 없으면 조기 종료하지 않음 (마지막 evals인 학습 세트 기준으로 멈추지 않도록)
+        self.model = xgb.train(self.params, dtrain, num_boost_round=self.num_boost_round, evals=evals,
+                               early_stopping_rounds=10 if X_val is not None else None, verbose_eval=False)
 
-    def predict(self, X: np.ndarray):
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
         dtest = xgb.DMatrix(X)
-        preds = self.model.predict(dtest)
-        return (preds > 0.5).astype(int)
+        # 조기 종료했으면 검증 성능이 가장 좋았던 라운드까지만 사용 (Booster.predict 기본은 전체 라운드)
+        best = getattr(self.model, "best_iteration", None)
+        return self.model.predict(dtest, iteration_range=(0, best + 1) if best is not None else (0, 0))
+
+    def _compile(self, mean, scale) -> TreeEnsemble:
+        best = getattr(self.model, "best_iteration", None)
+        return TreeEnsemble.from_xgboost(self.model, mean, scale, n_trees=best + 1 if best is not None else None)
 
     def evaluate(self, X_test: np.ndarray, y_test: np.ndarray):
         y_pred = self.predict(X_test)
         acc = accuracy_score(y_test, y_pred)
         print(f"[RESULT] XGBoost Accuracy: {acc:.4f}")
+        return acc
 
 class LightGBMModel(BaseModel):
-    def __init__(self, params=None, num_boost_round=100):
+    model_type = "lgb"
+    early_stopping = True
+
+    def __init__(self, params=None, num_boost_round=100, n_jobs=None, dataset_cache=None):
         super().__init__()
-        self.params = params or {"objective": "binary", "metric": "binary_error", "verbosity": -1}
+        self.params = dict(params or {"objective": "binary", "metric": "binary_error", "verbosity": -1})
+        if n_jobs is not None:
+            self.params["num_threads"] = n_jobs
         self.num_boost_round = num_boost_round
+        self.dataset_cache = dataset_cache  # DatasetCache: binning된 Dataset을 파일로 저장·재사용
         self.model = None
 
     def train(self, X_train: np.ndarray, y_train: np.ndarray, X_val=None, y_val=None):
         print("[INFO] Training LightGBM...")
-        lgb_train = lgb.Dataset(X_train, label=y_train)
-        valid_sets = []
-        if X_val is not None:
-            lgb_val = lgb.Dataset(X_val, label=y_val, reference=lgb_train)
-            valid_sets.append(lgb_val)
-        self.model = lgb.train(self.params, lgb_train, num_boost_round=self.num_boost_round, valid_sets=valid_sets, early_stopping_rounds=10)
+        if self.dataset_cache is not None:
+            lgb_train, lgb_val = self.dataset_cache.lgb_datasets(X_train, y_train, X_val, y_val, self.params)
+        else:
+            lgb_train = lgb.Dataset(X_train, label=y_train)
+            lgb_val = lgb.Dataset(X_val, label=y_val, reference=lgb_train) if X_val is not None else None
+        valid_sets = [lgb_val] if lgb_val is not None else []
+        # LightGBM 4부터 early_stopping_rounds 인자가 없어져 callback으로 지정
+        callbacks = [lgb.early_stopping(10, verbose=False)] if valid_sets else []
+        self.model = lgb.train(self.params, lgb_train, num_boost_round=self.num_boost_round, valid_sets=valid_sets, callbacks=callbacks)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
 
-    def predict(self, X: np.ndarray):
-        preds = self.model.predict(X)
-        return (preds > 0.5).astype(int)
+    def _compile(self, mean, scale) -> TreeEnsemble:
+        return TreeEnsemble.from_lightgbm(self.model, mean, scale)
 
     def evaluate(self, X_test: np.ndarray, y_test: np.ndarray):
         y_pred = self.predict(X_test)
         acc = accuracy_score(y_test, y_pred)
-        print(f"[RESULT] LightGBM Accuracy: {acc:.4f}")
\ No newline at end of file
+        print(f"[RESULT] LightGBM Accuracy: {acc:.4f}")
+        return acc
+
+def build_model(model_type: str, n_jobs=None, params: dict = None, dataset_cache=None) -> BaseModel:
+    """
+    모델 종류(rf, xgb, lgb)로 모델 생성. n_jobs: 모델 내부 스레드 수
+    params: 기본 설정을 덮어쓸 하이퍼파라미터 (rf는 n_estimators 등 RandomForestClassifier 인자,
+            xgb/lgb는 num_boost_round와 라이브러리 파라미터)
+    dataset_cache: xgb/lgb 학습 데이터 구조 캐시 (DatasetCache, rf는 무시)
+    """
+    params = dict(params or {})
+    if model_type == "rf":
+        return RandomForestModel(n_jobs=n_jobs, **params)
+    rounds = params.pop("num_boost_round", 100)
+    if model_type == "xgb":
+        return XGBoostModel(params={"objective": "binary:logistic", "eval_metric": "error", "verbosity": 0, **params},
+                            num_boost_round=rounds, n_jobs=n_jobs, dataset_cache=dataset_cache)
+    if model_type == "lgb":
+        return LightGBMModel(params={"objective": "binary", "metric": "binary_error", "verbosity": -1, **params},
+                             num_boost_round=rounds, n_jobs=n_jobs, dataset_cache=dataset_cache)
+    raise ValueError(f"Unknown model type: {model_type} (choose from {MODEL_TYPES})")
+
+def load_model(model_path: str) -> BaseModel:
+    """
+    BaseModel.save로 저장한 pickle을 모델 객체로 복원. 모델 종류는 저장된 객체로 판별한다
+    (xgb.Booster → XGBoostModel, lgb.Booster → LightGBMModel, 그 외 → RandomForestModel).
+    predict 등은 학습 때와 같은 스케일의 입력을 받으므로 model.scaler.transform을 거쳐 넣는다.
+    """
+    model, scaler = BaseModel.load(model_path)
+    if isinstance(model, xgb.Booster):
+        loaded = XGBoostModel()
+    elif isinstance(model, lgb.Booster):
+        loaded = LightGBMModel()
+    else:
+        loaded = RandomForestModel()
+    loaded.model, loaded.scaler = model, scaler
+    return loaded
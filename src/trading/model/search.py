@@ -0,0 +1,220 @@
+# src/trading/model/search.py
+import itertools
+import json
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from src.trading.batch import limit_threads, plan_parallelism, run_batch
+from src.trading.feature_cache import code_version
+from src.trading.model import ml_models
+from src.trading.model.dataset_cache import data_hash, process_cache
+from src.trading.model.ml_models import build_model
+from src.trading.model.validation import build_fold_matrices
+from src.trading.response_cache import ResponseCache
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "search")
+RESOURCES = ("rows", "rounds")
+
+# 모델별 기본 탐색 공간: 파라미터 → 후보 값 목록
+SPACES = {
+    "rf": {"max_depth": [None, 4, 8, 16], "min_samples_leaf": [1, 5, 20, 50], "max_features": ["sqrt", 0.5, 1.0],
+           "max_samples": [None, 0.5]},
+    "xgb": {"max_depth": [3, 4, 6, 8], "eta": [0.03, 0.1, 0.3], "subsample": [0.6, 0.8, 1.0],
+            "colsample_bytree": [0.6, 0.8, 1.0], "min_child_weight": [1, 5, 20]},
+    "lgb": {"num_leaves": [7, 15, 31, 63], "learning_rate": [0.03, 0.1, 0.3], "feature_fraction": [0.6, 0.8, 1.0],
+            "bagging_fraction": [0.6, 0.8, 1.0], "bagging_freq": [1], "min_data_in_leaf": [5, 20, 50]},
+}
+# 모델별 기본 예산 단위: 트리 수(RF n_estimators, 부스팅 라운드). 행 수(rows)는 작은 예산에서도
+# 트리 하나의 고정 비용이 남아 RF에서는 덜 줄어든다 (benchmarks/bench_search.py)
+DEFAULT_RESOURCE = {"rf": "rounds", "xgb": "rounds", "lgb": "rounds"}
+MAX_ROUNDS = 300
+MIN_ROWS = 100
+
+
+def sample_candidates(space: dict, n: int, seed: int = 0) -> list:
+    """ 탐색 공간에서 후보 n개 추출 (전체 조합이 n개 이하면 전부, 아니면 중복 없이 무작위) """
+    names = sorted(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    if total <= n:
+        return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(total, size=n, replace=False)
+    return [{name: space[name][i] for name, i in zip(names, np.unravel_index(p, sizes))} for p in picks]
+
+
+def _run_trial(key: str, workdir: str, split: tuple, trials: dict, model_type: str, resource: str,
+               cache_dir: str = None, n_jobs=None, dataset_cache_dir: str = None) -> dict:
+    """ 후보 하나를 예산만큼 학습하고 검증 구간 정확도 계산 (run_batch 워커에서 실행) """
+    params, budget = trials[key]
+    _, train_end, valid_start, valid_end = split
+    X = np.load(os.path.join(workdir, "fold_0.npy"), mmap_mode="r")
+    y = np.load(os.path.join(workdir, "y.npy"), mmap_mode="r")
+    params = dict(params)
+    # rows: 학습 구간의 최근 budget행만 사용 / rounds: 트리(부스팅 라운드) 수를 budget으로
+    train_start = max(0, train_end - budget) if resource == "rows" else 0
+    if resource == "rounds":
+        params["n_estimators" if model_type == "rf" else "num_boost_round"] = budget
+
+    dataset_cache = process_cache(dataset_cache_dir) if dataset_cache_dir else None
+    model = build_model(model_type, n_jobs=n_jobs, params=params, dataset_cache=dataset_cache)
+    start = time.perf_counter()
+    # 예산이 라운드 수를 정하므로 조기 종료 없이 학습
+    model.fit(X[train_start:train_end], np.asarray(y[train_start:train_end]), valid_fraction=0)
+    train_seconds = time.perf_counter() - start
+    X_valid = X[valid_start:valid_end]
+    y_pred = model.predict(X_valid)
+    result = {"accuracy": accuracy_score(y[valid_start:valid_end], y_pred), "train_rows": train_end - train_start,
+              "train_seconds": train_seconds}
+    if cache_dir:
+        ResponseCache(root=cache_dir).put(key, result, meta={"model": model_type, "params": params, "budget": budget})
+    return result
+
+
+class TrialRunner:
+    """
+    후보 하이퍼파라미터들을 같은 데이터·예산으로 병렬 평가하는 실행기 (with 블록 안에서 사용).
+    데이터의 앞 (1 - valid_fraction)을 학습 구간, 나머지를 검증 구간으로 나누고, 스케일된 행렬을
+    한 번만 만들어 워커가 memmap으로 공유한다. 시험 결과는 (모델, 파라미터, 예산, 데이터 해시, 코드 버전)
+    키로 cache_dir에 저장돼, 중단된 탐색을 다시 실행하면 끝난 시험은 건너뛴다.
+    """
+    def __init__(self, X: np.ndarray, y: np.ndarray, model_type: str = "rf", resource: str = None,
+                 valid_fraction: float = 0.2, workers: int = None, threads: int = None,
+                 cache_dir: str = DEFAULT_CACHE_DIR, workdir: str = None, dataset_cache_dir: str = None):
+        self.resource = resource or DEFAULT_RESOURCE[model_type]
+        if self.resource not in RESOURCES:
+            raise ValueError(f"Unknown budget resource: {self.resource} (choose from {RESOURCES})")
+        self.X, self.y = np.asarray(X), np.asarray(y)
+        self.model_type = model_type
+        n_train = int(len(self.X) * (1 - valid_fraction))
+        self.split = (0, n_train, n_train, len(self.X))
+        self.max_budget = n_train if self.resource == "rows" else MAX_ROUNDS
+        self.workers, self.threads = workers, threads
+        self.cache_dir = cache_dir
+        self.cache = ResponseCache(root=cache_dir) if cache_dir else None
+        self.version = [data_hash(self.X, self.y), valid_fraction, code_version(ml_models, _run_trial)]
+        self.workdir = workdir
+        self.dataset_cache_dir = dataset_cache_dir
+        self._tmp = None
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="search_", dir=self.workdir)
+        build_fold_matrices(self.X, self.y, [self.split], self._tmp.name)
+        return self
+
+    def __exit__(self, *exc):
+        self._tmp.cleanup()
+
+    def key(self, params: dict, budget: int) -> str:
+        return ResponseCache.make_key("search", self.model_type, params={"params": params, "budget": budget,
+                                      "resource": self.resource, "data": self.version})
+
+    def run(self, candidates: list, budget: int) -> list:
+        """ 후보들을 budget으로 평가. 반환: 후보 순서대로 {accuracy, train_rows, train_seconds, cached 또는 error} """
+        keys = [self.key(params, budget) for params in candidates]
+        results = {}
+        if self.cache is not None:
+            for key in keys:
+                found, value = self.cache.get(key)
+                if found:
+                    results[key] = dict(value, cached=True)
+        todo = {key: (params, budget) for key, params in zip(keys, candidates) if key not in results}
+        if todo:
+            workers, threads = plan_parallelism(len(todo), self.workers, self.threads)
+            summary = run_batch(_run_trial, list(todo), workers=workers, chunksize=1, initializer=limit_threads,
+                                initargs=(threads,), workdir=self._tmp.name, split=self.split, trials=todo,
+                                model_type=self.model_type, resource=self.resource, cache_dir=self.cache_dir,
+                                n_jobs=threads, dataset_cache_dir=self.dataset_cache_dir)
+            results.update({key: dict(value, cached=False) for key, value in summary["success"].items()})
+            results.update({key: {"error": error, "cached": False} for key, error in summary["failed"].items()})
+        return [results[key] for key in keys]
+
+
+def successive_halving(runner: TrialRunner, candidates: list, min_budget: int, max_budget: int = None,
+                       eta: int = 3, bracket: int = 0) -> list:
+    """
+    successive halving: 모든 후보를 작은 예산으로 평가한 뒤 상위 1/eta만 남기고 예산을 eta배로 늘리기를
+    max_budget에 닿을 때까지 반복. 반환: 시험마다 한 행(dict)인 목록
+    """
+    max_budget = max_budget or runner.max_budget
+    n_rungs = max(1, int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9)) + 1)
+    survivors, rows = list(candidates), []
+    for rung in range(n_rungs):
+        budget = int(round(max_budget / eta ** (n_rungs - 1 - rung)))
+        results = runner.run(survivors, budget)
+        print(f"[INFO] bracket {bracket} rung {rung}: {len(survivors)} candidates x budget {budget} "
+              f"({sum(r['cached'] for r in results)} cached)")
+        for params, result in zip(survivors, results):
+            rows.append({"model": runner.model_type, "resource": runner.resource, "bracket": bracket, "rung": rung,
+                         "budget": budget, "params": json.dumps(params, sort_keys=True), **result})
+        if rung == n_rungs - 1:
+            break
+        scores = [result.get("accuracy", -1.0) for result in results]
+        order = sorted(range(len(survivors)), key=lambda i: -scores[i])
+        survivors = [survivors[i] for i in order[:max(1, len(survivors) // eta)]]
+    return rows
+
+
+def search(X: np.ndarray, y: np.ndarray, model_type: str = "rf", method: str = "halving", space: dict = None,
+           n_candidates: int = 27, eta: int = 3, resource: str = None, min_budget: int = None,
+           max_budget: int = None, valid_fraction: float = 0.2, workers: int = None, threads: int = None,
+           cache_dir: str = DEFAULT_CACHE_DIR, seed: int = 0, dataset_cache_dir: str = None) -> pd.DataFrame:
+    """
+    하이퍼파라미터 탐색. 데이터의 마지막 valid_fraction 구간 정확도로 후보를 비교한다.
+    X, y에는 학습 구간만 넘긴다 (dataset.training_window). 테스트·백테스트 구간까지 넘기면 그 구간으로
+    후보를 고르게 되어 이후 테스트 정확도와 백테스트 결과가 낙관적으로 나온다.
+    - method="halving":   n_candidates개를 successive halving 한 번으로 추림
+    - method="hyperband": 시작 예산이 다른 여러 successive halving 묶음(bracket)을 차례로 실행
+
+    Parameters:
+    - space:      {파라미터: 후보 값 목록} (기본: SPACES[model_type])
+    - resource:   예산 단위 "rows"(최근 학습 행 수) | "rounds"(부스팅 라운드·RF 트리 수)
+    - min_budget/max_budget: 예산 범위 (기본 max: rows면 학습 구간 전체, rounds면 MAX_ROUNDS)
+    - cache_dir:  시험 결과 메모 디렉터리 (None이면 저장하지 않음)
+    - dataset_cache_dir: xgb/lgb 학습 데이터셋 캐시 디렉터리 (같은 데이터·binning 설정의 시험끼리 공유)
+
+    반환: 시험마다 한 행 (model, resource, bracket, rung, budget, params(JSON), accuracy, train_rows,
+          train_seconds, cached, error)
+    """
+    space = space or SPACES[model_type]
+    rows = []
+    with TrialRunner(X, y, model_type, resource, valid_fraction, workers, threads, cache_dir,
+                     dataset_cache_dir=dataset_cache_dir) as runner:
+        max_budget = min(max_budget or runner.max_budget, runner.max_budget)
+        floor = MIN_ROWS if runner.resource == "rows" else 1
+        if method == "halving":
+            # 후보가 1개 남을 때까지 줄어드는 만큼 rung 수를 정함
+            n_rungs = int(math.floor(math.log(max(n_candidates, 1), eta) + 1e-9)) + 1
+            min_budget = min(max(min_budget or max_budget // eta ** (n_rungs - 1), floor), max_budget)
+            rows += successive_halving(runner, sample_candidates(space, n_candidates, seed), min_budget, max_budget, eta)
+        elif method == "hyperband":
+            min_budget = min(max(min_budget or floor, floor), max_budget)
+            s_max = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+            for s in range(s_max, -1, -1):
+                n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+                rows += successive_halving(runner, sample_candidates(space, n, seed + s), max_budget // eta ** s,
+                                           max_budget, eta, bracket=s_max - s)
+        else:
+            raise ValueError(f"Unknown search method: {method} (choose from halving, hyperband)")
+    return pd.DataFrame(rows)
+
+
+def best_params(results: pd.DataFrame) -> dict:
+    """
+    가장 큰 예산으로 평가된 시험 중 검증 정확도가 가장 높은 후보의 파라미터 (build_model의 params로 사용).
+    예산 단위가 rounds면 그 예산을 트리·라운드 수로 넣어 준다.
+    """
+    final = results[results["budget"] == results["budget"].max()].dropna(subset=["accuracy"])
+    if final.empty:
+        raise ValueError("No successful trial at the full budget")
+    best = final.loc[final["accuracy"].idxmax()]
+    params = json.loads(best["params"])
+    if best["resource"] == "rounds":
+        params["n_estimators" if best["model"] == "rf" else "num_boost_round"] = int(best["budget"])
+    return params
@@ -0,0 +1,315 @@
+# src/trading/model/tree_ensemble.py
+import ctypes
+import ctypes.util
+import json
+import os
+
+import numpy as np
+
+# 노드 배열 파일 (TreeEnsemble.save / load)
+ARRAYS = ("feature", "threshold", "children", "default_left", "value", "roots")
+# 이 깊이마다 리프에 도착한 (트리, 행) 쌍을 작업 목록에서 뺀다
+COMPACT_EVERY = 8
+# 배치 하나의 (트리, 행) 쌍 수. 작업 버퍼가 CPU 캐시에 머무는 크기 (클수록 배열 연산 호출 수는 줄지만 캐시를 벗어남)
+BATCH_PAIRS = 1 << 18
+OBJECTIVES = ("mean", "logistic")
+
+_SIGN = np.int64(np.iinfo(np.int64).min)
+_MAGNITUDE = np.int64(np.iinfo(np.int64).max)
+
+
+def _ordered(x: np.ndarray) -> np.ndarray:
+    """ float64 → 크기 순서를 보존하는 int64 (인접한 실수는 1 차이) """
+    bits = np.ascontiguousarray(x, dtype=np.float64).view(np.int64)
+    return np.where(bits < 0, ~(bits & _MAGNITUDE), bits)
+
+
+def _from_ordered(key: np.ndarray) -> np.ndarray:
+    return np.where(key < 0, ~key | _SIGN, key).view(np.float64)
+
+
+def _to_float32(z):
+    with np.errstate(over="ignore"):
+        return z.astype(np.float32)
+
+
+def _lgb_input(z):
+    # LightGBM은 |x| <= 1e-35 인 값을 0으로 읽는다 (밀집 행렬의 희소 행 변환)
+    return np.where(np.abs(z) <= 1e-35, 0.0, z)
+
+
+def _input_bounds(threshold, mean, scale, cast) -> np.ndarray:
+    """
+    노드마다 cast((x - mean) / scale) <= threshold 를 만족하는 가장 큰 float64 x.
+    변환이 단조 증가라 이 조건은 x <= 경계값과 정확히 같다 (반올림까지 포함, 실수 순서 위에서 이분 탐색).
+    """
+    def transformed(x):
+        with np.errstate(over="ignore", invalid="ignore"):
+            return cast((x - mean) / scale)
+    lowest, highest = _ordered(np.array(-np.inf)), _ordered(np.array(np.inf))
+    # threshold * scale + mean 근처(float32 반올림 폭보다 넓게)에서 시작하고, 벗어난 노드만 전체 범위에서 찾는다
+    with np.errstate(over="ignore"):
+        guess = _ordered(threshold * scale + mean)
+    lo = np.clip(guess - (1 << 32), lowest, highest)
+    hi = np.clip(guess + (1 << 32), lowest, highest)
+    miss = (transformed(_from_ordered(lo)) > threshold) | (transformed(_from_ordered(hi)) <= threshold)
+    lo[miss], hi[miss] = lowest, highest
+    for _ in range(64 if miss.any() else 33):
+        mid = (lo >> 1) + (hi >> 1) + (lo & hi & 1)
+        ok = transformed(_from_ordered(mid)) <= threshold
+        lo, hi = np.where(ok, mid, lo), np.where(ok, hi, mid)
+    return np.where(transformed(np.full(len(threshold), np.inf)) <= threshold, np.inf, _from_ordered(lo))
+
+
+def _logf(x) -> np.float32:
+    """ C 수학 라이브러리 logf (XGBoost ProbToMargin과 같은 반올림). 라이브러리를 찾지 못하면 NumPy float32 log """
+    try:
+        logf = ctypes.CDLL(ctypes.util.find_library("m") or "ucrtbase").logf
+    except (OSError, AttributeError):
+        return np.log(np.float32(x))
+    logf.restype, logf.argtypes = ctypes.c_float, [ctypes.c_float]
+    return np.float32(logf(float(x)))
+
+
+def _tree_depth(children: np.ndarray) -> int:
+    """ 자식 배열(리프는 -1)로 트리 깊이 계산 """
+    depth, frontier = 0, np.array([0])
+    while True:
+        frontier = frontier[children[frontier, 0] >= 0]
+        if not len(frontier):
+            return depth
+        frontier = children[frontier].ravel()
+        depth += 1
+
+
+class TreeEnsemble:
+    """
+    트리 앙상블을 평탄한 NumPy 노드 배열로 표현한 추론 엔진. 모든 트리의 노드를 한 배열에 이어 붙이고
+    자식 인덱스도 전체 배열 기준이다. 리프는 양쪽 자식이 자기 자신이라 최대 깊이만큼 반복하면
+    모든 행이 리프에 도착한다 (행마다 분기하지 않고 배열 연산으로 한꺼번에 내려감).
+
+    - feature/threshold: 분할 특징 번호와 기준값. float64 입력 x[feature] <= threshold 이면 왼쪽.
+                         라이브러리의 입력 변환(float32 변환, <와 <= 차이)과 스케일러는 컴파일할 때 기준값에 합쳐 둔다.
+    - children:          자식 노드 인덱스, shape (n_nodes, 2) = [왼쪽, 오른쪽]
+    - default_left:      입력이 NaN일 때 왼쪽으로 가는지
+    - value:             노드 값, shape (n_nodes, n_outputs)
+    - roots:             트리별 루트 노드 인덱스
+    - objective:         mean(RandomForest: 트리별 클래스 확률 평균) | logistic(부스팅: base_score + 합의 시그모이드)
+    배열은 np.load(mmap_mode="r")로 열 수 있어 여러 프로세스가 같은 파일 페이지를 공유한다.
+    """
+    def __init__(self, feature, threshold, children, default_left, value, roots, max_depth: int, classes=None,
+                 objective: str = "mean", base_score: float = 0.0, sigmoid: float = 1.0):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}, got {objective!r}")
+        self.feature, self.threshold, self.children = feature, threshold, children
+        self.default_left, self.value, self.roots = default_left, value, roots
+        self.max_depth = int(max_depth)
+        self.classes = np.asarray(classes) if classes is not None else None
+        self.objective, self.base_score, self.sigmoid = objective, base_score, sigmoid
+
+    @classmethod
+    def _build(cls, trees, cast, mean=None, scale=None, **kwargs) -> "TreeEnsemble":
+        """
+        트리별 (feature, threshold, children(리프 -1), default_left, value) 목록을 이어 붙이고,
+        라이브러리 비교 기준값(cast(z) <= threshold)을 float64 입력 기준으로 바꿔 스케일러를 합친다.
+        """
+        parts, offset, max_depth = [], 0, 0
+        for feature, threshold, children, default_left, value in trees:
+            n_nodes = len(feature)
+            is_leaf = children[:, 0] < 0
+            nodes = np.arange(n_nodes) + offset
+            children = np.where(is_leaf[:, None], nodes[:, None], children + offset)
+            parts.append((np.where(is_leaf, 0, feature), np.where(is_leaf, 0.0, threshold), children,
+                          default_left & ~is_leaf, value, is_leaf, offset))
+            max_depth = max(max_depth, _tree_depth(np.where(is_leaf[:, None], -1, children - offset)))
+            offset += n_nodes
+        feature, threshold, children, default_left, value, is_leaf, roots = zip(*parts)
+        # 노드 인덱스 배열은 np.take에 변환 없이 쓰도록 intp
+        feature, threshold, is_leaf = np.concatenate(feature).astype(np.intp), np.concatenate(threshold), np.concatenate(is_leaf)
+        n_features = int(feature.max()) + 1
+        mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+        internal = ~is_leaf
+        threshold = np.where(is_leaf, 0.0, threshold)
+        threshold[internal] = _input_bounds(threshold[internal], mean[feature[internal]], scale[feature[internal]], cast)
+        return cls(feature, threshold, np.concatenate(children).astype(np.intp),
+                   np.concatenate(default_left).astype(bool), np.concatenate(value),
+                   np.asarray(roots, dtype=np.intp), max_depth, **kwargs)
+
+    @classmethod
+    def from_sklearn(cls, forest, mean=None, scale=None) -> "TreeEnsemble":
+        """
+        학습된 sklearn RandomForestClassifier 변환 (sklearn predict_proba와 같은 값).
+        mean/scale: StandardScaler의 mean_/scale_ (주면 스케일하지 않은 원래 특징 값을 입력받음)
+        """
+        trees = []
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            # sklearn DecisionTreeClassifier.predict_proba와 같은 정규화
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            missing_left = getattr(tree, "missing_go_to_left", None)
+            default_left = np.zeros(tree.node_count, dtype=bool) if missing_left is None else missing_left.astype(bool)
+            trees.append((tree.feature, tree.threshold, np.stack([tree.children_left, tree.children_right], axis=1),
+                          default_left, value / normalizer))
+        # sklearn은 입력을 float32로 바꿔 float64 기준값과 비교한다
+        return cls._build(trees, _to_float32, mean, scale, classes=forest.classes_)
+
+    @classmethod
+    def from_xgboost(cls, booster, mean=None, scale=None, n_trees: int = None) -> "TreeEnsemble":
+        """
+        학습된 XGBoost Booster(binary:logistic, gbtree) 변환. n_trees: 앞에서부터 쓸 트리 수 (조기 종료 시 best_iteration + 1)
+        """
+        learner = json.loads(booster.save_raw("json"))["learner"]
+        if learner["objective"]["name"] != "binary:logistic" or learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError(f"Only binary:logistic gbtree boosters can be compiled, got "
+                             f"{learner['objective']['name']} / {learner['gradient_booster']['name']}")
+        trees = []
+        for tree in learner["gradient_booster"]["model"]["trees"][:n_trees]:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported")
+            children = np.stack([tree["left_children"], tree["right_children"]], axis=1)
+            condition = np.asarray(tree["split_conditions"], dtype=np.float32)
+            # XGBoost는 float32 입력 x < condition 이면 왼쪽 → x <= (condition 바로 아래 float32)
+            threshold = np.nextafter(condition, np.float32(-np.inf)).astype(np.float64)
+            # 리프의 값은 split_conditions에 들어 있다
+            value = np.where(children[:, 0] < 0, condition, np.float32(0))[:, None]
+            trees.append((np.asarray(tree["split_indices"]), threshold, children,
+                          np.asarray(tree["default_left"], dtype=bool), value))
+        # XGBoost ProbToMargin: base_score(확률)를 float32 로짓으로
+        base = np.float32(str(learner["learner_model_param"]["base_score"]).strip("[]").split(",")[0])
+        margin = -_logf(np.float32(1) / base - np.float32(1))
+        return cls._build(trees, _to_float32, mean, scale, classes=[0, 1], objective="logistic",
+                          base_score=float(margin))
+
+    @classmethod
+    def from_lightgbm(cls, booster, mean=None, scale=None) -> "TreeEnsemble":
+        """ 학습된 LightGBM Booster(binary) 변환. 조기 종료했으면 best_iteration까지 (Booster.predict 기본과 같음) """
+        dump = booster.dump_model()
+        if not dump["objective"].startswith("binary"):
+            raise ValueError(f"Only binary LightGBM boosters can be compiled, got {dump['objective']}")
+        sigmoid = float(dump["objective"].split("sigmoid:")[1].split()[0]) if "sigmoid:" in dump["objective"] else 1.0
+        trees = []
+        for info in dump["tree_info"]:
+            nodes, stack = [], [info["tree_structure"]]
+            # 전위 순회로 노드 번호를 매기고 자식 번호는 나중에 채운다
+            index = {}
+            while stack:
+                node = stack.pop()
+                index[id(node)] = len(nodes)
+                nodes.append(node)
+                if "leaf_value" not in node:
+                    stack += [node["right_child"], node["left_child"]]
+            feature, threshold, children, default_left, value = [], [], [], [], []
+            for node in nodes:
+                if "leaf_value" in node:
+                    feature.append(0), threshold.append(0.0), children.append((-1, -1))
+                    default_left.append(False), value.append(node["leaf_value"])
+                    continue
+                if node["decision_type"] != "<=":
+                    raise ValueError("Categorical splits are not supported")
+                if node["missing_type"] == "Zero":
+                    raise ValueError("zero_as_missing splits are not supported")
+                feature.append(node["split_feature"]), threshold.append(node["threshold"])
+                children.append((index[id(node["left_child"])], index[id(node["right_child"])]))
+                # missing_type None이면 NaN을 0으로 읽어 비교
+                default_left.append(node["default_left"] if node["missing_type"] == "NaN" else 0.0 <= node["threshold"])
+                value.append(0.0)
+            trees.append((np.asarray(feature), np.asarray(threshold, dtype=np.float64), np.asarray(children),
+                          np.asarray(default_left, dtype=bool), np.asarray(value, dtype=np.float64)[:, None]))
+        return cls._build(trees, _lgb_input, mean, scale, classes=[0, 1], objective="logistic", sigmoid=sigmoid)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        행마다 트리별 도착 리프 인덱스, shape (n_trees, n_rows).
+        (트리, 행) 쌍 전체를 한 배열로 깊이마다 한 단계씩 내리고, COMPACT_EVERY 깊이마다 리프에 도착한 쌍을 뺀다.
+        단계마다 새 배열을 만들지 않도록 np.take(out=)로 작업 버퍼에 모은다.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        n_rows, n_features = X.shape
+        flat, children = X.ravel(), self.children.reshape(-1)
+        has_nan = bool(np.isnan(flat).any())
+        node = np.repeat(np.asarray(self.roots, dtype=np.intp), n_rows)
+        offset = np.tile(np.arange(n_rows, dtype=np.intp) * n_features, self.n_trees)
+        position = np.arange(len(node))
+        out = np.empty(len(node), dtype=np.intp)
+        index, x, bound, go_right = np.empty_like(node), np.empty(len(node)), np.empty(len(node)), np.empty(len(node), dtype=bool)
+        for depth in range(1, self.max_depth + 1):
+            np.take(self.feature, node, out=index, mode="clip")
+            index += offset
+            np.take(flat, index, out=x, mode="clip")
+            np.take(self.threshold, node, out=bound, mode="clip")
+            np.greater(x, bound, out=go_right)
+            if has_nan:
+                go_right |= np.isnan(x) & ~self.default_left[node]
+            node <<= 1
+            node += go_right
+            np.take(children, node, out=index, mode="clip")
+            node, index = index, node
+            if depth % COMPACT_EVERY == 0 and depth < self.max_depth:
+                done = children[2 * node] == node
+                out[position[done]] = node[done]
+                active = ~done
+                node, offset, position = node[active], offset[active], position[active]
+                index, x, bound, go_right = index[:len(node)], x[:len(node)], bound[:len(node)], go_right[:len(node)]
+        out[position] = node
+        return out.reshape(self.n_trees, n_rows)
+
+    def _batches(self, X: np.ndarray, batch_rows: int = None):
+        """ (시작 행, 트리 순서대로 더한 리프 값) 배치 단위로 """
+        X = np.asarray(X, dtype=np.float64)
+        batch_rows = batch_rows or max(1, BATCH_PAIRS // self.n_trees)
+        for start in range(0, len(X), batch_rows):
+            values = np.take(self.value, self.leaves(X[start:start + batch_rows]), axis=0)
+            values[0] += self.base_score
+            # accumulate는 트리 순서대로 하나씩 더한다 (sum의 pairwise 합산과 달리 라이브러리와 같은 순서)
+            yield start, np.add.accumulate(values, axis=0, out=values)[-1]
+
+    def predict_proba(self, X: np.ndarray, batch_rows: int = None) -> np.ndarray:
+        """
+        클래스 확률, shape (n_rows, n_classes). 입력은 float64로 읽는다.
+        원래 라이브러리와 같은 순서·정밀도로 트리 값을 더하므로 RandomForest 확률과 부스팅 마진은 비트 단위로 같다.
+        부스팅 확률은 NumPy exp와 C 수학 라이브러리 exp의 반올림 차이로 마지막 자리(1ulp)가 다를 수 있다.
+        batch_rows: 한 번에 처리할 행 수 (기본: 트리 수 × 행 수가 BATCH_PAIRS가 되도록)
+        """
+        out = np.empty((len(X), len(self.classes)), dtype=self.value.dtype)
+        for start, total in self._batches(X, batch_rows):
+            if self.objective == "mean":
+                out[start:start + len(total)] = total / self.n_trees
+                continue
+            z = -self.value.dtype.type(self.sigmoid) * total[:, 0]
+            if self.value.dtype == np.float32:
+                # XGBoost Sigmoid(float32, 지수 상한 88.7). expf에 가깝게 float64로 계산해 반올림
+                exp = np.exp(np.minimum(z, np.float32(88.7)).astype(np.float64)).astype(np.float32)
+            else:
+                exp = np.exp(z)
+            proba = 1 / (exp + 1)
+            out[start:start + len(total), 0], out[start:start + len(total), 1] = 1 - proba, proba
+        return out
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        proba = self.predict_proba(X)
+        if self.objective == "logistic":
+            return self.classes[(proba[:, 1] > 0.5).astype(int)]
+        return self.classes[np.argmax(proba, axis=1)]
+
+    def save(self, directory: str) -> dict:
+        """ 노드 배열을 directory/{이름}.npy로 저장. 반환: 불러올 때 필요한 메타 정보 """
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        return {"n_trees": self.n_trees, "n_nodes": len(self.feature), "max_depth": self.max_depth,
+                "classes": self.classes.tolist() if self.classes is not None else None,
+                "objective": self.objective, "base_score": float(self.base_score), "sigmoid": float(self.sigmoid)}
+
+    @classmethod
+    def load(cls, directory: str, meta: dict, mmap_mode: str = "r") -> "TreeEnsemble":
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in ARRAYS}
+        return cls(max_depth=meta["max_depth"], classes=meta.get("classes"), objective=meta.get("objective", "mean"),
+                   base_score=arrays["value"].dtype.type(meta.get("base_score", 0.0)),
+                   sigmoid=meta.get("sigmoid", 1.0), **arrays)
@@ -0,0 +1,135 @@
+# src/trading/model/validation.py
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import StandardScaler
+
+from src.trading.batch import limit_threads, plan_parallelism, run_batch
+from src.trading.model.dataset_cache import process_cache
+from src.trading.model.ml_models import build_model
+
+MODES = ("expanding", "sliding")
+
+
+def walk_forward_splits(n_rows: int, n_folds: int = 5, mode: str = "expanding", train_size: int = None,
+                        test_size: int = None, gap: int = 0) -> list:
+    """
+    시간 순서를 지키는 walk-forward 분할. 테스트 구간은 데이터 끝에서부터 n_folds개가 겹치지 않게 이어진다.
+    - expanding: 학습 구간 시작이 처음 행에 고정되고 폴드마다 끝만 늘어남
+    - sliding:   학습 구간 길이(train_size)를 유지한 채 테스트 구간과 함께 밀려감
+
+    Parameters:
+    - train_size: 첫 폴드(sliding은 모든 폴드)의 학습 행 수 (기본: 테스트 구간을 뺀 앞부분 전체)
+    - test_size:  폴드당 테스트 행 수 (기본: train_size를 주면 나머지를 n_folds 등분, 아니면 전체를 n_folds+1 등분)
+    - gap:        학습 끝과 테스트 시작 사이에 버리는 행 수 (다음 날 값을 보는 타깃의 누수 방지)
+
+    반환: [(train_start, train_end, test_start, test_end), ...] (끝 인덱스는 포함하지 않음)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown walk-forward mode: {mode} (choose from {MODES})")
+    if test_size is None:
+        test_size = (n_rows - train_size - gap) // n_folds if train_size else n_rows // (n_folds + 1)
+    if train_size is None:
+        train_size = n_rows - gap - n_folds * test_size
+    if n_folds < 1 or test_size < 1 or train_size < 1 or train_size + gap + n_folds * test_size > n_rows:
+        raise ValueError(f"Cannot make {n_folds} folds (train {train_size}, test {test_size}, gap {gap}) from {n_rows} rows")
+
+    splits = []
+    for k in range(n_folds):
+        test_start = n_rows - (n_folds - k) * test_size
+        train_end = test_start - gap
+        train_start = 0 if mode == "expanding" else train_end - train_size
+        splits.append((train_start, train_end, test_start, test_start + test_size))
+    return splits
+
+
+def build_fold_matrices(X: np.ndarray, y: np.ndarray, splits: list, workdir: str):
+    """
+    폴드마다 학습 구간으로 fit한 scaler로 [train_start, test_end) 행을 변환해 workdir/fold_{k}.npy에 저장.
+    워커는 이 파일을 읽기 전용 memmap으로 열기 때문에 같은 페이지를 공유하고 행렬을 다시 복사하지 않는다.
+    """
+    np.save(os.path.join(workdir, "y.npy"), np.asarray(y))
+    for k, (train_start, train_end, _, test_end) in enumerate(splits):
+        scaler = StandardScaler().fit(X[train_start:train_end])
+        out = np.lib.format.open_memmap(os.path.join(workdir, f"fold_{k}.npy"), mode="w+",
+                                        dtype=np.float64, shape=(test_end - train_start, X.shape[1]))
+        out[:] = scaler.transform(X[train_start:test_end])
+        out.flush()
+        del out
+
+
+def _run_fold(k: int, workdir: str, splits: list, model_type: str, n_jobs=None, valid_fraction: float = 0.2,
+              params: dict = None, dataset_cache_dir: str = None) -> dict:
+    """ 폴드 하나 학습·평가 (run_batch 워커에서 실행) """
+    train_start, train_end, test_start, test_end = splits[k]
+    X = np.load(os.path.join(workdir, f"fold_{k}.npy"), mmap_mode="r")
+    y = np.load(os.path.join(workdir, "y.npy"), mmap_mode="r")
+    X_train, X_test = X[:train_end - train_start], X[test_start - train_start:]
+    y_train, y_test = np.asarray(y[train_start:train_end]), np.asarray(y[test_start:test_end])
+
+    dataset_cache = process_cache(dataset_cache_dir) if dataset_cache_dir else None
+    model = build_model(model_type, n_jobs=n_jobs, params=params, dataset_cache=dataset_cache)
+    start = time.perf_counter()
+    model.fit(X_train, y_train, valid_fraction=valid_fraction)
+    train_seconds = time.perf_counter() - start
+    y_pred = model.predict(X_test)
+    return {"train_rows": len(y_train), "test_rows": len(y_test), "accuracy": accuracy_score(y_test, y_pred),
+            "up_ratio": float(y_test.mean()), "best_iteration": getattr(model.model, "best_iteration", None),
+            "train_seconds": train_seconds}
+
+
+def walk_forward(X: np.ndarray, y: np.ndarray, model_type: str = "rf", n_folds: int = 5, mode: str = "expanding",
+                 train_size: int = None, test_size: int = None, gap: int = 0, valid_fraction: float = 0.2,
+                 workers: int = None, threads: int = None, workdir: str = None, params: dict = None,
+                 dataset_cache_dir: str = None) -> pd.DataFrame:
+    """
+    walk-forward 교차 검증. 폴드들을 프로세스 풀에서 병렬로 학습하고 폴드별 결과 표를 반환한다.
+    폴드별 스케일된 특징 행렬은 한 번만 만들어 임시 폴더(workdir 아래)의 .npy로 두고 워커가 memmap으로 공유한다.
+    조기 종료 모델(XGBoost, LightGBM)은 테스트 구간이 아니라 학습 구간의 마지막 valid_fraction 비율로 검증한다.
+
+    Parameters:
+    - n_folds, mode, train_size, test_size, gap: walk_forward_splits 참고
+    - workers/threads: 프로세스 수와 모델 내부 스레드 수 (생략하면 코어 수에 맞춰 나눔)
+    - params: 기본 설정을 덮어쓸 하이퍼파라미터 (build_model 참고)
+    - dataset_cache_dir: xgb/lgb 학습 데이터셋 캐시 디렉터리 (DatasetCache, None이면 사용 안 함)
+
+    반환 컬럼: fold, train_start, train_end, test_start, test_end, train_rows, test_rows, accuracy,
+              up_ratio(테스트 구간 상승 비율), best_iteration, train_seconds, error
+    """
+    X = np.asarray(X)
+    splits = walk_forward_splits(len(X), n_folds, mode, train_size, test_size, gap)
+    workers, threads = plan_parallelism(len(splits), workers, threads)
+    print(f"[INFO] Walk-forward ({mode}) {len(splits)} folds: {workers} processes x {threads} threads")
+
+    with tempfile.TemporaryDirectory(prefix="walk_forward_", dir=workdir) as tmp:
+        build_fold_matrices(X, y, splits, tmp)
+        summary = run_batch(_run_fold, range(len(splits)), workers=workers, chunksize=1,
+                            initializer=limit_threads, initargs=(threads,), workdir=tmp, splits=splits,
+                            model_type=model_type, n_jobs=threads, valid_fraction=valid_fraction, params=params,
+                            dataset_cache_dir=dataset_cache_dir)
+
+    rows = []
+    for k, (train_start, train_end, test_start, test_end) in enumerate(splits):
+        row = {"fold": k, "train_start": train_start, "train_end": train_end, "test_start": test_start, "test_end": test_end}
+        if k in summary["success"]:
+            row.update(summary["success"][k])
+        else:
+            row["error"] = summary["failed"][k]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def summarize_folds(folds: pd.DataFrame) -> dict:
+    """ 폴드별 결과 집계: 정확도 평균·표준편차·최소·최대, 테스트 행 가중 정확도, 학습 시간 합계 """
+    ok = folds.dropna(subset=["accuracy"]) if "accuracy" in folds else folds.iloc[:0]
+    if ok.empty:
+        return {"folds": 0, "failed": len(folds)}
+    return {"folds": len(ok), "failed": len(folds) - len(ok),
+            "accuracy_mean": ok["accuracy"].mean(), "accuracy_std": ok["accuracy"].std(ddof=0),
+            "accuracy_min": ok["accuracy"].min(), "accuracy_max": ok["accuracy"].max(),
+            "accuracy_weighted": np.average(ok["accuracy"], weights=ok["test_rows"]),
+            "train_seconds": ok["train_seconds"].sum()}
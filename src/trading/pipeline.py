@@ -0,0 +1,177 @@
+# src/trading/pipeline.py
+import json
+import os
+import queue
+import sys
+import threading
+
+from src.trading.utils import TokenBucket, call_with_retry
+
+_STOP = object()
+
+
+class Checkpoint:
+    """
+    진행 상황을 로컬 JSON 파일에 기록해, 중단된 실행을 이어서 할 수 있게 하는 체크포인트.
+    - signature: 실행 조건(모드, 기간 등). 파일의 signature가 다르면 기존 기록을 무시한다.
+    - stage(key):  DB에 썼지만 아직 커밋되지 않은 키로 표시
+    - discard(key): stage를 취소 (커밋 전에 쓰기가 실패한 키)
+    - commit():    stage된 키를 완료 처리하고 파일에 저장 (DB 커밋 직후 호출)
+    """
+    def __init__(self, path: str, signature: dict):
+        self.path = path
+        self.signature = signature
+        self.completed = set()
+        self._staged = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("signature") == signature:
+                self.completed = set(saved.get("completed", []))
+            else:
+                print(f"[WARN] 체크포인트 {path}의 실행 조건이 달라 무시합니다.")
+
+    def is_done(self, key) -> bool:
+        return key in self.completed
+
+    def stage(self, key):
+        with self._lock:
+            self._staged.add(key)
+
+    def discard(self, key):
+        with self._lock:
+            self._staged.discard(key)
+
+    def commit(self):
+        with self._lock:
+            if not self._staged:
+                return
+            self.completed |= self._staged
+            self._staged = set()
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": self.signature, "completed": sorted(self.completed)}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """ 모든 키가 성공적으로 끝났을 때 체크포인트 파일 삭제 """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def run_pipeline(keys, fetch, convert, write, workers=4, rate=5.0, retries=3,
+                 queue_size=8, on_done=None, on_failed=None, write_retries=None):
+    """
+    fetch → convert → write 3단계 스트리밍 파이프라인.
+    단계 사이는 크기가 제한된 큐(queue_size)로 연결되어, 뒤 단계가 밀리면 앞 단계가 대기한다
+    (backpressure). 따라서 키 개수나 조회 기간과 무관하게 메모리 사용량이 일정하다.
+
+    Parameters:
+    - keys:    처리할 키(티커 또는 날짜) 목록
+    - fetch:   key → 원본 데이터 (네트워크 호출, workers개 스레드에서 동시 실행, rate로 호출 제한)
+    - convert: (key, 원본) → 레코드 리스트 (단일 스레드)
+    - write:   (key, 레코드 리스트) → DB 기록 (단일 스레드)
+               예외에 keys 속성이 있으면(db.BulkLoadError) 그 키들도 함께 실패로 집계한다
+               (버퍼에 모아 쓰는 write가 앞서 성공으로 집계한 키의 레코드까지 버린 경우)
+    - on_done: 키 하나의 write가 끝나면 호출 (체크포인트 stage 등)
+    - on_failed: 키가 실패로 집계될 때 호출 (체크포인트 stage 취소 등)
+    - write_retries: write 재시도 횟수 (기본 retries, 스스로 재시도하는 write는 0)
+
+    반환: {"success": {key: 건수}, "empty": [key], "failed": {key: 오류 메시지}}
+    """
+    limiter = TokenBucket(rate)
+    key_q = queue.Queue()
+    for key in keys:
+        key_q.put(key)
+    fetch_q = queue.Queue(maxsize=queue_size)
+    write_q = queue.Queue(maxsize=queue_size)
+
+    summary = {"success": {}, "empty": [], "failed": {}}
+    lock = threading.Lock()
+    total = len(keys)
+    progress = [0]
+    write_retries = retries if write_retries is None else write_retries
+
+    def report(key, count=None, error=None):
+        with lock:
+            if key in summary["success"]:
+                # 성공으로 집계했던 키의 레코드가 커밋 전에 버려짐
+                del summary["success"][key]
+            else:
+                progress[0] += 1
+            if error is not None:
+                summary["failed"][key] = str(error)
+                print(f"[ERROR] {key} 처리 중 오류: {error}", file=sys.stderr)
+                if on_failed is not None:
+                    on_failed(key)
+            elif count:
+                summary["success"][key] = count
+                print(f"[INFO] ({progress[0]}/{total}) {key} → {count}건 삽입/업데이트 완료.")
+            else:
+                summary["empty"].append(key)
+                print(f"[INFO] ({progress[0]}/{total}) {key} → 데이터 없음, 건너뜀.")
+
+    def fetch_limited(key):
+        limiter.acquire()
+        return fetch(key)
+
+    def fetch_worker():
+        while True:
+            try:
+                key = key_q.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                raw = call_with_retry(fetch_limited, (key,), retries=retries, label=key)
+            except Exception as e:
+                report(key, error=e)
+                continue
+            fetch_q.put((key, raw))
+
+    def convert_worker():
+        while True:
+            item = fetch_q.get()
+            if item is _STOP:
+                write_q.put(_STOP)
+                return
+            key, raw = item
+            try:
+                records = convert(key, raw)
+            except Exception as e:
+                report(key, error=e)
+                continue
+            write_q.put((key, records))
+
+    def write_worker():
+        while True:
+            item = write_q.get()
+            if item is _STOP:
+                return
+            key, records = item
+            try:
+                if records:
+                    call_with_retry(write, (key, records), retries=write_retries, label=f"{key} write")
+                if on_done is not None:
+                    on_done(key)
+            except Exception as e:
+                for failed in dict.fromkeys([key, *getattr(e, "keys", ())]):
+                    report(failed, error=e)
+                continue
+            report(key, count=len(records))
+
+    fetchers = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(max(1, workers))]
+    converter = threading.Thread(target=convert_worker, daemon=True)
+    writer = threading.Thread(target=write_worker, daemon=True)
+    for t in fetchers + [converter, writer]:
+        t.start()
+    for t in fetchers:
+        t.join()
+    fetch_q.put(_STOP)
+    converter.join()
+    writer.join()
+    return summary
@@ -0,0 +1,256 @@
+# src/trading/price_cube.py
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.trading.db import copy_query_chunks, pooled_connection
+
+DEFAULT_CUBE_DIR = os.path.join("data", "cube")
+FIELDS = ["open_price", "high_price", "low_price", "close_price", "adj_close", "volume"]
+
+_TICKERS = "tickers.npy"
+_DATES = "dates.npy"
+_META = "meta.json"
+
+
+class PriceCube:
+    """
+    krx_daily_price를 (티커 × 영업일 × 필드) float32 배열로 펼친 memory-mapped 큐브.
+
+    디렉터리 구성:
+    - values_{capacity}.f32: (n_tickers, capacity, n_fields) float32 원시 배열. 날짜 축은 capacity만큼
+                   미리 잡아 두어 새 영업일 추가 시 파일을 다시 쓰지 않는다. 값이 없으면 NaN
+    - tickers.npy: 티커 코드 배열 (큐브 0번 축 순서)
+    - dates.npy:   영업일 배열 datetime64[D] (큐브 1번 축 순서, 길이 n_dates)
+    - meta.json:   fields, n_tickers, n_dates, capacity, values_file
+    배열 파일을 먼저 쓰고 meta.json을 마지막에 교체하므로, 갱신 중에 연 독자도
+    meta에 적힌 개수만큼의 일관된 앞부분만 본다.
+
+    읽기 전용(mode="r")으로 열면 여러 프로세스가 페이지 캐시를 통해 복사 없이 공유한다.
+    한 티커의 전체 기간은 연속 구간, 한 날짜의 전 종목은 고정 간격 슬라이스로 읽힌다.
+    주의: 거래량도 float32로 저장되므로 약 1,600만 주 이상에서는 하위 자릿수가 반올림된다.
+    """
+    def __init__(self, path: str, values: np.ndarray, tickers: np.ndarray, dates: np.ndarray, fields: list):
+        self.path = path
+        self.values = values
+        self.tickers = tickers
+        self.dates = dates
+        self.fields = list(fields)
+        self._ticker_pos = {t: i for i, t in enumerate(tickers.tolist())}
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_CUBE_DIR, mode: str = "r") -> "PriceCube":
+        """ 큐브 열기. mode="r"은 읽기 전용 공유 매핑, "r+"는 제자리 수정용 """
+        with open(os.path.join(path, _META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        n_tickers, n_dates = meta["n_tickers"], meta["n_dates"]
+        tickers = np.load(os.path.join(path, _TICKERS))[:n_tickers]
+        dates = np.load(os.path.join(path, _DATES))[:n_dates]
+        shape = (n_tickers, meta["capacity"], len(meta["fields"]))
+        if n_tickers == 0:
+            full = np.empty(shape, dtype=np.float32)
+        else:
+            full = np.memmap(os.path.join(path, meta["values_file"]), dtype=np.float32, mode=mode, shape=shape)
+        return cls(path, full[:, :n_dates, :], tickers, dates, meta["fields"])
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def ticker_index(self, ticker: str) -> int:
+        return self._ticker_pos[ticker]
+
+    def date_index(self, date) -> int:
+        d = np.datetime64(pd.Timestamp(date).date(), "D")
+        i = int(np.searchsorted(self.dates, d))
+        if i >= len(self.dates) or self.dates[i] != d:
+            raise KeyError(f"{date} not in cube")
+        return i
+
+    def field(self, name: str) -> np.ndarray:
+        """ 필드 하나의 (티커 × 날짜) 뷰 (복사 없음) """
+        return self.values[:, :, self.fields.index(name)]
+
+    def ticker_frame(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        """ 한 티커의 기간 데이터를 Date 인덱스 DataFrame으로 """
+        lo, hi = self._date_bounds(start, end)
+        block = self.values[self.ticker_index(ticker), lo:hi, :]
+        return pd.DataFrame(block, index=pd.DatetimeIndex(self.dates[lo:hi], name="Date"), columns=self.fields)
+
+    def date_frame(self, date) -> pd.DataFrame:
+        """ 한 영업일의 전 종목 단면을 ticker 인덱스 DataFrame으로 """
+        block = self.values[:, self.date_index(date), :]
+        return pd.DataFrame(block, index=pd.Index(self.tickers, name="ticker"), columns=self.fields)
+
+    def _date_bounds(self, start, end):
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date(), "D")))
+        hi = len(self.dates) if end is None else int(
+            np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date(), "D"), side="right"))
+        return lo, hi
+
+
+def _values_file(capacity):
+    return f"values_{capacity}.f32"
+
+
+def _write_meta(path, fields, n_tickers, n_dates, capacity):
+    tmp_path = os.path.join(path, _META + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"fields": fields, "n_tickers": n_tickers, "n_dates": n_dates, "capacity": capacity,
+                   "values_file": _values_file(capacity)}, f)
+    os.replace(tmp_path, os.path.join(path, _META))
+
+
+def _read_meta(path):
+    meta_path = os.path.join(path, _META)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _remove_stale(path, old_meta, capacity):
+    """ capacity가 바뀌어 더 이상 meta가 가리키지 않는 이전 값 파일 삭제 """
+    if old_meta is not None and old_meta["values_file"] != _values_file(capacity):
+        try:
+            os.remove(os.path.join(path, old_meta["values_file"]))
+        except FileNotFoundError:
+            pass
+
+
+def _save_array(path, name, arr):
+    tmp_path = os.path.join(path, name + ".tmp.npy")
+    np.save(tmp_path, arr)
+    os.replace(tmp_path, os.path.join(path, name))
+
+
+def _fill(values, tickers, dates, conn_params, start=None, end=None, chunksize=1_000_000):
+    """ COPY TO 결과를 chunk 단위로 읽어 큐브 좌표에 흩어 쓴다 """
+    where, params = [], []
+    if start is not None:
+        where.append("price_date >= %s")
+        params.append(start)
+    if end is not None:
+        where.append("price_date <= %s")
+        params.append(end)
+    sql = f"SELECT ticker, price_date, {', '.join(FIELDS)} FROM krx_daily_price"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    ticker_index = pd.Index(tickers)
+    rows = 0
+    for chunk in copy_query_chunks(conn_params, sql, params or None, chunksize=chunksize,
+                                   dtype={"ticker": str}):
+        ti = ticker_index.get_indexer(chunk["ticker"])
+        chunk_dates = chunk["price_date"].to_numpy(dtype="datetime64[D]")
+        di = np.searchsorted(dates, chunk_dates)
+        # 날짜 목록을 읽은 뒤 들어온 행(큐브에 없는 날짜)은 다른 날짜 칸에 쓰지 않고 건너뜀
+        ok = (ti >= 0) & (di < len(dates))
+        if len(dates):
+            ok &= dates[np.minimum(di, len(dates) - 1)] == chunk_dates
+        values[ti[ok], di[ok], :] = chunk[FIELDS].to_numpy(dtype=np.float32)[ok]
+        rows += int(ok.sum())
+    return rows
+
+
+def _distinct(conn_params, column, start=None):
+    sql = f"SELECT DISTINCT {column} FROM krx_daily_price"
+    params = None
+    if start is not None:
+        sql += " WHERE price_date > %s"
+        params = (start,)
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql + f" ORDER BY {column};", params)
+            rows = [r[0] for r in cur.fetchall()]
+        conn.commit()
+    return rows
+
+
+def build_cube(conn_params: dict, path: str = DEFAULT_CUBE_DIR, headroom: int = 260) -> PriceCube:
+    """
+    krx_daily_price 전체를 큐브로 새로 만든다.
+    headroom: 이후 append_days로 추가할 영업일 수만큼 날짜 축을 미리 확보 (기본 약 1년)
+    """
+    os.makedirs(path, exist_ok=True)
+    tickers = np.array(_distinct(conn_params, "ticker"), dtype="U12")
+    dates = np.array(_distinct(conn_params, "price_date"), dtype="datetime64[D]")
+    capacity = len(dates) + headroom
+
+    old_meta = _read_meta(path)
+    values_path = os.path.join(path, _values_file(capacity))
+    tmp_path = values_path + ".tmp"
+    values = np.memmap(tmp_path, dtype=np.float32, mode="w+",
+                       shape=(max(len(tickers), 1), capacity, len(FIELDS)))
+    values[:] = np.nan
+    rows = _fill(values, tickers, dates, conn_params)
+    values.flush()
+    del values
+    os.replace(tmp_path, values_path)
+
+    _save_array(path, _TICKERS, tickers)
+    _save_array(path, _DATES, dates)
+    _write_meta(path, FIELDS, len(tickers), len(dates), capacity)
+    _remove_stale(path, old_meta, capacity)
+    print(f"[INFO] 큐브 생성: {len(tickers)}개 티커 × {len(dates)}개 영업일 × {len(FIELDS)}개 필드, "
+          f"{rows:,}행 ({path})")
+    return PriceCube.open(path)
+
+
+def append_days(conn_params: dict, path: str = DEFAULT_CUBE_DIR, headroom: int = 260) -> PriceCube:
+    """
+    큐브의 마지막 영업일 이후 데이터만 추가한다.
+    - 날짜 축에 여유(capacity)가 있으면 기존 파일에 제자리 기록
+    - 여유가 모자라면 capacity를 늘린 새 파일로 한 번 다시 쓴다
+    - 새로 상장된 티커는 티커 축 끝에 붙인다 (티커 우선 배치라 파일 끝에 추가됨)
+    """
+    cube = PriceCube.open(path)
+    last = pd.Timestamp(cube.dates[-1]).date() if len(cube.dates) else None
+    new_dates = np.array(_distinct(conn_params, "price_date", start=last), dtype="datetime64[D]")
+    if len(new_dates) == 0:
+        print("[INFO] 추가할 영업일이 없습니다.")
+        return cube
+
+    meta = _read_meta(path)
+    n_tickers, n_dates, capacity = meta["n_tickers"], meta["n_dates"], meta["capacity"]
+    known = set(cube.tickers.tolist())
+    new_tickers = [t for t in _distinct(conn_params, "ticker", start=last) if t not in known]
+    tickers = np.concatenate([cube.tickers, np.array(new_tickers, dtype=cube.tickers.dtype)])
+    dates = np.concatenate([cube.dates, new_dates])
+    del cube
+
+    values_path = os.path.join(path, meta["values_file"])
+    n_fields = len(meta["fields"])
+    if len(dates) > capacity:
+        # 날짜 축 확장: 새 capacity 파일로 다시 쓴 뒤 meta를 교체 (기존 독자는 이전 파일을 계속 본다)
+        new_capacity = max(capacity * 2, len(dates) + headroom)
+        old = np.memmap(values_path, dtype=np.float32, mode="r", shape=(n_tickers, capacity, n_fields))
+        values_path = os.path.join(path, _values_file(new_capacity))
+        tmp_path = values_path + ".tmp"
+        values = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(len(tickers), new_capacity, n_fields))
+        values[:] = np.nan
+        values[:n_tickers, :n_dates, :] = old[:, :n_dates, :]
+        del old
+        capacity = new_capacity
+    else:
+        if new_tickers:
+            # 티커 축 확장: 파일 끝에 NaN 블록 추가
+            with open(values_path, "ab") as f:
+                block = np.full((len(new_tickers), capacity, n_fields), np.nan, dtype=np.float32)
+                f.write(block.tobytes())
+        values = np.memmap(values_path, dtype=np.float32, mode="r+", shape=(len(tickers), capacity, n_fields))
+        tmp_path = None
+
+    rows = _fill(values, tickers, dates, conn_params, start=new_dates[0].item())
+    values.flush()
+    del values
+    if tmp_path is not None:
+        os.replace(tmp_path, values_path)
+
+    _save_array(path, _TICKERS, tickers)
+    _save_array(path, _DATES, dates)
+    _write_meta(path, meta["fields"], len(tickers), len(dates), capacity)
+    _remove_stale(path, meta, capacity)
+    print(f"[INFO] 큐브에 {len(new_dates)}개 영업일, 신규 티커 {len(new_tickers)}개 추가 ({rows:,}행)")
+    return PriceCube.open(path)
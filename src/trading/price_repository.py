@@ -0,0 +1,143 @@
+# src/trading/price_repository.py
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.trading.compact import compact_frame
+from src.trading.db import copy_query_chunks, get_conn_params
+
+# krx_daily_price 컬럼 → 연구 코드(raw CSV)와 같은 컬럼명
+FIELD_NAMES = {
+    "open_price": "Open",
+    "high_price": "High",
+    "low_price": "Low",
+    "close_price": "Close",
+    "adj_close": "Adj Close",
+    "volume": "Volume",
+}
+_COLUMN_OF = {v: k for k, v in FIELD_NAMES.items()}
+
+
+class PriceRepository:
+    """
+    krx_daily_price 읽기 전용 접근 계층.
+    풀 연결에서 COPY (SELECT ...) TO STDOUT 으로 받아 pandas C 파서로 바로 컬럼 배열을 만들며,
+    행마다 Python 객체를 만들지 않는다. 같은 조회는 프로세스 내 LRU 캐시에서 돌려준다.
+
+    Parameters:
+    - conn_params:     psycopg2 접속 정보 (기본: 환경 변수)
+    - cache_bytes:     캐시 전체 크기 상한(바이트). 넘으면 오래 쓰지 않은 결과부터 제거
+    - table:           조회 테이블
+    - compact:         True면 가격은 float32, 거래량은 가장 작은 정수, 티커는 category로 받음
+                       (src.trading.compact). 캐시에 같은 기간을 더 많이 담을 수 있다
+    """
+    def __init__(self, conn_params: dict = None, cache_bytes: int = 512 << 20,
+                 table: str = "krx_daily_price", compact: bool = False):
+        self.conn_params = conn_params or get_conn_params()
+        self.cache_bytes = cache_bytes
+        self.table = table
+        self.compact = compact
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # key -> (DataFrame, nbytes)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _columns(fields):
+        """ Open/Close 등 필드명 또는 DB 컬럼명을 DB 컬럼명 목록으로 """
+        if fields is None:
+            return list(FIELD_NAMES)
+        return [_COLUMN_OF.get(f, f) for f in fields]
+
+    def _query(self, tickers, start, end, columns) -> pd.DataFrame:
+        where, params = [], []
+        if tickers is not None:
+            where.append("ticker = ANY(%s)")
+            params.append(list(tickers))
+        if start is not None:
+            where.append("price_date >= %s")
+            params.append(pd.Timestamp(start).date())
+        if end is not None:
+            where.append("price_date <= %s")
+            params.append(pd.Timestamp(end).date())
+        sql = f"SELECT ticker, price_date, {', '.join(columns)} FROM {self.table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ticker, price_date"
+
+        dtype = {"ticker": "category" if self.compact else str}
+        # volume이 NULL인 행이 있어도 읽히도록 결측 가능한 정수 (compact 모드면 compact_frame이 폭을 줄임)
+        dtype.update({c: ("Int64" if c == "volume" else ("float32" if self.compact else "float64")) for c in columns})
+        chunks = list(copy_query_chunks(self.conn_params, sql, params or None, dtype=dtype,
+                                        parse_dates=["price_date"]))
+        if not chunks:
+            return pd.DataFrame(columns=["ticker", "price_date"] + columns)
+        if self.compact and len(chunks) > 1:
+            # chunk마다 category 목록이 달라 그대로 이어 붙이면 object로 풀리므로 목록을 맞춘다
+            categories = union_categoricals([c["ticker"] for c in chunks], sort_categories=True).categories
+            for chunk in chunks:
+                chunk["ticker"] = chunk["ticker"].cat.set_categories(categories)
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        return compact_frame(df, categories=("ticker",)) if self.compact else df
+
+    def _cached(self, key, loader):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key][0]
+        df = loader()
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            self.misses += 1
+            if nbytes <= self.cache_bytes:
+                if key in self._cache:
+                    self._cached_bytes -= self._cache.pop(key)[1]
+                self._cache[key] = (df, nbytes)
+                self._cached_bytes += nbytes
+                while self._cached_bytes > self.cache_bytes:
+                    _, (_, size) = self._cache.popitem(last=False)
+                    self._cached_bytes -= size
+        return df
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+    def get(self, tickers=None, start=None, end=None, fields=None) -> pd.DataFrame:
+        """
+        가격 조회.
+        - tickers: 티커 하나(str)면 Date 인덱스 DataFrame (raw CSV와 같은 Open/High/.../Volume 컬럼),
+                   리스트/None(전체)이면 Ticker, Date 컬럼이 붙은 long-format DataFrame
+        - start/end: 날짜 범위 (포함)
+        - fields: 가져올 필드 (예: ["Close", "Volume"]). None이면 전체
+        반환된 DataFrame은 캐시와 공유되므로 수정하려면 copy() 후 사용
+        """
+        single = isinstance(tickers, str)
+        ticker_list = [tickers] if single else (sorted(tickers) if tickers is not None else None)
+        columns = self._columns(fields)
+        key = (tuple(ticker_list) if ticker_list is not None else None,
+               None if start is None else str(pd.Timestamp(start).date()),
+               None if end is None else str(pd.Timestamp(end).date()),
+               tuple(columns))
+        raw = self._cached(key, lambda: self._query(ticker_list, start, end, columns))
+
+        df = raw.rename(columns={"ticker": "Ticker", "price_date": "Date", **FIELD_NAMES})
+        if single:
+            return df.drop(columns="Ticker").set_index("Date")
+        return df
+
+    def get_panel(self, field: str = "Close", tickers=None, start=None, end=None) -> pd.DataFrame:
+        """ 필드 하나를 (날짜 × 티커) 넓은 표로 조회 (횡단면 계산용) """
+        df = self.get(tickers if tickers is None or not isinstance(tickers, str) else [tickers],
+                      start=start, end=end, fields=[field])
+        name = FIELD_NAMES.get(field, field)
+        return df.pivot(index="Date", columns="Ticker", values=name)
@@ -0,0 +1,212 @@
+# src/trading/price_store.py
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.trading.compact import CATEGORY_COLUMNS, compact_frame
+
+DEFAULT_ROOT = os.path.join("data", "store")
+DATE_COL = "Date"
+TICKER_COL = "Ticker"
+
+# 예전 save_raw_csv가 붙이던 "_YYYYMMDD_HHMMSS" 접미사
+_TIMESTAMP_SUFFIX = re.compile(r"_\d{8}_\d{6}$")
+
+
+def _compact_table(table: pa.Table) -> pa.Table:
+    """ Arrow 단계에서 float64 → float32, 반복 문자열 컬럼 → dictionary (pandas category) 변환 """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_float64(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float32()))
+        elif field.name in CATEGORY_COLUMNS and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    return table
+
+
+def ticker_from_path(path: str) -> str:
+    """
+    data/raw/005930_20250603_153012.csv → 005930 처럼 파일명에서 티커 부분만 추출.
+    경로가 아니면 그대로 티커로 본다.
+    """
+    base = os.path.basename(path)
+    for suffix in (".csv", ".parquet"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    base = base.replace("_processed", "")
+    return _TIMESTAMP_SUFFIX.sub("", base)
+
+
+class PriceStore:
+    """
+    티커·연도로 파티션된 Parquet 가격 저장소.
+    {root}/{dataset}/ticker={티커}/year={연도}/part.parquet 형태로 저장하며,
+    같은 날짜의 행은 하나만 유지된다 (타임스탬프별 중복 파일 없음).
+
+    - dataset: "raw"(수집 원본), "processed"(전처리/지표 포함) 등 데이터 단계 이름
+    """
+    def __init__(self, root: str = DEFAULT_ROOT, dataset: str = "raw"):
+        self.root = root
+        self.dataset = dataset
+
+    @property
+    def base_dir(self) -> str:
+        return os.path.join(self.root, self.dataset)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.base_dir, f"ticker={ticker}")
+
+    def _partition_path(self, ticker: str, year: int) -> str:
+        return os.path.join(self._ticker_dir(ticker), f"year={year}", "part.parquet")
+
+    def tickers(self) -> list:
+        """ 저장된 티커 목록 """
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name.split("=", 1)[1] for name in os.listdir(self.base_dir) if name.startswith("ticker=")
+        )
+
+    def years(self, ticker: str) -> list:
+        tdir = self._ticker_dir(ticker)
+        if not os.path.isdir(tdir):
+            return []
+        return sorted(int(name.split("=", 1)[1]) for name in os.listdir(tdir) if name.startswith("year="))
+
+    def last_modified(self, ticker: str):
+        """ 티커 파티션 파일 중 가장 최근 수정 시각 (저장된 데이터가 없으면 None) """
+        times = [os.path.getmtime(self._partition_path(ticker, year)) for year in self.years(ticker)
+                 if os.path.exists(self._partition_path(ticker, year))]
+        return max(times) if times else None
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        """ 날짜 인덱스를 Date 컬럼으로 꺼내고, yfinance의 MultiIndex 컬럼을 평탄화 """
+        df = df.copy()
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        df.index = pd.DatetimeIndex(df.index, name=DATE_COL)
+        df = df[~df.index.duplicated(keep="last")]
+        return df.reset_index()
+
+    def write(self, ticker: str, df: pd.DataFrame, mode: str = "upsert") -> int:
+        """
+        티커의 데이터를 연도 파티션별로 병합 저장. 반환: 저장 후 영향받은 파티션 수
+        - upsert:    같은 날짜가 있으면 새 값으로 덮어씀
+        - append:    이미 있는 날짜는 유지하고 새로운 날짜만 추가
+        - overwrite: 티커의 기존 데이터를 모두 지우고 새로 저장
+        """
+        if mode not in ("upsert", "append", "overwrite"):
+            raise ValueError(f"unknown write mode: {mode}")
+        if mode == "overwrite" and os.path.isdir(self._ticker_dir(ticker)):
+            shutil.rmtree(self._ticker_dir(ticker))
+
+        new = self._normalize(df)
+        partitions = 0
+        for year, part in new.groupby(new[DATE_COL].dt.year):
+            path = self._partition_path(ticker, int(year))
+            if os.path.exists(path):
+                old = pq.read_table(path).to_pandas()
+                frames = [old, part] if mode == "upsert" else [part, old]
+                part = pd.concat(frames, ignore_index=True)
+                part = part.drop_duplicates(subset=DATE_COL, keep="last")
+            part = part.sort_values(DATE_COL).reset_index(drop=True)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+            os.replace(tmp_path, path)
+            partitions += 1
+        return partitions
+
+    def read(self, tickers=None, start=None, end=None, columns=None, compact: bool = False) -> pd.DataFrame:
+        """
+        저장된 데이터 읽기.
+        - tickers: 티커 하나(str)면 Date 인덱스 DataFrame,
+                   리스트/None(전체)이면 Ticker 컬럼이 붙은 long-format DataFrame
+        - start/end: 날짜 범위 (포함). 범위 밖 연도 파티션은 열지 않고,
+                     파티션 안에서는 Parquet 통계로 행 그룹을 걸러낸다
+        - columns: 읽을 컬럼 목록 (Date는 항상 포함)
+        - compact: True면 파티션마다 float32·category로 바꿔 읽음 (src.trading.compact 참고).
+                   float64 전체 사본을 만들지 않으므로 전 종목을 읽을 때 최대 메모리가 줄어든다
+        """
+        single = isinstance(tickers, str)
+        if tickers is None:
+            tickers = self.tickers()
+        elif single:
+            tickers = [tickers]
+
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        filters = []
+        if start is not None:
+            filters.append((DATE_COL, ">=", start))
+        if end is not None:
+            filters.append((DATE_COL, "<=", end))
+        read_columns = None if columns is None else [DATE_COL] + [c for c in columns if c != DATE_COL]
+
+        tables = []
+        for tic in tickers:
+            for year in self.years(tic):
+                if (start is not None and year < start.year) or (end is not None and year > end.year):
+                    continue
+                table = pq.read_table(self._partition_path(tic, year), columns=read_columns,
+                                      filters=filters or None)
+                if table.num_rows == 0:
+                    continue
+                if compact:
+                    table = _compact_table(table)
+                if not single and compact:
+                    indices = pa.array(np.zeros(table.num_rows, dtype=np.int32))
+                    table = table.append_column(TICKER_COL, pa.DictionaryArray.from_arrays(indices, pa.array([tic])))
+                elif not single:
+                    table = table.append_column(TICKER_COL, pa.array([tic] * table.num_rows, pa.string()))
+                tables.append(table)
+
+        if not tables:
+            if single:
+                raise FileNotFoundError(f"No stored '{self.dataset}' data for {tickers[0]} in {self.base_dir}")
+            return pd.DataFrame(columns=([TICKER_COL] + (read_columns or [DATE_COL])))
+
+        df = pa.concat_tables(tables, promote_options="default").to_pandas()
+        if compact:
+            compact_frame(df)
+            if not single:
+                df[TICKER_COL] = df[TICKER_COL].cat.reorder_categories(sorted(df[TICKER_COL].cat.categories))
+        if single:
+            return df.set_index(DATE_COL).sort_index()
+        cols = [TICKER_COL, DATE_COL] + [c for c in df.columns if c not in (TICKER_COL, DATE_COL)]
+        return df[cols].sort_values([TICKER_COL, DATE_COL]).reset_index(drop=True)
+
+
+def load_prices(source: str, dataset: str = "raw", start=None, end=None, columns=None,
+                root: str = DEFAULT_ROOT, compact: bool = False) -> pd.DataFrame:
+    """
+    가격 데이터 단일 읽기 API.
+    - source가 존재하는 CSV 파일 경로면 예전 방식대로 CSV를 읽고 (하위 호환),
+    - 아니면 티커(또는 예전 CSV 파일명)로 보고 PriceStore(dataset)에서 읽는다.
+    - compact: True면 float32·최소 정수·category dtype으로 (src.trading.compact)
+    반환: Date 인덱스 DataFrame
+    """
+    if source.endswith(".csv") and os.path.exists(source):
+        df = pd.read_csv(source, index_col=0, parse_dates=True)
+        if compact:
+            compact_frame(df)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index <= pd.Timestamp(end)]
+        return df if columns is None else df[list(columns)]
+    return PriceStore(root, dataset).read(ticker_from_path(source), start=start, end=end, columns=columns,
+                                          compact=compact)
+
+
+def save_prices(df: pd.DataFrame, ticker: str, dataset: str = "raw", mode: str = "upsert",
+                root: str = DEFAULT_ROOT):
+    """ PriceStore(dataset)에 티커 데이터를 병합 저장 """
+    PriceStore(root, dataset).write(ticker, df, mode=mode)
+    print(f"[INFO] Saved {dataset} data for {ticker} to {os.path.join(root, dataset)} ({mode})")
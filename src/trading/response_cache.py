@@ -0,0 +1,184 @@
+# src/trading/response_cache.py
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+MODES = ("off", "on", "refresh", "offline")
+
+
+class CacheMiss(LookupError):
+    """ offline 모드에서 캐시에 없는 응답을 요청했을 때 발생 """
+
+
+class ResponseCache:
+    """
+    pykrx/yfinance 응답을 (source, function, ticker, 기간, 기타 인자) 키로 디스크에 저장하는 캐시.
+
+    Parameters:
+    - root:      캐시 파일 디렉터리
+    - mode:      off(사용 안 함) / on(캐시 우선, 없으면 네트워크) /
+                 refresh(항상 네트워크 조회 후 캐시 갱신) / offline(캐시만 사용, 없으면 CacheMiss)
+    - ttl:       항목 유효 시간(초). None이면 만료 없음. offline 모드에서는 무시
+    - max_bytes: 캐시 전체 크기 상한. 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    """
+    def __init__(self, root: str = os.path.join("data", "cache", "responses"), mode: str = "on",
+                 ttl: float = None, max_bytes: int = 1 << 30):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.root = root
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None  # {key: [size, last_access]}
+
+    @staticmethod
+    def make_key(source, function, ticker=None, start=None, end=None, params=None) -> str:
+        raw = json.dumps([source, function, ticker, start, end, params or {}],
+                         sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".pkl")
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".pkl"):
+                    st = os.stat(os.path.join(dirpath, name))
+                    self._index[name[:-4]] = [st.st_size, st.st_mtime]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return sum(size for size, _ in self._index.values())
+
+    def get(self, key: str):
+        """ (찾았는지 여부, 값) 반환. 만료된 항목은 offline 모드가 아니면 없는 것으로 본다 """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"[WARN] 손상된 캐시 항목 {path} 무시: {e}")
+            return False, None
+        if self.mode != "offline" and self.ttl is not None and time.time() - entry["created"] > self.ttl:
+            return False, None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self._load_index()
+            if key in self._index:
+                self._index[key][1] = now
+        return True, entry["value"]
+
+    def put(self, key: str, value, meta: dict = None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"created": time.time(), "meta": meta or {}, "value": value}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._load_index()
+            self._index[key] = [os.path.getsize(path), time.time()]
+            self._evict_locked(keep=key)
+
+    def _evict_locked(self, keep=None):
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            del self._index[key]
+            total -= size
+
+    def call(self, source, function, fetch, ticker=None, start=None, end=None, params=None):
+        """
+        캐시를 거쳐 fetch()를 호출. 키는 (source, function, ticker, start, end, params).
+        """
+        if self.mode == "off":
+            return fetch()
+        key = self.make_key(source, function, ticker, start, end, params)
+        if self.mode != "refresh":
+            found, value = self.get(key)
+            if found:
+                self.hits += 1
+                return value
+        if self.mode == "offline":
+            raise CacheMiss(f"offline cache miss: {source}.{function} ticker={ticker} {start}~{end} {params or ''}")
+        self.misses += 1
+        value = fetch()
+        self.put(key, value, meta={"source": source, "function": function, "ticker": ticker,
+                                   "start": start, "end": end, "params": params})
+        return value
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def cache_from_env() -> ResponseCache:
+    """
+    환경 변수로 기본 캐시 생성
+    - TRADE_CACHE_MODE:   off / on / refresh / offline (기본 off)
+    - TRADE_CACHE_DIR:    캐시 디렉터리 (기본 data/cache/responses)
+    - TRADE_CACHE_TTL:    유효 시간(초, 기본 만료 없음)
+    - TRADE_CACHE_MAX_MB: 최대 크기(MB, 기본 1024)
+    """
+    ttl = os.getenv("TRADE_CACHE_TTL")
+    return ResponseCache(
+        root=os.getenv("TRADE_CACHE_DIR", os.path.join("data", "cache", "responses")),
+        mode=os.getenv("TRADE_CACHE_MODE", "off"),
+        ttl=float(ttl) if ttl else None,
+        max_bytes=int(float(os.getenv("TRADE_CACHE_MAX_MB", "1024")) * (1 << 20)),
+    )
+
+
+def get_cache() -> ResponseCache:
+    """ 현재 사용 중인 전역 응답 캐시 (최초 호출 시 환경 변수로 생성) """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = cache_from_env()
+        return _cache
+
+
+def set_cache(cache: ResponseCache):
+    """ 전역 응답 캐시를 교체 (테스트나 다른 저장소를 쓸 때). None이면 다음 호출 때 환경 변수로 재생성 """
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def cached_call(source, function, fetch, ticker=None, start=None, end=None, **params):
+    """
+    전역 캐시를 거쳐 fetch()를 호출하는 편의 함수.
+    예) cached_call("pykrx", "get_market_ohlcv_by_date",
+                    lambda: stock.get_market_ohlcv_by_date(s, e, t), ticker=t, start=s, end=e)
+    """
+    return get_cache().call(source, function, fetch, ticker=ticker, start=start, end=end,
+                            params=params or None)
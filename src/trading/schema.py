@@ -0,0 +1,171 @@
+# src/trading/schema.py
+import pandas as pd
+from psycopg2 import sql
+
+from src.trading.db import pooled_connection
+
+PRICE_TABLE = "krx_daily_price"
+
+
+def partition_name(table: str, year: int) -> str:
+    """ 연도 파티션 테이블 이름 (예: krx_daily_price_y2024) """
+    return f"{table}_y{year}"
+
+
+def _table_kind(cur, table: str):
+    """ 'p'(파티션 테이블), 'r'(일반 테이블), 없으면 None """
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s);", (table,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _existing_years(cur, table: str) -> set:
+    cur.execute("""
+    SELECT c.relname
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+     WHERE i.inhparent = to_regclass(%s);
+    """, (table,))
+    prefix = f"{table}_y"
+    return {int(name[len(prefix):]) for (name,) in cur.fetchall()
+            if name.startswith(prefix) and name[len(prefix):].isdigit()}
+
+
+def _create_partitioned(cur, table: str):
+    """
+    연도 범위 파티션 테이블과 인덱스 생성.
+    - PRIMARY KEY (ticker, price_date): 업서트의 ON CONFLICT 대상이자 티커별 조회용 B-tree
+      (ticker가 선두 컬럼이라 ticker 단독 조건도 이 인덱스로 처리)
+    - BRIN (price_date): 날짜순으로 쌓이는 일별 적재에서 특정 영업일 전 종목 조회용. 크기가 수십 KB 수준.
+      pages_per_range=16 (약 2,000행, 하루치 전 종목 분량)으로 잡아 한 날짜 조회 시 읽는 블록을 줄인다
+    부모 테이블에 만든 인덱스는 모든 파티션에 자동으로 생성된다.
+    """
+    cur.execute(sql.SQL("""
+    CREATE TABLE IF NOT EXISTS {table} (
+        ticker      VARCHAR(10) NOT NULL,
+        price_date  DATE NOT NULL,
+        open_price  DOUBLE PRECISION,
+        high_price  DOUBLE PRECISION,
+        low_price   DOUBLE PRECISION,
+        close_price DOUBLE PRECISION,
+        adj_close   DOUBLE PRECISION,
+        volume      BIGINT,
+        PRIMARY KEY (ticker, price_date)
+    ) PARTITION BY RANGE (price_date);
+    """).format(table=sql.Identifier(table)))
+    cur.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {idx} ON {table} USING brin (price_date) "
+                        "WITH (pages_per_range = 16);").format(
+        idx=sql.Identifier(f"{table}_price_date_brin"), table=sql.Identifier(table)))
+
+
+def _create_partitions(cur, table: str, years) -> list:
+    existing = _existing_years(cur, table)
+    created = []
+    for year in sorted(set(years) - existing):
+        cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {part} PARTITION OF {table}
+          FOR VALUES FROM (%s) TO (%s);
+        """).format(part=sql.Identifier(partition_name(table, year)), table=sql.Identifier(table)),
+            (f"{year}-01-01", f"{year + 1}-01-01"))
+        created.append(partition_name(table, year))
+    return created
+
+
+def _years(start, end) -> range:
+    return range(pd.Timestamp(start).year, pd.Timestamp(end).year + 1)
+
+
+def ensure_price_schema(conn_params: dict, start=None, end=None, table: str = PRICE_TABLE) -> list:
+    """
+    krx_daily_price를 연도 파티션 테이블로 준비하고 start~end 기간의 연도 파티션을 만든다.
+    이미 있는 테이블·파티션은 그대로 두므로 적재 전에 매번 호출해도 된다.
+    - start/end: 'YYYYMMDD' 등 날짜 (None이면 파티션은 만들지 않음)
+    예전 일반 테이블(파티션 아님)이 있으면 건드리지 않고 경고만 출력한다 (migrate_to_partitioned 참고).
+    반환: 새로 만든 파티션 이름 목록
+    """
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            kind = _table_kind(cur, table)
+            if kind == "r":
+                print(f"[WARN] {table}이(가) 파티션 테이블이 아닙니다. "
+                      f"scripts/init_schema.py --migrate 로 전환할 수 있습니다.")
+                conn.commit()
+                return []
+            if kind is None:
+                _create_partitioned(cur, table)
+                print(f"[INFO] {table} 연도 파티션 테이블 생성")
+            created = _create_partitions(cur, table, _years(start, end)) if start and end else []
+        conn.commit()
+    if created:
+        print(f"[INFO] 파티션 {len(created)}개 생성: {', '.join(created)}")
+    return created
+
+
+def migrate_to_partitioned(conn_params: dict, table: str = PRICE_TABLE) -> int:
+    """
+    기존 일반 krx_daily_price를 연도 파티션 테이블로 옮긴다 (한 트랜잭션).
+    기존 테이블은 {table}_legacy로 이름을 바꿔 남겨두며, 확인 후 직접 DROP 한다.
+    행은 (price_date, ticker) 순서로 다시 넣어 BRIN 인덱스가 잘 걸리도록 한다.
+    이미 파티션 테이블이거나 테이블이 없으면 아무것도 하지 않으므로 다시 실행해도 된다.
+    반환: 옮긴 행 수
+    """
+    legacy = f"{table}_legacy"
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            kind = _table_kind(cur, table)
+            if kind != "r":
+                conn.commit()
+                print(f"[INFO] {table}: " + ("이미 파티션 테이블이라 이전할 것이 없습니다." if kind == "p"
+                                             else "테이블이 없어 이전할 것이 없습니다."))
+                return 0
+            cur.execute(sql.SQL("ALTER TABLE {table} RENAME TO {legacy};").format(
+                table=sql.Identifier(table), legacy=sql.Identifier(legacy)))
+            # 새 테이블의 인덱스·제약 이름과 겹치지 않도록 기존 인덱스 이름도 바꿈
+            cur.execute("""
+            SELECT indexname FROM pg_indexes
+             WHERE schemaname = current_schema() AND tablename = %s;
+            """, (legacy,))
+            for (index,) in cur.fetchall():
+                cur.execute(sql.SQL("ALTER INDEX {old} RENAME TO {new};").format(
+                    old=sql.Identifier(index), new=sql.Identifier(f"{index}_legacy")))
+
+            _create_partitioned(cur, table)
+            cur.execute(sql.SQL("SELECT min(price_date), max(price_date) FROM {legacy};").format(
+                legacy=sql.Identifier(legacy)))
+            lo, hi = cur.fetchone()
+            if lo is not None:
+                _create_partitions(cur, table, _years(lo, hi))
+            cur.execute(sql.SQL("""
+            INSERT INTO {table}
+            SELECT DISTINCT ON (price_date, ticker)
+                   ticker, price_date, open_price, high_price, low_price, close_price, adj_close, volume
+              FROM {legacy}
+             ORDER BY price_date, ticker;
+            """).format(table=sql.Identifier(table), legacy=sql.Identifier(legacy)))
+            rows = cur.rowcount
+        conn.commit()
+    print(f"[INFO] {rows:,}행을 파티션 테이블 {table}로 이전 (기존 테이블: {legacy})")
+    return rows
+
+
+def cluster_partition(conn_params: dict, year: int, table: str = PRICE_TABLE) -> int:
+    """
+    한 연도 파티션을 (price_date, ticker) 순서로 다시 써서 BRIN 인덱스 효율을 되살린다.
+    티커 모드로 과거 데이터를 한꺼번에 적재하면 행이 티커 순서로 쌓여 날짜 조회가 느려지므로,
+    그런 백필 후에 한 번 실행한다. 실행 중에는 해당 파티션에 쓰기가 막힌다.
+    반환: 다시 쓴 행 수
+    """
+    part = sql.Identifier(partition_name(table, year))
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("LOCK TABLE {part} IN ACCESS EXCLUSIVE MODE;").format(part=part))
+            cur.execute(sql.SQL(
+                "CREATE TEMP TABLE _cluster_rows ON COMMIT DROP AS SELECT * FROM {part};").format(part=part))
+            cur.execute(sql.SQL("TRUNCATE {part};").format(part=part))
+            cur.execute(sql.SQL(
+                "INSERT INTO {part} SELECT * FROM _cluster_rows ORDER BY price_date, ticker;").format(part=part))
+            rows = cur.rowcount
+            cur.execute(sql.SQL("ANALYZE {part};").format(part=part))
+        conn.commit()
+    print(f"[INFO] {partition_name(table, year)} {rows:,}행 날짜순 재정렬")
+    return rows
@@ -0,0 +1,195 @@
+# src/trading/tickers.py
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pykrx import stock
+from psycopg2.extras import execute_values
+
+from src.trading.db import pooled_connection
+from src.trading.response_cache import cached_call
+from src.trading.utils import TokenBucket, call_with_retry
+
+# 조회할 시장 목록 (필요 시 'KONEX' 등 다른 시장도 추가 가능)
+MARKETS = {
+    "KOSPI": "KOSPI",
+    "KOSDAQ": "KOSDAQ"
+}
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "ticker_names.json")
+
+
+class TickerNameCache:
+    """
+    티커 → (종목명, 시장) 로컬 캐시 (JSON 파일).
+    ttl 초가 지난 항목은 만료된 것으로 보고 다시 조회한다.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[WARN] 티커 캐시 {path} 읽기 실패, 새로 만듭니다: {e}", file=sys.stderr)
+
+    def get(self, ticker: str):
+        """ 만료되지 않은 캐시 항목 {"name", "market", "updated"} 또는 None """
+        entry = self.entries.get(ticker)
+        if entry is None or time.time() - entry["updated"] > self.ttl:
+            return None
+        return entry
+
+    def put(self, ticker: str, name: str, market: str):
+        self.entries[ticker] = {"name": name, "market": market, "updated": time.time()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def _resolve_name(ticker: str) -> str:
+    name = cached_call("pykrx", "get_market_ticker_name",
+                       lambda: stock.get_market_ticker_name(ticker), ticker=ticker)
+    return name or ""
+
+
+def resolve_names(tickers, workers: int = 8, rate: float = 10.0, retries: int = 2) -> dict:
+    """
+    종목명을 병렬로 조회 (공유 호출 제한 + 재시도). 실패한 티커는 빈 문자열.
+    반환: {ticker: name}
+    """
+    limiter = TokenBucket(rate)
+
+    def resolve(tic):
+        limiter.acquire()
+        return _resolve_name(tic)
+
+    def resolve_safe(tic):
+        try:
+            return call_with_retry(resolve, (tic,), retries=retries, label=tic)
+        except Exception as e:
+            print(f"[WARN] get_market_ticker_name('{tic}') 호출 중 예외 발생: {e}", file=sys.stderr)
+            return ""
+
+    tickers = list(tickers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        names = list(executor.map(resolve_safe, tickers))
+    return dict(zip(tickers, names))
+
+
+def fetch_all_tickers(date: str, cache: TickerNameCache = None, workers: int = 8,
+                      rate: float = 10.0) -> pd.DataFrame:
+    """
+    지정한 날짜(date, 'YYYYMMDD') 기준 KOSPI/KOSDAQ 티커·종목명·시장 정보를 DataFrame 으로 반환.
+    종목명은 캐시에 없거나 만료된 티커만 병렬로 조회한다.
+    반환 컬럼: ticker, name, market
+    """
+    cache = cache or TickerNameCache()
+    listing = []
+    for market_name, market_code in MARKETS.items():
+        try:
+            tickers = cached_call("pykrx", "get_market_ticker_list",
+                                  lambda: stock.get_market_ticker_list(market=market_code, date=date),
+                                  start=date, end=date, market=market_code)
+        except Exception as e:
+            print(f"[WARN] get_market_ticker_list('{market_code}', '{date}') 예외: {e}", file=sys.stderr)
+            continue
+        listing.extend((tic, market_name) for tic in tickers)
+
+    misses = [
+        tic for tic, market in listing
+        if (entry := cache.get(tic)) is None or entry["market"] != market
+    ]
+    print(f"[INFO] 티커 {len(listing)}개 중 캐시 미스 {len(misses)}개 종목명 조회...")
+    if misses:
+        resolved = resolve_names(misses, workers=workers, rate=rate)
+        market_of = dict(listing)
+        for tic, name in resolved.items():
+            # 조회 실패(빈 이름)는 캐시하지 않아 다음 실행에서 다시 시도
+            if name:
+                cache.put(tic, name, market_of[tic])
+        cache.save()
+    else:
+        resolved = {}
+
+    rows = []
+    for tic, market in listing:
+        entry = cache.get(tic)
+        name = entry["name"] if entry is not None else resolved.get(tic, "")
+        rows.append({"ticker": tic, "name": name, "market": market})
+    return pd.DataFrame(rows, columns=["ticker", "name", "market"])
+
+
+def diff_tickers(current: pd.DataFrame, stored: pd.DataFrame) -> dict:
+    """
+    새 티커 목록(current)과 DB에 저장된 목록(stored)을 비교.
+    반환: {"added": DataFrame, "changed": DataFrame, "delisted": [ticker]}
+    - changed: 종목명 또는 시장이 바뀐 티커
+    """
+    merged = current.merge(stored, on="ticker", how="outer", suffixes=("", "_old"), indicator=True)
+    added = merged[merged["_merge"] == "left_only"]
+    both = merged[merged["_merge"] == "both"]
+    changed = both[(both["name"] != both["name_old"]) | (both["market"] != both["market_old"])]
+    delisted = merged.loc[merged["_merge"] == "right_only", "ticker"].tolist()
+    cols = ["ticker", "name", "market"]
+    return {
+        "added": added[cols].reset_index(drop=True),
+        "changed": changed[cols].reset_index(drop=True),
+        "delisted": delisted,
+    }
+
+
+def sync_tickers_table(df: pd.DataFrame, conn_params: dict) -> dict:
+    """
+    krx_tickers 테이블을 df와 같게 맞춘다. 추가/변경/상장폐지된 티커만 한 트랜잭션에서 반영하므로
+    갱신 중에도 다른 세션은 항상 완전한 목록을 읽는다.
+    df에서 종목명이 비어 있는(조회 실패) 티커는 기존 이름을 유지한다.
+    반환: diff_tickers 결과
+    """
+    if df.empty:
+        # 티커 목록 조회가 통째로 실패한 경우 전 종목을 상장폐지로 지우지 않도록 방지
+        raise ValueError("empty ticker list; refusing to sync krx_tickers")
+    with pooled_connection(conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS krx_tickers (
+                ticker VARCHAR(10) PRIMARY KEY,
+                name   VARCHAR(100) NOT null,
+                market VARCHAR(10) NOT NULL
+            );
+            """)
+            cur.execute("SELECT ticker, name, market FROM krx_tickers;")
+            stored = pd.DataFrame(cur.fetchall(), columns=["ticker", "name", "market"])
+
+            current = df.copy()
+            old_names = dict(zip(stored["ticker"], stored["name"]))
+            missing = current["name"] == ""
+            current.loc[missing, "name"] = current.loc[missing, "ticker"].map(old_names).fillna("")
+
+            diff = diff_tickers(current, stored)
+            # 한 시장의 목록 조회가 실패했다면 그 시장 종목은 상장폐지로 보지 않음
+            markets = set(current["market"])
+            stored_market = dict(zip(stored["ticker"], stored["market"]))
+            diff["delisted"] = [t for t in diff["delisted"] if stored_market[t] in markets]
+            upserts = pd.concat([diff["added"], diff["changed"]], ignore_index=True)
+            if len(upserts):
+                execute_values(cur, """
+                INSERT INTO krx_tickers (ticker, name, market)
+                VALUES %s
+                ON CONFLICT (ticker) DO UPDATE
+                  SET name = EXCLUDED.name,
+                      market = EXCLUDED.market;
+                """, list(upserts.itertuples(index=False, name=None)))
+            if diff["delisted"]:
+                cur.execute("DELETE FROM krx_tickers WHERE ticker = ANY(%s);", (diff["delisted"],))
+        conn.commit()
+    return diff
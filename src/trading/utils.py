@@ -1,5 +1,8 @@
 # src/trading/utils.py
 import os
+import random
+import threading
+import time
 
 def ensure_directories():
     """
@@ -7,4 +10,61 @@ def ensure_directories():
     """
     dirs = ["data/raw", "data/processed", "models", "reports/figures"]
     for d in dirs:
-        os.makedirs(d, exist_ok=True)
\ No newline at end of file
+        os.makedirs(d, exist_ok=True)
+
+
+class TokenBucket:
+    """
+    여러 스레드가 공유하는 토큰 버킷 방식의 호출 속도 제한기.
+
+    Parameters:
+    - rate:     초당 보충되는 토큰 수 (= 허용 호출 수/초)
+    - capacity: 한 번에 몰아서 쓸 수 있는 최대 토큰 수 (기본값: rate, 최소 1)
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        토큰을 얻을 때까지 대기한 뒤 차감한다.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def call_with_retry(func, args=(), kwargs=None, retries: int = 3,
+                    base_delay: float = 1.0, max_delay: float = 30.0, label: str = ""):
+    """
+    func(*args, **kwargs)를 호출하고 예외 발생 시 지수 백오프(+지터)로 재시도.
+    retries 회 재시도 후에도 실패하면 마지막 예외를 그대로 다시 발생시킨다.
+    """
+    kwargs = kwargs or {}
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            delay *= random.uniform(0.5, 1.0)
+            attempt += 1
+            print(f"[WARN] {label or func.__name__} 실패({e}), {delay:.1f}초 후 재시도 ({attempt}/{retries})")
+            time.sleep(delay)
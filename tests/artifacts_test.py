@@ -0,0 +1,85 @@
+# tests/artifacts_test.py
+import json
+import os
+import numpy as np
+import pytest
+from src.trading.model import artifacts
+from src.trading.model.artifacts import FORMAT_VERSION, MANIFEST, ModelRegistry, load_artifact, write_artifact
+from src.trading.model.ml_models import build_model
+
+def make_data(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+def trained(model_type, X, y):
+    model = build_model(model_type, n_jobs=1, params={"max_depth": 8} if model_type == "rf" else None)
+    X_train, X_test = model.scale(X[:1200], X[1200:])
+    model.fit(X_train, y[:1200])
+    return model, X_test
+
+@pytest.mark.parametrize("model_type", ["rf", "xgb", "lgb"])
+def test_artifact_predictions_match_model(tmp_path, model_type, monkeypatch):
+    # 추론 엔진 경로 (네이티브 부스터 경로는 test_large_batches_use_native_booster)
+    monkeypatch.setattr(artifacts, "NATIVE_MIN_ROWS", np.inf)
+    X, y = make_data()
+    model, X_test = trained(model_type, X, y)
+    expected = model.predict(X_test)
+    manifest = write_artifact(model, str(tmp_path), features=list("abcde"), metrics={"accuracy": 0.5})
+    assert manifest["format_version"] == FORMAT_VERSION and manifest["model_type"] == model_type
+
+    artifact = load_artifact(str(tmp_path))
+    # 엔진·스케일러는 처음 쓸 때 읽음
+    assert "engine" not in vars(artifact) and "scaler" not in vars(artifact)
+    # 스케일러를 합친 엔진이라 원래 특징 값을 그대로 넣는다
+    np.testing.assert_array_equal(artifact.predict(X[1200:]), expected)
+    np.testing.assert_allclose(artifact.predict_proba(X[1200:]), model.predict_proba(X_test), rtol=1e-6)
+    assert isinstance(artifact.engine.threshold, np.memmap) and "scaler" not in vars(artifact)
+    np.testing.assert_array_equal(artifact.transform(X[1200:]), X_test)
+    assert isinstance(artifact.scaler[0], np.memmap)
+
+@pytest.mark.parametrize("model_type", ["xgb", "lgb"])
+def test_large_batches_use_native_booster(tmp_path, model_type, monkeypatch):
+    X, y = make_data()
+    model, X_test = trained(model_type, X, y)
+    write_artifact(model, str(tmp_path))
+    artifact = load_artifact(str(tmp_path))
+    # 기준 미만은 엔진: 네이티브 부스터를 읽지 않음
+    monkeypatch.setattr(artifacts, "NATIVE_MIN_ROWS", len(X_test) + 1)
+    engine_proba = artifact.predict_proba(X[1200:])
+    assert "model" not in vars(artifact)
+    monkeypatch.setattr(artifacts, "NATIVE_MIN_ROWS", len(X_test))
+    np.testing.assert_array_equal(artifact.predict(X[1200:]), model.predict(X_test))
+    np.testing.assert_allclose(artifact.predict_proba(X[1200:]), engine_proba, rtol=1e-6)
+    assert "model" in vars(artifact)
+
+def test_registry_versions(tmp_path):
+    X, y = make_data()
+    model, _ = trained("lgb", X, y)
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.register("lgb_005930", model, metrics={"accuracy": 0.51})[0] == 1
+    version, path = registry.register("lgb_005930", model, metrics={"accuracy": 0.52})
+    assert version == 2 and registry.versions("lgb_005930") == [1, 2]
+    # 임시 디렉터리가 남지 않음
+    assert sorted(os.listdir(tmp_path / "lgb_005930")) == ["v1", "v2"]
+
+    assert registry.load("lgb_005930").directory == path
+    assert registry.load("lgb_005930:1").manifest["metrics"] == {"accuracy": 0.51}
+    table = registry.list()
+    assert table[["name", "version", "accuracy"]].values.tolist() == [["lgb_005930", 1, 0.51], ["lgb_005930", 2, 0.52]]
+    with pytest.raises(FileNotFoundError):
+        registry.load("lgb_005930:3")
+    with pytest.raises(ValueError):
+        registry.register("../escape", model)
+
+def test_other_format_rejected(tmp_path):
+    X, y = make_data()
+    model, _ = trained("rf", X, y)
+    write_artifact(model, str(tmp_path))
+    manifest_path = tmp_path / MANIFEST
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    for version in (FORMAT_VERSION - 1, FORMAT_VERSION + 1):
+        manifest_path.write_text(json.dumps({**manifest, "format_version": version}), encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_artifact(str(tmp_path))
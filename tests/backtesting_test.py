@@ -0,0 +1,73 @@
+# tests/backtesting_test.py
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading.backtesting import MLStrategy, compute_signals, load_signal_model, run_backtest
+from src.trading.model.artifacts import ModelRegistry
+from src.trading.model.ml_models import build_model
+
+FEATURES = ["f0", "f1", "f2"]
+
+def make_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 10000 + np.cumsum(rng.normal(scale=100, size=n))
+    df = pd.DataFrame({"Open": close, "High": close + 50, "Low": close - 50, "Close": close,
+                       "Volume": rng.integers(1000, 5000, n)},
+                      index=pd.bdate_range("2020-01-01", periods=n, name="Date"))
+    for i, name in enumerate(FEATURES):
+        df[name] = rng.normal(scale=10 ** i, size=n) + i * 100
+    return df
+
+def trained(model_type, df):
+    model = build_model(model_type, n_jobs=1)
+    X = df[FEATURES].to_numpy()
+    y = (X[:, 0] > X[:, 0].mean()).astype(int)
+    X_train, _ = model.scale(X[:240], X[240:])
+    model.train(X_train, y[:240])
+    return model
+
+def test_signals_follow_bars():
+    df = make_frame(n=10)
+    signals = np.array([-1, -1, 1, 1, 0, -1, 1, 0, 0, 1], dtype=np.int8)
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(1e6)
+    cerebro.addstrategy(MLStrategy, signals=signals, position_size=1)
+    cerebro.addanalyzer(bt.analyzers.Transactions, _name="tx")
+    orders = []
+    strategy = cerebro.run()[0]
+    for date, rows in strategy.analyzers.tx.get_analysis().items():
+        orders.extend((date.date(), row[0]) for row in rows)
+    # 신호가 바뀐 봉에 낸 주문이 다음 봉 시가에 체결됨 (-1은 보유 여부와 상관없이 거래하지 않음)
+    dates = df.index.date
+    assert orders == [(dates[3], 1), (dates[5], -1), (dates[7], 1), (dates[8], -1)]
+
+@pytest.mark.parametrize("model_type", ["rf", "xgb"])
+def test_pickle_and_registry_signals_match_model(tmp_path, model_type):
+    df = make_frame()
+    model = trained(model_type, df)
+    expected = model.predict(model.scaler.transform(df[FEATURES].to_numpy()[240:]))
+
+    model.save(str(tmp_path / "models" / f"{model_type}_model.pkl"))
+    predict, features, source = load_signal_model(str(tmp_path / "models" / f"{model_type}_model.pkl"))
+    assert features is None and source.endswith(f"{model_type}_model_processed.csv")
+    signals = compute_signals(predict, df, FEATURES, 240)
+    assert signals.dtype == np.int8 and (signals[:240] == -1).all()
+    np.testing.assert_array_equal(signals[240:], expected)
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.register(f"{model_type}_005930", model, features=FEATURES)
+    predict, features, source = load_signal_model(f"{model_type}_005930:1", registry_root=registry.root)
+    assert features == FEATURES and source == "005930"
+    np.testing.assert_array_equal(compute_signals(predict, df, features, 240)[240:], expected)
+
+def test_run_backtest_from_csv(tmp_path):
+    df = make_frame()
+    csv_path = str(tmp_path / "005930_processed.csv")
+    df.to_csv(csv_path)
+    # 저장소 모델은 manifest의 특징 목록으로 열을 고름
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.register("rf_005930", trained("rf", df), features=FEATURES)
+    value = run_backtest("rf_005930", ticker=csv_path, registry_root=registry.root, plot=False)
+    assert value > 0
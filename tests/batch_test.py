@@ -0,0 +1,64 @@
+# tests/batch_test.py
+import os
+import time
+import numpy as np
+import pandas as pd
+from src.trading.batch import is_up_to_date, limit_threads, plan_parallelism, resolve_inputs, run_batch
+from src.trading.price_store import PriceStore
+
+def square(x, offset=0):
+    if x < 0:
+        raise ValueError("negative")
+    return x * x + offset
+
+def test_run_batch_collects_errors():
+    for workers in (1, 2):
+        summary = run_batch(square, [1, -1, 3, 4], workers=workers, chunksize=2, offset=1)
+        assert summary["success"] == {1: 2, 3: 10, 4: 17}
+        assert summary["failed"] == {-1: "ValueError: negative"}
+        assert set(summary["seconds"]) == {1, -1, 3, 4}
+
+def test_in_process_batch_skips_initializer(monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "8")
+    summary = run_batch(square, [2], workers=1, initializer=limit_threads, initargs=(1,))
+    # 워커 프로세스용 설정이 호출한 프로세스에 남지 않음
+    assert summary["success"] == {2: 4} and os.environ["OMP_NUM_THREADS"] == "8"
+
+def test_resolve_inputs(tmp_path):
+    raw = tmp_path / "store" / "raw"
+    for tic in ("000660", "005930"):
+        (raw / f"ticker={tic}").mkdir(parents=True)
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    for name in ("b.csv", "a.csv", "notes.txt"):
+        (csv_dir / name).write_text("")
+
+    assert resolve_inputs([str(raw)]) == ["000660", "005930"]
+    assert resolve_inputs([str(csv_dir)]) == [str(csv_dir / "a.csv"), str(csv_dir / "b.csv")]
+    assert resolve_inputs([str(raw / "ticker=0059*")]) == ["005930"]
+    assert resolve_inputs(["005930,035720", "005930"]) == ["005930", "035720"]
+
+def test_is_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame({"Close": np.arange(5.0)}, index=pd.bdate_range("2024-01-01", periods=5))
+    PriceStore(dataset="raw").write("005930", df)
+    assert not is_up_to_date("005930")
+    PriceStore(dataset="processed").write("005930", df)
+    assert is_up_to_date("005930")
+
+    # raw가 나중에 바뀌면 다시 처리 대상
+    later = time.time() + 10
+    path = PriceStore(dataset="raw")._partition_path("005930", 2024)
+    os.utime(path, (later, later))
+    assert not is_up_to_date("005930")
+
+def test_plan_parallelism():
+    # 작업이 코어보다 많으면 프로세스로, 적으면 남는 코어를 모델 스레드로
+    assert plan_parallelism(100, cores=8) == (8, 1)
+    assert plan_parallelism(2, cores=8) == (2, 4)
+    assert plan_parallelism(100, threads=4, cores=8) == (2, 4)
+    assert plan_parallelism(100, workers=3, cores=8) == (3, 2)
+    assert plan_parallelism(1, workers=4, cores=8) == (1, 8)
+    for n in (1, 3, 7, 50):
+        workers, threads = plan_parallelism(n, cores=6)
+        assert workers * threads <= 6
@@ -0,0 +1,65 @@
+# tests/compact_test.py
+import numpy as np
+import pandas as pd
+from src.trading.compact import compact_frame, smallest_int_dtype
+from src.trading.feature_engine import add_indicators_long
+from src.trading.feature_engineering import basic_preprocessing, calculate_technical_indicators
+from src.trading.price_store import PriceStore
+
+def make_raw(n=300, seed=0, name="삼성전자"):
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        "Name": name,
+        "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Volume": rng.integers(0, 3_000_000, n),
+        "Adj Close": close,
+    }, index=pd.bdate_range("2022-01-03", periods=n, name="Date"))
+
+def test_smallest_int_dtype():
+    assert smallest_int_dtype([0, 100]) == np.int8
+    assert smallest_int_dtype([-129, 0]) == np.int16
+    assert smallest_int_dtype([0, 3_000_000]) == np.int32
+    assert smallest_int_dtype([0, 2**40]) == np.int64
+
+def test_compact_frame_in_place():
+    df = make_raw()
+    out = compact_frame(df)
+    assert out is df
+    assert df["Close"].dtype == np.float32
+    assert df["Volume"].dtype == np.int32
+    assert isinstance(df["Name"].dtype, pd.CategoricalDtype)
+
+def test_compact_frame_nullable_int():
+    df = pd.DataFrame({"Volume": pd.array([1, None, 300], dtype="Int64")})
+    compact_frame(df)
+    assert str(df["Volume"].dtype) == "Int16" and df["Volume"].isna().tolist() == [False, True, False]
+
+def test_store_read_compact(tmp_path):
+    store = PriceStore(str(tmp_path), "raw")
+    store.write("005930", make_raw(seed=1))
+    store.write("000660", make_raw(seed=2, name="SK하이닉스"))
+    full = store.read()
+    df = store.read(compact=True)
+    assert df["Close"].dtype == np.float32 and df["Volume"].dtype == np.int32
+    assert list(df["Ticker"].cat.categories) == ["000660", "005930"]
+    assert isinstance(df["Name"].dtype, pd.CategoricalDtype)
+    assert (df["Ticker"].astype(str) == full["Ticker"]).all()
+    np.testing.assert_array_equal(df["Close"].to_numpy(), full["Close"].to_numpy(dtype=np.float32))
+    assert df.memory_usage(deep=True).sum() < full.memory_usage(deep=True).sum() / 2
+
+def test_compact_pipeline_close_to_float64():
+    raw = make_raw()
+    exact = calculate_technical_indicators(basic_preprocessing(raw.copy()))
+    compact = calculate_technical_indicators(basic_preprocessing(compact_frame(raw.copy())))
+    assert compact.index.equals(exact.index)
+    # float32 가격의 반올림 오차(가격 대비 ~1e-7) 수준만 차이
+    for col, scale in [("LogReturn", 1.0), ("MA20", raw["Close"].mean()), ("RSI14", 100.0),
+                       ("MACD_signal", raw["Close"].mean()), ("BB_High", raw["Close"].mean())]:
+        assert compact[col].dtype == np.float32
+        np.testing.assert_allclose(compact[col], exact[col], rtol=1e-5, atol=1e-6 * scale)
+
+    long = pd.concat([make_raw(seed=3).assign(Ticker="A"), make_raw(seed=4).assign(Ticker="B")])
+    long = compact_frame(long.reset_index())
+    out = add_indicators_long(long)
+    assert out["MA20"].dtype == np.float32 and isinstance(out["Ticker"].dtype, pd.CategoricalDtype)
@@ -2,11 +2,29 @@ import pytest
 import pandas as pd
 from src.trading.data_loader import download_stock_data
 
-def test_download_stock_data_valid():
+@pytest.fixture
+def offline_cache(tmp_path):
+    from src.trading.response_cache import ResponseCache, set_cache
+    cache = ResponseCache(str(tmp_path), mode="offline")
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+def record(cache, ticker, frame):
+    """ yfinance.download 응답을 녹화해 둔 것처럼 캐시에 저장 (네트워크 없이 재생) """
+    cache.put(cache.make_key("yfinance", "download", ticker, "2022-01-01", "2022-01-10"), frame)
+
+def test_download_stock_data_valid(offline_cache):
+    recorded = pd.DataFrame({"Close": [78600.0, 78700.0]},
+                            index=pd.to_datetime(["2022-01-03", "2022-01-04"]))
+    record(offline_cache, "005930.KS", recorded)
     df = download_stock_data("005930.KS", "2022-01-01", "2022-01-10")
     assert isinstance(df, pd.DataFrame)
     assert "Close" in df.columns
+    pd.testing.assert_frame_equal(df, recorded)
 
-def test_download_stock_data_invalid():
+def test_download_stock_data_invalid(offline_cache):
+    # 없는 티커는 yfinance가 빈 DataFrame을 돌려줌
+    record(offline_cache, "INVALID", pd.DataFrame(columns=["Close"]))
     with pytest.raises(ValueError):
-        _ = download_stock_data("INVALID", "2022-01-01", "2022-01-10")
\ No newline at end of file
+        _ = download_stock_data("INVALID", "2022-01-01", "2022-01-10")
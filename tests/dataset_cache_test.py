@@ -0,0 +1,43 @@
+# tests/dataset_cache_test.py
+import numpy as np
+import xgboost as xgb
+from src.trading.model.dataset_cache import DatasetCache
+from src.trading.model.ml_models import build_model
+
+def make_data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+def train_predict(model_type, cache, X, y, params=None):
+    model = build_model(model_type, n_jobs=1, params=params, dataset_cache=cache)
+    model.fit(X[:1500], y[:1500])
+    # 라벨 대신 확률을 비교 (반올림 전 값까지 같아야 함)
+    X_test = X[1500:] if model_type == "lgb" else xgb.DMatrix(X[1500:])
+    return model.model.predict(X_test)
+
+def test_lgb_binary_reused_across_instances(tmp_path):
+    X, y = make_data()
+    expected = train_predict("lgb", None, X, y)
+    first = DatasetCache(str(tmp_path))
+    np.testing.assert_array_equal(train_predict("lgb", first, X, y), expected)
+    assert first.stats == {"memory": 0, "disk": 0, "built": 2}  # 학습 + 검증 세트
+
+    # 새 프로세스와 같은 상황: 파일에서 읽고 binning 생략
+    second = DatasetCache(str(tmp_path))
+    np.testing.assert_array_equal(train_predict("lgb", second, X, y), expected)
+    assert second.stats == {"memory": 0, "disk": 2, "built": 0}
+    # binning과 무관한 파라미터는 같은 데이터셋, max_bin이 바뀌면 새로 구성
+    train_predict("lgb", second, X, y, params={"learning_rate": 0.3})
+    assert second.stats["memory"] == 2 and second.stats["built"] == 0
+    train_predict("lgb", second, X, y, params={"max_bin": 63})
+    assert second.stats["built"] == 2
+
+def test_xgb_quantile_matrix_reused_in_process(tmp_path):
+    X, y = make_data()
+    expected = train_predict("xgb", None, X, y)
+    cache = DatasetCache(str(tmp_path))
+    for _ in range(2):
+        np.testing.assert_array_equal(train_predict("xgb", cache, X, y), expected)
+    assert cache.stats == {"memory": 2, "disk": 0, "built": 2}
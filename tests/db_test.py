@@ -0,0 +1,150 @@
+# tests/db_test.py
+import datetime
+import psycopg2
+import pytest
+from src.trading import db
+from src.trading.db import BulkLoadError, PriceBulkLoader, records_to_copy_buffer
+from src.trading.pipeline import Checkpoint, run_pipeline
+
+class FakeDatabase:
+    """ krx_daily_price 하나만 흉내 내는 DB. fail_merges: 앞으로 실패시킬 병합(INSERT) 횟수 """
+    def __init__(self, fail_merges=0):
+        self.committed = {}
+        self.fail_merges = fail_merges
+        self.merges = 0
+        self.merged_rows = []
+        self.commits = 0
+        self.rollbacks = 0
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if sql.lstrip().startswith("TRUNCATE"):
+            self.conn.staging = []
+        elif "INSERT INTO" in sql:
+            database = self.conn.database
+            if database.fail_merges:
+                database.fail_merges -= 1
+                raise psycopg2.OperationalError("server closed the connection unexpectedly")
+            database.merges += 1
+            database.merged_rows.append(len(self.conn.staging))
+            for row in self.conn.staging:
+                self.conn.pending[(row[0], row[1])] = row
+
+    def copy_expert(self, sql, buf):
+        self.conn.staging.extend(line.split("\t") for line in buf.read().splitlines())
+
+class FakeConnection:
+    closed = 0
+
+    def __init__(self, database):
+        self.database = database
+        self.staging = []
+        self.pending = {}
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.database.committed.update(self.pending)
+        self.database.commits += 1
+        self.pending = {}
+
+    def rollback(self):
+        self.database.rollbacks += 1
+        self.pending = {}
+
+class FakePool:
+    def __init__(self, database):
+        self.database = database
+        self.returned = 0
+
+    def getconn(self):
+        return FakeConnection(self.database)
+
+    def putconn(self, conn, close=False):
+        self.returned += 1
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakePool(FakeDatabase())
+    monkeypatch.setattr(db, "get_pool", lambda conn_params, maxconn=8: fake)
+    return fake
+
+def rec(ticker, day, close=100.0):
+    return (ticker, datetime.date(2025, 1, day), close, close, close, close, None, 1000)
+
+def test_records_to_copy_buffer():
+    buf = records_to_copy_buffer([rec("005930", 2), ("000660", "2025-01-03", 1.5, None)])
+    assert buf.read() == ("005930\t2025-01-02\t100.0\t100.0\t100.0\t100.0\t\\N\t1000\n"
+                          "000660\t2025-01-03\t1.5\t\\N\n")
+
+def test_batches_and_commits(pool):
+    commits = []
+    loader = PriceBulkLoader({}, batch_size=2, commit_every=2, on_commit=lambda: commits.append(loader.rows_written))
+    loader.add([rec("005930", 2)])
+    assert pool.database.merges == 0
+    loader.add([rec("005930", 3)])
+    # 첫 배치는 병합만 하고 커밋은 두 번째 배치에서
+    assert pool.database.merges == 1 and pool.database.commits == 0 and loader.rows_written == 0
+    loader.add([rec("000660", 2), rec("000660", 3)])
+    assert pool.database.commits == 1 and loader.rows_written == 4 and commits == [4]
+    loader.add([rec("035420", 2)])
+    loader.close()
+    assert loader.rows_written == 5 and commits == [4, 5]
+    assert len(pool.database.committed) == 5 and pool.returned == 1
+
+def test_duplicate_keys_in_batch_merge_once(pool):
+    with PriceBulkLoader({}, batch_size=10) as loader:
+        loader.add([rec("005930", 2, 100.0), rec("005930", 2, 101.0)])
+    assert list(pool.database.committed) == [("005930", "2025-01-02")]
+
+def test_failed_merge_retried_without_duplicates(pool):
+    loader = PriceBulkLoader({}, batch_size=2, commit_every=2, retry_delay=0)
+    loader.add([rec("005930", 2), rec("005930", 3)], key="005930")
+    pool.database.fail_merges = 1
+    loader.add([rec("000660", 2), rec("000660", 3)], key="000660")
+    # 롤백된 첫 배치까지 한 번에 다시 병합 (레코드가 버퍼에 두 번 들어가지 않음)
+    assert pool.database.merged_rows == [2, 4] and pool.database.rollbacks == 1
+    assert loader._buffer == [] and len(loader._uncommitted) == 4
+    loader.close()
+    assert loader.rows_written == 4 and len(pool.database.committed) == 4
+
+def test_failed_batch_dropped_and_keys_reported(pool):
+    loader = PriceBulkLoader({}, batch_size=4, retries=1, retry_delay=0)
+    loader.add([rec("005930", 2), rec("005930", 3)], key="005930")
+    pool.database.fail_merges = 2
+    with pytest.raises(BulkLoadError) as error:
+        loader.add([rec("000660", 2), rec("000660", 3)], key="000660")
+    assert error.value.keys == ["005930", "000660"]
+    # 버린 배치는 이후 커밋에 섞이지 않음
+    loader.add([rec("035420", 2)], key="035420")
+    loader.close()
+    assert loader.rows_written == 1 and list(pool.database.committed) == [("035420", "2025-01-02")]
+
+def test_pipeline_attributes_dropped_batch(pool, tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "ckpt.json"), {})
+    loader = PriceBulkLoader({}, batch_size=4, retries=0, on_commit=checkpoint.commit)
+    records = {"005930": [rec("005930", 2), rec("005930", 3)], "000660": [rec("000660", 2), rec("000660", 3)],
+               "035420": [rec("035420", 2)]}
+
+    def write(key, recs):
+        if key == "000660":
+            pool.database.fail_merges = 1
+        loader.add(recs, key=key)
+
+    summary = run_pipeline(list(records), records.get, lambda key, raw: raw, write, workers=1, rate=1000,
+                           retries=0, write_retries=0, on_done=checkpoint.stage, on_failed=checkpoint.discard)
+    loader.close()
+    # 005930은 먼저 성공으로 집계됐지만 같은 배치로 버려졌으므로 실패
+    assert summary["success"] == {"035420": 1} and set(summary["failed"]) == {"005930", "000660"}
+    assert list(pool.database.committed) == [("035420", "2025-01-02")]
+    assert checkpoint.completed == {"035420"}
@@ -0,0 +1,66 @@
+# tests/feature_cache_test.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import feature_cache
+from src.trading.feature_cache import FeatureCache
+from src.trading.feature_engineering import basic_preprocessing, calculate_technical_indicators
+
+@pytest.fixture
+def raw_df():
+    rng = np.random.default_rng(0)
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+    return pd.DataFrame({
+        "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Adj Close": close, "Volume": rng.integers(1000, 10000, 400),
+    }, index=pd.bdate_range("2022-01-03", periods=400, name="Date"))
+
+def expected(raw):
+    return calculate_technical_indicators(basic_preprocessing(raw.copy()))
+
+def test_hit_returns_same_features(tmp_path, raw_df):
+    cache = FeatureCache(str(tmp_path))
+    first = cache.features(raw_df, name="005930")
+    first["MA20"] = 0.0  # 반환값을 수정해도 캐시에는 영향 없음
+    second = cache.features(raw_df, name="005930")
+    assert cache.stats == {"hit": 1, "tail": 0, "miss": 1}
+    pd.testing.assert_frame_equal(second, expected(raw_df))
+
+def test_appended_bars_recompute_tail_only(tmp_path, raw_df):
+    cache = FeatureCache(str(tmp_path))
+    cache.features(raw_df.iloc[:380], name="005930")
+    got = cache.features(raw_df, name="005930")
+    assert cache.stats["tail"] == 1
+    pd.testing.assert_frame_equal(got, expected(raw_df), check_exact=True, check_freq=False)
+
+    # 과거 구간이 바뀌면(수정주가 등) 전체 재계산
+    revised = raw_df.copy()
+    revised.iloc[:10, revised.columns.get_loc("Adj Close")] *= 0.5
+    got = cache.features(revised, name="005930")
+    assert cache.stats["miss"] == 2
+    pd.testing.assert_frame_equal(got, expected(revised))
+
+def test_state_only_built_when_tail_applies(tmp_path, raw_df, monkeypatch):
+    def from_history(*args, **kwargs):
+        raise AssertionError("IndicatorState built for a configuration that cannot extend")
+
+    monkeypatch.setattr(feature_cache.IndicatorState, "from_history", from_history)
+    cache = FeatureCache(str(tmp_path), backend="numpy")
+    cache.features(raw_df.iloc[:380], name="005930")
+    got = cache.features(raw_df, name="005930")
+    # numpy backend는 꼬리 재계산 대상이 아니므로 전체 재계산
+    assert cache.stats == {"hit": 0, "tail": 0, "miss": 2}
+    pd.testing.assert_frame_equal(got, calculate_technical_indicators(basic_preprocessing(raw_df.copy()), backend="numpy"))
+
+def test_size_bound_evicts(tmp_path, raw_df):
+    cache = FeatureCache(str(tmp_path), max_bytes=150_000)
+    for n in (300, 320, 340, 360):
+        cache.features(raw_df.iloc[:n])
+    assert cache.store.total_bytes() <= 150_000
+
+def test_ta_version_change_misses(tmp_path, raw_df, monkeypatch):
+    FeatureCache(str(tmp_path)).features(raw_df)
+    monkeypatch.setattr(feature_cache, "_package_version", lambda name: "0.0.0-other")
+    cache = FeatureCache(str(tmp_path))
+    cache.features(raw_df)
+    assert cache.stats == {"hit": 0, "tail": 0, "miss": 1}
@@ -0,0 +1,46 @@
+# tests/feature_engine_test.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading.feature_engine import INDICATOR_COLUMNS, add_indicators_long, wide_indicators
+from src.trading.feature_engineering import calculate_technical_indicators
+
+@pytest.fixture
+def ragged_long():
+    # 티커마다 상장일·이력 길이가 다르고, 중간중간 빠진 영업일이 있는 long-format 시세
+    rng = np.random.default_rng(0)
+    calendar = pd.bdate_range("2020-01-01", periods=400)
+    frames = []
+    for i, (offset, n) in enumerate([(0, 400), (50, 200), (120, 61), (10, 30), (0, 150)]):
+        dates = calendar[offset:offset + n]
+        dates = dates[rng.random(len(dates)) > 0.05]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        if i == 4:
+            close[:40] = 100.0  # 가격 변동이 없는 구간 (RSI 분모 0)
+        frames.append(pd.DataFrame({"Ticker": f"{i:06d}", "Date": dates, "Close": close,
+                                    "Volume": rng.integers(1000, 10000, len(dates))}))
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+def per_ticker(long_df):
+    frames = [
+        calculate_technical_indicators(g.sort_values("Date").set_index("Date").copy()).reset_index()
+        for _, g in long_df.groupby("Ticker")
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def test_long_matches_per_ticker(ragged_long):
+    out = add_indicators_long(ragged_long)
+    expected = per_ticker(ragged_long)[out.columns]
+    # 30봉짜리 티커는 MA60이 없어 모두 제거됨
+    assert "000003" not in set(out["Ticker"])
+    pd.testing.assert_frame_equal(out, expected, check_exact=True, check_dtype=False)
+
+def test_wide_matches_per_ticker(ragged_long):
+    close = ragged_long.pivot(index="Date", columns="Ticker", values="Close")
+    result = wide_indicators(close)
+    expected = per_ticker(ragged_long).set_index(["Date", "Ticker"])
+    for name in INDICATOR_COLUMNS:
+        got = result[name].stack().rename(name)
+        assert got.index.isin(close.stack().index).all()  # 빠진 날짜는 NaN 그대로
+        merged = expected[[name]].join(got, rsuffix="_wide", how="left")
+        np.testing.assert_array_equal(merged[name].to_numpy(), merged[name + "_wide"].to_numpy())
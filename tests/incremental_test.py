@@ -0,0 +1,45 @@
+# tests/incremental_test.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading.feature_engineering import calculate_technical_indicators
+from src.trading.incremental import INDICATOR_COLUMNS, IndicatorState, RollingMean, RollingStd
+
+@pytest.fixture(params=["random_walk", "tick_prices", "flat_runs"])
+def closes(request):
+    rng = np.random.default_rng(0)
+    if request.param == "random_walk":
+        return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    if request.param == "tick_prices":
+        return np.round(50000 * np.exp(np.cumsum(rng.normal(0, 0.01, 300))), -1)
+    # 같은 가격이 이어지는 구간 (거래정지 등)
+    return np.repeat(rng.integers(100, 105, 30).astype(float), 10)
+
+def test_matches_batch(closes):
+    expected = calculate_technical_indicators(pd.DataFrame({"Close": closes}))
+    state = IndicatorState()
+    got = pd.DataFrame([state.update(c) for c in closes]).loc[expected.index]
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_array_equal(got[col].to_numpy(), expected[col].to_numpy())
+
+def test_save_load_resume(tmp_path, closes):
+    full = IndicatorState()
+    expected = [full.update(c) for c in closes]
+
+    state = IndicatorState.from_history(closes[:150], last_date="2024-06-28")
+    path = str(tmp_path / "state.json")
+    state.save(path)
+    restored = IndicatorState.load(path)
+    assert restored.last_date == "2024-06-28"
+    assert restored.peek(closes[150]) == expected[150]  # peek은 상태를 바꾸지 않음
+    got = [restored.update(c) for c in closes[150:]]
+    np.testing.assert_array_equal(pd.DataFrame(got).to_numpy(), pd.DataFrame(expected[150:]).to_numpy())
+
+def test_rolling_with_negative_values():
+    values = np.random.default_rng(1).normal(0, 1, 200)
+    mean, std = RollingMean(7), RollingStd(7, ddof=0)
+    got_mean = [mean.update(v) for v in values]
+    got_std = [std.update(v) for v in values]
+    s = pd.Series(values)
+    np.testing.assert_array_equal(got_mean, s.rolling(7).mean().to_numpy())
+    np.testing.assert_array_equal(got_std, s.rolling(7).std(ddof=0).to_numpy())
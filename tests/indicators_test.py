@@ -0,0 +1,58 @@
+# tests/indicators_test.py
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+from src.trading.indicators import DEFAULT_INDICATORS, IndicatorRegistry, model_features
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(0)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300))), name="Close")
+
+def test_default_matches_ta(close):
+    out = IndicatorRegistry(DEFAULT_INDICATORS).compute(pd.DataFrame({"Close": close}))
+    macd = ta.trend.MACD(close=close, window_slow=26, window_fast=12, window_sign=9)
+    bb = ta.volatility.BollingerBands(close=close, window=20, window_dev=2)
+    expected = {
+        "MA20": ta.trend.sma_indicator(close=close, window=20),
+        "MA60": ta.trend.sma_indicator(close=close, window=60),
+        "RSI14": ta.momentum.rsi(close=close, window=14),
+        "MACD": macd.macd(),
+        "MACD_signal": macd.macd_signal(),
+        "BB_High": bb.bollinger_hband(),
+        "BB_Low": bb.bollinger_lband(),
+    }
+    for name, series in expected.items():
+        np.testing.assert_array_equal(out[name].to_numpy(), series.to_numpy())
+
+def test_shared_intermediates_computed_once():
+    registry = IndicatorRegistry(DEFAULT_INDICATORS)
+    kinds = [node[0] for node in registry.plan()]
+    # MA20/BB 공용 20일 평균 + MA60, MACD/MACD_signal 공용 EMA12·EMA26 + 시그널 EMA
+    assert kinds.count("rolling_mean") == 2
+    assert kinds.count("rolling_std") == 1
+    assert kinds.count("ema_span") == 3
+
+    # 요청한 컬럼에 필요한 노드만 계산
+    kinds = [node[0] for node in registry.plan(["MACD_signal"])]
+    assert sorted(kinds) == ["ema_span", "ema_span", "ema_span", "input", "sub"]
+
+def test_custom_spec(close):
+    registry = IndicatorRegistry({
+        "EMA12": {"op": "ema", "span": 12},
+        "MACD_diff": {"op": "macd_diff"},
+        "VOL_MA5": {"op": "sma", "input": "Volume", "window": 5},
+    })
+    df = pd.DataFrame({"Close": close, "Volume": np.arange(len(close), dtype=float)})
+    out = registry.compute(df, ["EMA12", "MACD_diff", "VOL_MA5", "Unknown"])
+    assert list(out) == ["EMA12", "MACD_diff", "VOL_MA5"]
+    np.testing.assert_array_equal(out["MACD_diff"].to_numpy(), ta.trend.macd_diff(close).to_numpy())
+    assert out["VOL_MA5"].iloc[-1] == len(close) - 3
+    assert sum(node[0] == "ema_span" for node in registry.plan()) == 3  # EMA12는 MACD와 공유
+
+    with pytest.raises(ValueError):
+        IndicatorRegistry({"X": {"op": "nope"}})
+
+def test_model_features_from_config():
+    assert model_features() == ["MA20", "MA60", "RSI14", "MACD_signal", "Volume"]
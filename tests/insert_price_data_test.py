@@ -0,0 +1,103 @@
+# tests/insert_price_data_test.py
+import datetime
+from contextlib import contextmanager
+import pandas as pd
+import pytest
+from scripts.insert_price_data import last_trading_day, ohlcv_to_records, plan_incremental, snapshot_to_records
+from src.trading import db
+from src.trading.db import fetch_watermarks
+from src.trading.response_cache import ResponseCache, set_cache
+
+@pytest.fixture
+def offline_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path), mode="offline")
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+class WatermarkCursor:
+    """ GROUP BY 조회에 rows로 답하는 커서 """
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        self.statements.append(query)
+
+    def fetchall(self):
+        return self.rows
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+def test_fetch_watermarks(monkeypatch):
+    cursor = WatermarkCursor([("005930", datetime.date(2025, 1, 3)), ("000660", datetime.date(2025, 1, 2))])
+
+    @contextmanager
+    def pooled_connection(conn_params):
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(db, "pooled_connection", pooled_connection)
+    assert fetch_watermarks({}) == {"005930": datetime.date(2025, 1, 3), "000660": datetime.date(2025, 1, 2)}
+    assert cursor.statements == ["SELECT ticker, max(price_date) FROM krx_daily_price GROUP BY ticker;"]
+
+def test_plan_incremental():
+    watermarks = {"005930": datetime.date(2025, 1, 10), "000660": datetime.date(2025, 1, 9),
+                  "035420": datetime.date(2024, 6, 28)}
+    plan = plan_incremental(["005930", "000660", "035420", "373220"], watermarks, "20250101", "20250110")
+    # 이미 end까지 적재: 제외 / 하루 늦음: 다음 날부터 / 워터마크가 start 이전·없음: start부터
+    assert plan == {"000660": "20250110", "035420": "20250101", "373220": "20250101"}
+
+def test_weekend_end_falls_back_to_last_trading_day(offline_cache):
+    # 2025-01-11(토) → 직전 영업일 2025-01-10(금)
+    offline_cache.put(offline_cache.make_key("pykrx", "get_nearest_business_day_in_a_week",
+                                             start="20250111", end="20250111"), "20250110")
+    end = last_trading_day("20250111")
+    assert end == "20250110"
+    watermarks = {"005930": datetime.date(2025, 1, 10), "000660": datetime.date(2025, 1, 9)}
+    # 금요일까지 적재한 티커는 주말 end에서도 다시 조회하지 않음
+    assert plan_incremental(["005930", "000660"], watermarks, "20250101", end) == {"000660": "20250110"}
+
+def test_last_trading_day_lookup_failure(offline_cache, capsys):
+    # 조회 실패(여기서는 offline 캐시 미스)면 종료일을 그대로 사용
+    assert last_trading_day("20250111") == "20250111"
+    assert "[WARN]" in capsys.readouterr().out
+
+def snapshot_frame():
+    """ stock.get_market_ohlcv(date, market="ALL") 모양: 티커 인덱스, 한글 컬럼 """
+    return pd.DataFrame({"시가": [70000, 120000, 200000], "고가": [71000, 125000, 201000],
+                         "저가": [69500, 119000, 198000], "종가": [70500, 124000, 199000],
+                         "거래량": [15_000_000, 3_000_000, 500_000],
+                         "거래대금": [1.0e12, 3.7e11, 1.0e11], "등락률": [0.7, 3.3, -0.5]},
+                        index=pd.Index(["005930", "000660", "035420"], name="티커"))
+
+def test_snapshot_to_records():
+    records = snapshot_to_records("20250103", snapshot_frame(), tickers={"005930", "035420", "999999"})
+    # krx_tickers에 없는 000660은 제외, 레코드 순서는 조회 결과 순서
+    assert records == [("005930", "2025-01-03", 70000.0, 71000.0, 69500.0, 70500.0, 70500.0, 15_000_000),
+                       ("035420", "2025-01-03", 200000.0, 201000.0, 198000.0, 199000.0, 199000.0, 500_000)]
+    assert len(snapshot_to_records("20250103", snapshot_frame())) == 3
+    assert snapshot_to_records("20250103", snapshot_frame().iloc[:0]) == []
+
+def test_snapshot_matches_per_ticker_path():
+    snapshot = snapshot_frame()
+    for ticker in snapshot.index:
+        # stock.get_market_ohlcv_by_date(start, end, ticker) 모양: 날짜 인덱스
+        by_date = snapshot.loc[[ticker], ["시가", "고가", "저가", "종가", "거래량", "등락률"]]
+        by_date.index = pd.DatetimeIndex(["2025-01-03"], name="날짜")
+        # adj_close(종가)·volume(int)까지 날짜별 전 종목 경로와 같은 레코드
+        assert ohlcv_to_records(ticker, by_date) == snapshot_to_records("20250103", snapshot, tickers=[ticker])
+    assert all(isinstance(rec[7], int) for rec in snapshot_to_records("20250103", snapshot))
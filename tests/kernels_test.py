@@ -0,0 +1,94 @@
+# tests/kernels_test.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import kernels
+from src.trading.feature_engine import wide_indicators
+from src.trading.feature_engineering import calculate_technical_indicators
+from src.trading.indicators import DEFAULT_INDICATORS, IndicatorRegistry
+
+# 누적합 방식이라 비트 단위로 같지는 않음: 상대 오차 1e-9, 가격 수준 대비 절대 오차 1e-8까지 허용
+RTOL, ATOL = 1e-9, 1e-8
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(0)
+    return pd.Series(50000 * np.exp(np.cumsum(rng.normal(0, 0.02, 3000))), name="Close")
+
+def assert_close(actual, expected, scale=1.0):
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=ATOL * scale, equal_nan=True)
+
+@pytest.mark.parametrize("window", [1, 2, 20, 60])
+def test_rolling_kernels_match_pandas(close, window):
+    x = close.to_numpy().copy()
+    x[:5] = np.nan
+    x[700:710] = np.nan  # 거래정지 구간: 창 안에 NaN이 있으면 NaN
+    s = pd.Series(x)
+    assert_close(kernels.rolling_mean(x, window), s.rolling(window, min_periods=window).mean())
+    assert_close(kernels.rolling_std(x, window), s.rolling(window, min_periods=window).std(ddof=0), scale=close.mean())
+    assert_close(kernels.rolling_std(x, window, ddof=1), s.rolling(window, min_periods=window).std(ddof=1),
+                 scale=close.mean())
+
+def test_long_series_block_boundaries():
+    # 누적합 블록 경계(BLOCK)를 여러 번 넘는 시계열에서도 오차가 쌓이지 않음
+    rng = np.random.default_rng(1)
+    x = 10000 * np.exp(np.cumsum(rng.normal(0, 0.002, 5 * kernels.BLOCK + 17)))
+    s = pd.Series(x)
+    assert_close(kernels.rolling_mean(x, 60), s.rolling(60, min_periods=60).mean())
+    assert_close(kernels.rolling_std(x, 20), s.rolling(20, min_periods=20).std(ddof=0), scale=x.mean())
+
+def test_ewm_kernels_match_pandas(close):
+    x = close.to_numpy().copy()
+    x[:30] = np.nan  # MACD 시그널처럼 앞쪽 NaN은 건너뛰고 시작
+    s = pd.Series(x)
+    assert_close(kernels.ema(x, 12), s.ewm(span=12, min_periods=12, adjust=False).mean())
+    assert_close(kernels.wilder(x, 14), s.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean())
+    assert np.isnan(kernels.ema(np.full(5, np.nan), 3)).all()
+
+def test_kernels_2d_columns_independent(close):
+    values = np.column_stack([close.to_numpy(), close.to_numpy()[::-1], close.to_numpy() / 7])
+    values[:400, 1] = np.nan  # 늦게 상장한 종목
+    frame = pd.DataFrame(values)
+    assert_close(kernels.rolling_mean(values, 20), frame.rolling(20, min_periods=20).mean())
+    assert_close(kernels.rolling_std(values, 20), frame.rolling(20, min_periods=20).std(ddof=0), scale=close.mean())
+    assert_close(kernels.ema(values, 26), frame.ewm(span=26, min_periods=26, adjust=False).mean())
+
+@pytest.mark.parametrize("backend", ["numpy", "ta"])
+def test_backends_match_pandas(close, backend):
+    registry = IndicatorRegistry(DEFAULT_INDICATORS)
+    df = pd.DataFrame({"Close": close})
+    expected = registry.compute(df)
+    out = registry.compute(df, backend=backend)
+    assert list(out) == list(expected)
+    for name in expected:
+        assert out[name].index.equals(expected[name].index)
+        assert_close(out[name], expected[name], scale=close.mean())
+
+def test_backend_selection(close):
+    registry = IndicatorRegistry(DEFAULT_INDICATORS)
+    df = pd.DataFrame({"Close": close, "Volume": 1.0})
+    fast = calculate_technical_indicators(df.copy(), registry=registry, backend="numpy")
+    exact = calculate_technical_indicators(df.copy(), registry=registry)
+    assert fast.index.equals(exact.index)
+    assert_close(fast[registry.columns], exact[registry.columns], scale=close.mean())
+
+    wide = pd.DataFrame({"A": close, "B": close.shift(100)})
+    fast = wide_indicators(wide, registry=registry, backend="numpy")
+    for name, frame in wide_indicators(wide, registry=registry).items():
+        assert_close(fast[name], frame, scale=close.mean())
+
+    with pytest.raises(ValueError):
+        registry.compute(df, backend="nope")
+    with pytest.raises(ValueError):
+        IndicatorRegistry({"STD20": {"op": "rolling_std", "window": 20}}).compute(df, backend="ta")
+
+@pytest.mark.parametrize("backend", ["pandas", "numpy", "ta"])
+def test_empty_input(backend):
+    registry = IndicatorRegistry(DEFAULT_INDICATORS)
+    df = pd.DataFrame({"Close": pd.Series(dtype=float), "Volume": pd.Series(dtype=float)},
+                      index=pd.DatetimeIndex([], name="Date"))
+    out = calculate_technical_indicators(df, registry=registry, backend=backend)
+    assert out.shape == (0, 2 + len(registry.columns))
+    assert list(out.columns) == ["Close", "Volume", *registry.columns]
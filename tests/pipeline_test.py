@@ -0,0 +1,32 @@
+# tests/pipeline_test.py
+from src.trading.pipeline import Checkpoint, run_pipeline
+
+def test_run_pipeline_collects_results_and_errors():
+    written = []
+
+    def fetch(key):
+        if key == "bad":
+            raise RuntimeError("fetch failed")
+        return list(range(int(key)))
+
+    def convert(key, raw):
+        return [(key, v) for v in raw]
+
+    summary = run_pipeline(["3", "0", "bad", "5"], fetch, convert, lambda key, recs: written.extend(recs),
+                           workers=2, rate=1000, retries=0, queue_size=1)
+    assert summary["success"] == {"3": 3, "5": 5}
+    assert summary["empty"] == ["0"]
+    assert "bad" in summary["failed"]
+    assert len(written) == 8
+
+def test_checkpoint_commit_and_resume(tmp_path):
+    path = str(tmp_path / "ckpt.json")
+    ckpt = Checkpoint(path, {"start": "20250101"})
+    ckpt.stage("005930")
+    assert not Checkpoint(path, {"start": "20250101"}).is_done("005930")
+    ckpt.commit()
+
+    resumed = Checkpoint(path, {"start": "20250101"})
+    assert resumed.is_done("005930")
+    # 실행 조건이 다르면 이전 기록을 사용하지 않음
+    assert not Checkpoint(path, {"start": "20240101"}).is_done("005930")
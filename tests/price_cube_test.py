@@ -0,0 +1,124 @@
+# tests/price_cube_test.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import price_cube
+from src.trading.price_cube import FIELDS, PriceCube, append_days, build_cube
+
+class FakeTable:
+    """ krx_daily_price 대신 쓰는 메모리 테이블 (copy_query_chunks / _distinct 대체) """
+    def __init__(self):
+        self.rows = pd.DataFrame(columns=["ticker", "price_date", *FIELDS])
+
+    def insert(self, ticker, dates, base):
+        new = pd.DataFrame({"ticker": ticker, "price_date": dates})
+        for i, name in enumerate(FIELDS):
+            new[name] = base + i + np.arange(len(dates), dtype=float)
+        self.rows = pd.concat([self.rows, new], ignore_index=True) if len(self.rows) else new
+
+    def distinct(self, conn_params, column, start=None):
+        rows = self.rows
+        if start is not None:
+            rows = rows[pd.to_datetime(rows["price_date"]) > pd.Timestamp(start)]
+        return sorted(set(rows[column]))
+
+    def chunks(self, conn_params, sql, params=None, chunksize=1_000_000, dtype=None, parse_dates=None):
+        rows = self.rows
+        if params:
+            rows = rows[pd.to_datetime(rows["price_date"]) >= pd.Timestamp(params[0])]
+        # COPY CSV처럼 날짜는 문자열로
+        for lo in range(0, len(rows), chunksize):
+            yield rows.iloc[lo:lo + chunksize]
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeTable()
+    monkeypatch.setattr(price_cube, "_distinct", fake.distinct)
+    monkeypatch.setattr(price_cube, "copy_query_chunks", fake.chunks)
+    return fake
+
+def days(start, n):
+    return [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, periods=n)]
+
+def values_files(path):
+    return sorted(f for f in os.listdir(path) if f.startswith("values_"))
+
+def test_build_round_trip(table, tmp_path):
+    table.insert("005930", days("2025-01-02", 3), 100.0)
+    table.insert("000660", days("2025-01-03", 2), 200.0)
+    cube = build_cube({}, str(tmp_path), headroom=2)
+    assert cube.shape == (2, 3, len(FIELDS)) and cube.tickers.tolist() == ["000660", "005930"]
+    assert values_files(tmp_path) == ["values_5.f32"]
+
+    reopened = PriceCube.open(str(tmp_path))
+    frame = reopened.ticker_frame("005930")
+    assert frame.index.strftime("%Y-%m-%d").tolist() == days("2025-01-02", 3)
+    assert frame["close_price"].tolist() == [103.0, 104.0, 105.0]
+    # 상장 전 날짜는 NaN
+    assert np.isnan(reopened.ticker_frame("000660", end="2025-01-02").to_numpy()).all()
+    assert reopened.ticker_frame("000660", start="2025-01-06")["open_price"].tolist() == [201.0]
+    snapshot = reopened.date_frame("2025-01-03")
+    assert snapshot["volume"].to_dict() == {"000660": 205.0, "005930": 106.0}
+    with pytest.raises(KeyError):
+        reopened.date_frame("2025-01-01")
+
+def test_append_within_headroom(table, tmp_path):
+    table.insert("005930", days("2025-01-02", 3), 100.0)
+    build_cube({}, str(tmp_path), headroom=2)
+    table.insert("005930", days("2025-01-07", 2), 110.0)
+    cube = append_days({}, str(tmp_path), headroom=2)
+    # 미리 잡아 둔 날짜 축에 제자리 기록 (파일을 다시 쓰지 않음)
+    assert values_files(tmp_path) == ["values_5.f32"]
+    assert cube.ticker_frame("005930")["open_price"].tolist() == [100.0, 101.0, 102.0, 110.0, 111.0]
+    assert append_days({}, str(tmp_path)).shape == cube.shape
+
+def test_append_grows_capacity(table, tmp_path):
+    table.insert("005930", days("2025-01-02", 3), 100.0)
+    build_cube({}, str(tmp_path), headroom=1)
+    table.insert("005930", days("2025-01-07", 4), 110.0)
+    cube = append_days({}, str(tmp_path), headroom=1)
+    # capacity 4 → max(4 * 2, 7 + 1) = 8, 이전 값 파일은 삭제
+    assert values_files(tmp_path) == ["values_8.f32"]
+    assert cube.ticker_frame("005930")["open_price"].tolist() == [100.0, 101.0, 102.0, 110.0, 111.0, 112.0, 113.0]
+
+def test_append_new_ticker(table, tmp_path):
+    table.insert("005930", days("2025-01-02", 2), 100.0)
+    build_cube({}, str(tmp_path), headroom=3)
+    table.insert("005930", days("2025-01-06", 1), 110.0)
+    table.insert("035420", days("2025-01-06", 1), 300.0)
+    cube = append_days({}, str(tmp_path), headroom=3)
+    # 신규 티커는 정렬 위치가 아니라 티커 축 끝에 붙음
+    assert cube.tickers.tolist() == ["005930", "035420"] and values_files(tmp_path) == ["values_5.f32"]
+    assert os.path.getsize(tmp_path / "values_5.f32") == 2 * 5 * len(FIELDS) * 4
+    new = cube.ticker_frame("035420")["close_price"].to_numpy()
+    assert np.isnan(new[:2]).all() and new[2] == 303.0
+    assert cube.date_frame("2025-01-06")["close_price"].tolist() == [113.0, 303.0]
+
+@pytest.mark.parametrize("headroom", [3, 0])
+def test_reader_opened_before_append(table, tmp_path, headroom):
+    table.insert("005930", days("2025-01-02", 2), 100.0)
+    build_cube({}, str(tmp_path), headroom=headroom)
+    reader = PriceCube.open(str(tmp_path))
+    table.insert("005930", days("2025-01-06", 2), 110.0)
+    table.insert("035420", days("2025-01-06", 2), 300.0)
+    append_days({}, str(tmp_path), headroom=headroom)
+    # 제자리 기록이든 새 파일이든 먼저 연 독자는 열 때의 일관된 앞부분만 본다
+    assert reader.shape == (1, 2, len(FIELDS))
+    assert reader.ticker_frame("005930")["open_price"].tolist() == [100.0, 101.0]
+    assert PriceCube.open(str(tmp_path)).shape == (2, 4, len(FIELDS))
+
+@pytest.mark.parametrize("hidden", ["2025-01-03", "2025-01-06"])
+def test_rows_outside_date_snapshot_skipped(table, tmp_path, monkeypatch, hidden):
+    # 날짜를 거꾸로 넣어 잘못된 칸에 쓰인 행이 나중 행에 덮이지 않도록
+    table.insert("005930", days("2025-01-02", 3)[::-1], 100.0)
+    snapshot = table.distinct
+    # 날짜 목록(_distinct)을 읽은 뒤 들어온 행: 중간 날짜면 다음 날짜 칸, 마지막 뒤면 범위 밖
+    monkeypatch.setattr(price_cube, "_distinct",
+                        lambda conn_params, column, start=None: [v for v in snapshot(conn_params, column, start)
+                                                                  if v != hidden])
+    cube = build_cube({}, str(tmp_path), headroom=0)
+    frame = cube.ticker_frame("005930")
+    expected = {"2025-01-02": 102.0, "2025-01-03": 101.0, "2025-01-06": 100.0}
+    assert hidden not in frame.index.strftime("%Y-%m-%d")
+    assert frame["open_price"].to_dict() == {pd.Timestamp(d): v for d, v in expected.items() if d != hidden}
@@ -0,0 +1,55 @@
+# tests/price_repository_test.py
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import price_repository
+from src.trading.price_repository import PriceRepository
+
+def fake_query(tickers, start, end, columns):
+    dates = pd.bdate_range("2024-01-01", periods=100)
+    frames = []
+    for tic in tickers:
+        data = {"ticker": tic, "price_date": dates}
+        data.update({c: np.arange(100, dtype=float) for c in columns})
+        frames.append(pd.DataFrame(data))
+    return pd.concat(frames, ignore_index=True)
+
+def test_get_shapes_and_field_names():
+    repo = PriceRepository(conn_params={})
+    repo._query = fake_query
+    single = repo.get("005930", fields=["Close", "Volume"])
+    assert list(single.columns) == ["Close", "Volume"]
+    assert single.index.name == "Date"
+
+    long_df = repo.get(["005930", "000660"], fields=["Close"])
+    assert list(long_df.columns) == ["Ticker", "Date", "Close"]
+    assert repo.get_panel("Close", ["005930", "000660"]).shape == (100, 2)
+
+def test_lru_cache_evicts_by_bytes():
+    repo = PriceRepository(conn_params={}, cache_bytes=12000)
+    repo._query = fake_query
+    repo.get("A", fields=["Close"])
+    repo.get("A", fields=["Close"])
+    assert (repo.hits, repo.misses) == (1, 1)
+
+    repo.get("B", fields=["Close"])
+    repo.get("C", fields=["Close"])
+    assert repo.cached_bytes <= 12000
+    repo.get("A", fields=["Close"])  # 가장 오래된 A가 밀려나 다시 조회
+    assert repo.misses == 4
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_null_volume_reads_as_missing(monkeypatch, compact):
+    # COPY CSV에서 NULL은 빈 칸
+    csv = ("ticker,price_date,close_price,volume\n"
+           "005930,2024-01-02,100.0,1500000\n"
+           "005930,2024-01-03,101.0,\n")
+
+    def copy_query_chunks(conn_params, sql, params=None, dtype=None, parse_dates=None):
+        yield pd.read_csv(io.StringIO(csv), dtype=dtype, parse_dates=parse_dates)
+
+    monkeypatch.setattr(price_repository, "copy_query_chunks", copy_query_chunks)
+    volume = PriceRepository(conn_params={}, compact=compact).get("005930", fields=["Close", "Volume"])["Volume"]
+    assert str(volume.dtype) == ("Int32" if compact else "Int64")
+    assert volume.iloc[0] == 1_500_000 and volume.isna().tolist() == [False, True]
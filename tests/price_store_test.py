@@ -0,0 +1,48 @@
+# tests/price_store_test.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading.price_store import PriceStore, load_prices, ticker_from_path
+
+@pytest.fixture
+def raw_df():
+    dates = pd.bdate_range("2022-11-01", periods=120)
+    return pd.DataFrame({
+        "Open": np.arange(120, dtype=float),
+        "Close": np.arange(120, dtype=float) + 0.5,
+        "Volume": np.arange(120) * 10,
+    }, index=dates)
+
+def test_upsert_and_append(tmp_path, raw_df):
+    store = PriceStore(str(tmp_path), "raw")
+    store.write("005930", raw_df.iloc[:80])
+    changed = raw_df.iloc[60:].copy()
+    changed["Close"] = -1.0
+    store.write("005930", changed, mode="append")
+    df = store.read("005930")
+    assert len(df) == 120 and df.index.is_unique
+    assert (df["Close"].iloc[:80] >= 0).all()  # append는 기존 날짜 유지
+
+    store.write("005930", changed, mode="upsert")
+    df = store.read("005930")
+    assert len(df) == 120
+    assert (df["Close"].iloc[60:] == -1.0).all()
+    assert store.years("005930") == [2022, 2023]
+
+def test_read_projection_and_range(tmp_path, raw_df):
+    store = PriceStore(str(tmp_path), "raw")
+    store.write("005930", raw_df)
+    store.write("000660", raw_df)
+    df = store.read("005930", start="2023-01-01", end="2023-01-31", columns=["Close"])
+    assert list(df.columns) == ["Close"]
+    assert df.index.min() >= pd.Timestamp("2023-01-01")
+    assert df.index.max() <= pd.Timestamp("2023-01-31")
+
+    long_df = store.read(start="2023-01-01", columns=["Close"])
+    assert set(long_df["Ticker"]) == {"005930", "000660"}
+
+def test_load_prices_by_legacy_filename(tmp_path, raw_df):
+    PriceStore(str(tmp_path), "raw").write("005930", raw_df)
+    assert ticker_from_path("data/raw/005930_20250603_153012.csv") == "005930"
+    df = load_prices("data/raw/005930_20250603_153012.csv", root=str(tmp_path))
+    assert len(df) == len(raw_df)
@@ -0,0 +1,47 @@
+# tests/response_cache_test.py
+import os
+import time
+import pandas as pd
+import pytest
+from src.trading.response_cache import ResponseCache, CacheMiss
+
+def test_call_uses_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path), mode="on")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return pd.DataFrame({"Close": [1.0, 2.0]})
+
+    first = cache.call("pykrx", "get_market_ohlcv_by_date", fetch, "005930", "20250101", "20250110")
+    second = cache.call("pykrx", "get_market_ohlcv_by_date", fetch, "005930", "20250101", "20250110")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    # 기간이 다르면 다른 키
+    cache.call("pykrx", "get_market_ohlcv_by_date", fetch, "005930", "20250101", "20250111")
+    assert len(calls) == 2
+
+def test_ttl_expiry_and_offline_replay(tmp_path):
+    cache = ResponseCache(str(tmp_path), mode="on", ttl=0.01)
+    cache.call("yfinance", "download", lambda: "old", "005930.KS")
+    time.sleep(0.02)
+    assert cache.call("yfinance", "download", lambda: "new", "005930.KS") == "new"
+
+    offline = ResponseCache(str(tmp_path), mode="offline", ttl=0.01)
+    time.sleep(0.02)
+    # offline 모드는 만료 여부와 상관없이 저장된 응답을 재생
+    assert offline.call("yfinance", "download", lambda: "net", "005930.KS") == "new"
+    with pytest.raises(CacheMiss):
+        offline.call("yfinance", "download", lambda: "net", "000660.KS")
+
+def test_lru_eviction(tmp_path):
+    payload = "x" * 1000
+    cache = ResponseCache(str(tmp_path), mode="on", max_bytes=2500)
+    cache.call("src", "f", lambda: payload, "A")
+    cache.call("src", "f", lambda: payload, "B")
+    time.sleep(0.01)
+    cache.call("src", "f", lambda: payload, "A")  # A 사용 → B가 가장 오래됨
+    cache.call("src", "f", lambda: payload, "C")
+    assert cache.total_bytes() <= 2500
+    assert os.path.exists(cache._path(cache.make_key("src", "f", "A")))
+    assert not os.path.exists(cache._path(cache.make_key("src", "f", "B")))
@@ -0,0 +1,140 @@
+# tests/schema_test.py
+import datetime
+from contextlib import contextmanager
+import pytest
+from psycopg2 import sql
+from src.trading import schema
+from src.trading.schema import cluster_partition, ensure_price_schema, migrate_to_partitioned
+
+def render(query) -> str:
+    """ psycopg2.sql 조합을 실제 연결 없이 문자열로 (식별자는 큰따옴표) """
+    if isinstance(query, str):
+        return query
+    if isinstance(query, sql.Composed):
+        return "".join(render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join(f'"{s}"' for s in query.strings)
+    return query.string
+
+class RecordingCursor:
+    """ 실행한 SQL을 기록하고 카탈로그 조회에는 relkinds / partitions 상태로 답하는 커서 """
+    def __init__(self, relkinds=None, price_range=(None, None)):
+        self.relkinds = dict(relkinds or {})
+        self.partitions = set()
+        self.price_range = price_range
+        self.statements = []
+        self.rowcount = -1
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        text = " ".join(render(query).split())
+        self.statements.append((text, params))
+        self._result = []
+        if "FROM pg_class" in text:
+            kind = self.relkinds.get(params[0])
+            self._result = [(kind,)] if kind else []
+        elif "FROM pg_inherits" in text:
+            self._result = [(name,) for name in sorted(self.partitions)]
+        elif "FROM pg_indexes" in text:
+            self._result = [(f"{params[0]}_pkey",)]
+        elif text.startswith("SELECT min(price_date)"):
+            self._result = [self.price_range]
+        elif text.startswith("ALTER TABLE"):
+            old, new = text.split('"')[1::2]
+            self.relkinds[new] = self.relkinds.pop(old)
+        elif "PARTITION BY RANGE" in text:
+            self.relkinds[text.split('"')[1]] = "p"
+        elif "PARTITION OF" in text:
+            self.partitions.add(text.split('"')[1])
+        elif text.startswith("INSERT"):
+            self.rowcount = 42
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def ddl(self):
+        """ 카탈로그 조회를 뺀 실행 문장 """
+        return [(text, params) for text, params in self.statements if not text.startswith("SELECT")]
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+@pytest.fixture
+def catalog(monkeypatch):
+    cursor = RecordingCursor()
+
+    @contextmanager
+    def pooled_connection(conn_params):
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(schema, "pooled_connection", pooled_connection)
+    return cursor
+
+def test_ensure_creates_table_and_year_partitions(catalog):
+    created = ensure_price_schema({}, "20190301", "20211231")
+    assert created == ["krx_daily_price_y2019", "krx_daily_price_y2020", "krx_daily_price_y2021"]
+    statements = catalog.ddl()
+    table = statements[0][0]
+    assert table.startswith('CREATE TABLE IF NOT EXISTS "krx_daily_price"')
+    assert "PRIMARY KEY (ticker, price_date) ) PARTITION BY RANGE (price_date)" in table
+    assert statements[1][0] == ('CREATE INDEX IF NOT EXISTS "krx_daily_price_price_date_brin" ON "krx_daily_price" '
+                                'USING brin (price_date) WITH (pages_per_range = 16);')
+    # 연도 파티션 경계는 [해당 연도 1월 1일, 다음 연도 1월 1일)
+    assert [params for _, params in statements[2:]] == [("2019-01-01", "2020-01-01"), ("2020-01-01", "2021-01-01"),
+                                                         ("2021-01-01", "2022-01-01")]
+    assert all('PARTITION OF "krx_daily_price"' in text for text, _ in statements[2:])
+
+    # 다시 호출하면 없는 연도만 만든다
+    assert ensure_price_schema({}, "20200101", "20221231") == ["krx_daily_price_y2022"]
+    assert len(catalog.ddl()) == len(statements) + 1
+
+def test_ensure_leaves_plain_table(catalog):
+    catalog.relkinds["krx_daily_price"] = "r"
+    assert ensure_price_schema({}, "20200101", "20201231") == []
+    assert catalog.ddl() == []
+
+def test_migrate_is_idempotent(catalog):
+    catalog.relkinds["krx_daily_price"] = "r"
+    catalog.price_range = (datetime.date(2019, 5, 2), datetime.date(2020, 12, 30))
+    assert migrate_to_partitioned({}) == 42
+    texts = [text for text, _ in catalog.ddl()]
+    assert texts[0] == 'ALTER TABLE "krx_daily_price" RENAME TO "krx_daily_price_legacy";'
+    assert texts[1] == 'ALTER INDEX "krx_daily_price_legacy_pkey" RENAME TO "krx_daily_price_legacy_pkey_legacy";'
+    assert "PARTITION BY RANGE (price_date)" in texts[2]
+    assert catalog.partitions == {"krx_daily_price_y2019", "krx_daily_price_y2020"}
+    assert texts[-1].startswith('INSERT INTO "krx_daily_price" SELECT DISTINCT ON (price_date, ticker)')
+    assert texts[-1].endswith('FROM "krx_daily_price_legacy" ORDER BY price_date, ticker;')
+
+    # 이미 파티션 테이블이면 아무것도 하지 않음
+    done = len(catalog.statements)
+    assert migrate_to_partitioned({}) == 0
+    assert [text for text, _ in catalog.statements[done:]] == [catalog.statements[0][0]]
+    assert catalog.relkinds == {"krx_daily_price": "p", "krx_daily_price_legacy": "r"}
+
+def test_cluster_partition_rewrites_in_date_order(catalog):
+    assert cluster_partition({}, 2020) == 42
+    part = '"krx_daily_price_y2020"'
+    assert [text for text, _ in catalog.statements] == [
+        f"LOCK TABLE {part} IN ACCESS EXCLUSIVE MODE;",
+        f"CREATE TEMP TABLE _cluster_rows ON COMMIT DROP AS SELECT * FROM {part};",
+        f"TRUNCATE {part};",
+        f"INSERT INTO {part} SELECT * FROM _cluster_rows ORDER BY price_date, ticker;",
+        f"ANALYZE {part};",
+    ]
@@ -0,0 +1,70 @@
+# tests/search_test.py
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading.indicators import model_features
+from src.trading.model import search as search_module
+from src.trading.model.dataset import features_and_target, train_split_index, training_window
+from src.trading.model.search import TrialRunner, best_params, data_hash, sample_candidates, search
+
+def make_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+def test_sample_candidates():
+    space = {"a": [1, 2, 3], "b": ["x", "y"]}
+    assert len(sample_candidates(space, 10)) == 6
+    picked = sample_candidates(space, 4, seed=1)
+    assert len(picked) == 4 and len({tuple(sorted(p.items())) for p in picked}) == 4
+    assert picked == sample_candidates(space, 4, seed=1)
+
+def test_data_hash():
+    X, y = make_data()
+    assert data_hash(X, y) == data_hash(X.copy(), y.copy())
+    X[0, 0] += 1e-9
+    assert data_hash(X, y) != data_hash(*make_data())
+
+def test_successive_halving_prunes_and_resumes(tmp_path, monkeypatch):
+    X, y = make_data()
+    space = {"num_leaves": [3, 7, 15], "learning_rate": [0.05, 0.1, 0.3]}
+    results = search(X, y, "lgb", space=space, n_candidates=9, eta=3, max_budget=90, workers=2,
+                     cache_dir=str(tmp_path / "cache"))
+    # 9 → 3 → 1 후보, 예산 10 → 30 → 90 라운드
+    assert results.groupby("budget").size().to_dict() == {10: 9, 30: 3, 90: 1}
+    assert not results["cached"].any() and results["accuracy"].notna().all()
+    best = best_params(results)
+    assert best["num_boost_round"] == 90 and json.loads(results.iloc[-1]["params"]) == {k: best[k] for k in space}
+
+    # 끝난 시험은 메모에서 읽고 다시 학습하지 않음
+    monkeypatch.setattr(search_module, "run_batch", lambda *a, **k: pytest.fail("trial re-run"))
+    again = search(X, y, "lgb", space=space, n_candidates=9, eta=3, max_budget=90, cache_dir=str(tmp_path / "cache"))
+    assert again["cached"].all()
+    pd.testing.assert_series_equal(again["accuracy"], results["accuracy"])
+
+def test_rows_budget_for_random_forest():
+    X, y = make_data(600)
+    results = search(X, y, "rf", space={"max_depth": [2, 4, 8], "n_estimators": [20]}, n_candidates=3,
+                     eta=3, resource="rows", workers=1, cache_dir=None)
+    assert results["resource"].eq("rows").all()
+    assert results.groupby("rung")["train_rows"].max().tolist() == [160, 480]
+
+def test_validation_rows_precede_test_split(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 503
+    df = pd.DataFrame(rng.normal(size=(n, len(model_features()))), columns=model_features(),
+                      index=pd.bdate_range("2020-01-01", periods=n, name="Date"))
+    df["Adj Close"] = 10000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    path = str(tmp_path / "005930_processed.csv")
+    df.to_csv(path)
+
+    X, y, dates = training_window(path)
+    _, _, all_dates = features_and_target(path)
+    test_start = all_dates[train_split_index(n)]
+    with TrialRunner(X, y, "rf", valid_fraction=0.2, cache_dir=None) as runner:
+        _, train_end, valid_start, valid_end = runner.split
+    # 후보 비교 구간은 train_model의 테스트 세트(=백테스트 구간)가 시작하기 전에 끝남
+    assert 0 < train_end == valid_start < valid_end == len(X) == train_split_index(n)
+    assert dates[valid_end - 1] < test_start
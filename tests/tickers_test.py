@@ -0,0 +1,131 @@
+# tests/tickers_test.py
+from contextlib import contextmanager
+import pandas as pd
+import pytest
+from src.trading import tickers, utils
+from src.trading.tickers import TickerNameCache, diff_tickers, resolve_names, sync_tickers_table
+
+def test_diff_tickers():
+    stored = pd.DataFrame({
+        "ticker": ["005930", "000660", "000001"],
+        "name": ["삼성전자", "하이닉스", "폐지종목"],
+        "market": ["KOSPI", "KOSPI", "KOSPI"],
+    })
+    current = pd.DataFrame({
+        "ticker": ["005930", "000660", "035720"],
+        "name": ["삼성전자", "SK하이닉스", "카카오"],
+        "market": ["KOSPI", "KOSPI", "KOSDAQ"],
+    })
+    diff = diff_tickers(current, stored)
+    assert diff["added"]["ticker"].tolist() == ["035720"]
+    assert diff["changed"]["ticker"].tolist() == ["000660"]
+    assert diff["delisted"] == ["000001"]
+
+def test_ticker_name_cache_ttl(tmp_path):
+    path = str(tmp_path / "names.json")
+    cache = TickerNameCache(path, ttl=3600)
+    cache.put("005930", "삼성전자", "KOSPI")
+    cache.save()
+
+    assert TickerNameCache(path, ttl=3600).get("005930")["name"] == "삼성전자"
+    assert TickerNameCache(path, ttl=-1).get("005930") is None
+
+class SyncCursor:
+    """ krx_tickers 조회에 stored 행으로 답하고 실행한 SQL을 기록하는 커서 """
+    def __init__(self, stored):
+        self.stored = stored
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.stored
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+@pytest.fixture
+def krx_tickers(monkeypatch):
+    """ sync_tickers_table이 쓰는 연결·execute_values를 대신해 (커서, 연결 목록, upsert 행) 기록 """
+    cursor = SyncCursor([("005930", "삼성전자", "KOSPI"), ("000660", "하이닉스", "KOSPI"),
+                         ("000001", "폐지종목", "KOSPI"), ("035720", "카카오", "KOSDAQ")])
+    connections, upserts = [], []
+
+    @contextmanager
+    def pooled_connection(conn_params):
+        conn = FakeConnection(cursor)
+        connections.append(conn)
+        yield conn
+
+    monkeypatch.setattr(tickers, "pooled_connection", pooled_connection)
+    monkeypatch.setattr(tickers, "execute_values", lambda cur, query, rows: upserts.extend(rows))
+    return cursor, connections, upserts
+
+def listing(rows):
+    return pd.DataFrame(rows, columns=["ticker", "name", "market"])
+
+def test_sync_applies_diff_in_one_transaction(krx_tickers):
+    cursor, connections, upserts = krx_tickers
+    diff = sync_tickers_table(listing([("005930", "", "KOSPI"), ("000660", "SK하이닉스", "KOSPI"),
+                                       ("373220", "LG에너지솔루션", "KOSPI"), ("035720", "카카오", "KOSDAQ")]), {})
+    # 이름 조회에 실패한 005930은 기존 이름을 유지하므로 변경 아님
+    assert upserts == [("373220", "LG에너지솔루션", "KOSPI"), ("000660", "SK하이닉스", "KOSPI")]
+    assert diff["delisted"] == ["000001"]
+    assert cursor.statements[-1] == ("DELETE FROM krx_tickers WHERE ticker = ANY(%s);", (["000001"],))
+    assert len(connections) == 1 and connections[0].commits == 1
+
+def test_sync_keeps_markets_missing_from_listing(krx_tickers):
+    cursor, connections, upserts = krx_tickers
+    # KOSDAQ 목록 조회가 실패해 KOSPI만 있는 경우 KOSDAQ 종목은 상장폐지로 보지 않음
+    diff = sync_tickers_table(listing([("005930", "삼성전자", "KOSPI"), ("000660", "하이닉스", "KOSPI")]), {})
+    assert diff["delisted"] == ["000001"] and upserts == []
+    assert "035720" not in cursor.statements[-1][1][0]
+
+def test_sync_refuses_empty_listing(krx_tickers):
+    cursor, connections, upserts = krx_tickers
+    with pytest.raises(ValueError):
+        sync_tickers_table(listing([]), {})
+    assert connections == [] and cursor.statements == []
+
+def test_sync_failure_commits_nothing(krx_tickers, monkeypatch):
+    cursor, connections, upserts = krx_tickers
+
+    def execute_values(cur, query, rows):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(tickers, "execute_values", execute_values)
+    with pytest.raises(RuntimeError):
+        sync_tickers_table(listing([("373220", "LG에너지솔루션", "KOSPI")]), {})
+    # 추가 실패 시 상장폐지 DELETE까지 가지 않고 커밋도 하지 않음 (pooled_connection이 롤백)
+    assert connections[0].commits == 0 and not any(q.startswith("DELETE") for q, _ in cursor.statements)
+
+def test_resolve_names_retries_and_blanks_failures(monkeypatch):
+    calls = {}
+
+    def resolve_name(ticker):
+        calls[ticker] = calls.get(ticker, 0) + 1
+        if ticker == "999999" or (ticker == "000660" and calls[ticker] == 1):
+            raise ConnectionError("KRX timeout")
+        return {"005930": "삼성전자", "000660": "SK하이닉스"}[ticker]
+
+    monkeypatch.setattr(tickers, "_resolve_name", resolve_name)
+    monkeypatch.setattr(utils.time, "sleep", lambda seconds: None)
+    names = resolve_names(["005930", "000660", "999999"], workers=2, rate=1000, retries=1)
+    # 일시 실패는 재시도로 복구, 끝내 실패한 티커는 빈 문자열
+    assert names == {"005930": "삼성전자", "000660": "SK하이닉스", "999999": ""}
+    assert calls == {"005930": 1, "000660": 2, "999999": 2}
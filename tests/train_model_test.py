@@ -0,0 +1,37 @@
+# tests/train_model_test.py
+import os
+import numpy as np
+import pandas as pd
+from scripts.train_model import train_batch
+from src.trading.indicators import model_features
+from src.trading.price_store import PriceStore
+
+def make_processed(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    df = pd.DataFrame({"Close": close, "Adj Close": close},
+                      index=pd.bdate_range("2023-01-02", periods=n, name="Date"))
+    for i, name in enumerate(model_features()):
+        df[name] = rng.normal(size=n) * (i + 1)
+    return df
+
+def test_batch_writes_per_ticker_models(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = PriceStore(dataset="processed")
+    for seed, ticker in enumerate(("005930", "000660")):
+        store.write(ticker, make_processed(seed=seed))
+
+    table = train_batch(["005930,000660,999999"], "rf", workers=1, params={"n_estimators": 5})
+    assert table["ticker"].tolist() == ["000660", "005930", "999999"]
+    for ticker in ("005930", "000660"):
+        assert os.path.isfile(os.path.join("models", "rf", f"{ticker}.pkl"))
+    # 데이터가 없는 티커는 error 컬럼에 사유가 남고 나머지는 계속 학습
+    errors = table.set_index("ticker")["error"]
+    assert errors[["000660", "005930"]].isna().all() and isinstance(errors["999999"], str)
+    assert os.path.isfile(os.path.join("models", "rf", "summary.csv"))
+
+def test_batch_without_inputs(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "empty").mkdir()
+    assert train_batch([str(tmp_path / "empty")], "rf", workers=1) is None
+    assert "[ERROR] No inputs found" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+# tests/tree_ensemble_test.py
+import numpy as np
+import lightgbm as lgb
+import pytest
+import xgboost as xgb
+from sklearn.ensemble import RandomForestClassifier
+from src.trading.model import tree_ensemble
+from src.trading.model.ml_models import build_model
+from src.trading.model.tree_ensemble import TreeEnsemble
+
+def make_data(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    # 특징마다 평균·크기가 달라 스케일러를 합칠 때 반올림 차이가 드러나도록
+    X = rng.normal(size=(n, 5)) * rng.uniform(1, 1000, 5) + rng.uniform(-500, 500, 5)
+    y = (X[:, 0] - X[:, 0].mean() + rng.normal(scale=X[:, 0].std(), size=n) > 0).astype(int)
+    return X, y
+
+def test_sklearn_probabilities_identical(tmp_path):
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X[:2000], y[:2000])
+    ensemble = TreeEnsemble.from_sklearn(forest)
+    # 깊이가 제각각인 트리 + 한 행 입력 + 작은 배치까지 sklearn과 비트 단위로 같아야 함
+    for rows in (X[2000:], X[:1]):
+        np.testing.assert_array_equal(ensemble.predict_proba(rows), forest.predict_proba(rows))
+    np.testing.assert_array_equal(ensemble.predict_proba(X, batch_rows=7), forest.predict_proba(X))
+
+    loaded = TreeEnsemble.load(str(tmp_path), ensemble.save(str(tmp_path)))
+    assert isinstance(loaded.feature, np.memmap)
+    np.testing.assert_array_equal(loaded.predict(X), forest.predict(X))
+
+@pytest.mark.parametrize("model_type", ["rf", "xgb", "lgb"])
+def test_fused_scaler_matches_model(model_type):
+    X, y = make_data()
+    model = build_model(model_type, n_jobs=1)
+    X_train, X_test = model.scale(X[:2000], X[2000:])
+    model.fit(X_train, y[:2000])
+    # 분할 경계값과 그 바로 위 실수: 스케일 후 반올림에 따라 방향이 갈리는 경계 사례
+    engine = model.compile()
+    nodes = np.flatnonzero(engine.children[:, 0] != np.arange(len(engine.feature)))[:500]
+    edge = np.tile(X[2000:2000 + len(nodes)], (2, 1))
+    bounds = engine.threshold[nodes]
+    edge[np.arange(len(edge)), np.tile(engine.feature[nodes], 2)] = np.concatenate([bounds, np.nextafter(bounds, np.inf)])
+    edge_scaled = model.scaler.transform(edge)
+
+    for raw, scaled in ((X[2000:], X_test), (edge, edge_scaled)):
+        np.testing.assert_array_equal(engine.predict(raw), model.predict(scaled))
+        # 부스팅은 exp 구현 차이로 확률 마지막 자리만 다를 수 있음
+        np.testing.assert_allclose(engine.predict_proba(raw)[:, 1], model.predict_proba(scaled), rtol=1e-6)
+    # 스케일러 없이 컴파일하면 스케일된 입력을 받는다
+    np.testing.assert_array_equal(model.compile(fuse_scaler=False).predict(X_test), model.predict(X_test))
+
+def test_xgboost_margin_identical():
+    X, y = make_data()
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 4, "verbosity": 0},
+                        xgb.DMatrix(X[:2000], label=y[:2000]), num_boost_round=30)
+    ensemble = TreeEnsemble.from_xgboost(booster)
+    margin = np.concatenate([total[:, 0] for _, total in ensemble._batches(X)])
+    np.testing.assert_array_equal(margin, booster.predict(xgb.DMatrix(X), output_margin=True))
+
+def test_missing_values_follow_default_direction():
+    X, y = make_data()
+    X[np.random.default_rng(1).random(X.shape) < 0.1] = np.nan
+    booster = xgb.train({"objective": "binary:logistic", "verbosity": 0}, xgb.DMatrix(X[:2000], label=y[:2000]),
+                        num_boost_round=20)
+    np.testing.assert_array_equal(TreeEnsemble.from_xgboost(booster).predict(X[2000:]),
+                                  (booster.predict(xgb.DMatrix(X[2000:])) > 0.5).astype(int))
+    lgb_booster = lgb.train({"objective": "binary", "verbosity": -1}, lgb.Dataset(X[:2000], label=y[:2000]), num_boost_round=20)
+    np.testing.assert_array_equal(TreeEnsemble.from_lightgbm(lgb_booster).predict(X[2000:]),
+                                  (lgb_booster.predict(X[2000:]) > 0.5).astype(int))
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X[:2000], y[:2000])
+    np.testing.assert_array_equal(TreeEnsemble.from_sklearn(forest).predict_proba(X[2000:]), forest.predict_proba(X[2000:]))
+
+def test_input_bounds_exact():
+    rng = np.random.default_rng(0)
+    threshold = np.concatenate([rng.normal(size=1000), [0.0, 1e30, -1e30, 3.4e38]])
+    mean = rng.normal(scale=1e3, size=len(threshold))
+    scale = rng.uniform(1e-3, 1e3, size=len(threshold))
+    cast = tree_ensemble._to_float32
+    bound = tree_ensemble._input_bounds(threshold, mean, scale, cast)
+    with np.errstate(over="ignore"):
+        assert (cast((bound - mean) / scale) <= threshold).all()
+        above = np.nextafter(bound, np.inf)
+        assert ((cast((above - mean) / scale) > threshold) | np.isinf(bound)).all()
@@ -0,0 +1,32 @@
+# tests/utils_test.py
+import time
+import pytest
+from src.trading.utils import TokenBucket, call_with_retry
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    # 첫 토큰은 즉시, 이후 10개는 초당 50개 속도로 보충
+    assert elapsed >= 10 / 50 * 0.9
+
+def test_call_with_retry_recovers():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("temporary")
+        return "ok"
+
+    assert call_with_retry(flaky, retries=3, base_delay=0.001) == "ok"
+    assert len(calls) == 3
+
+def test_call_with_retry_gives_up():
+    def always_fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        call_with_retry(always_fail, retries=2, base_delay=0.001)
@@ -0,0 +1,51 @@
+# tests/validation_test.py
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import StandardScaler
+from src.trading.model.ml_models import build_model
+from src.trading.model.validation import summarize_folds, walk_forward, walk_forward_splits
+
+def make_data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4)) * [1.0, 10.0, 100.0, 0.1]
+    y = (X[:, 0] + 0.1 * X[:, 1] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+def test_walk_forward_splits():
+    assert walk_forward_splits(100, 4, "expanding") == [(0, 20, 20, 40), (0, 40, 40, 60), (0, 60, 60, 80), (0, 80, 80, 100)]
+    assert walk_forward_splits(100, 3, "sliding", train_size=40, gap=1) == [(2, 42, 43, 62), (21, 61, 62, 81), (40, 80, 81, 100)]
+    for train_start, train_end, test_start, test_end in walk_forward_splits(1000, 7, "sliding", test_size=50, gap=2):
+        assert train_end - train_start == 1000 - 2 - 7 * 50
+        assert test_start - train_end == 2 and test_end - test_start == 50
+    with pytest.raises(ValueError):
+        walk_forward_splits(100, 5, train_size=90, test_size=5)
+    with pytest.raises(ValueError):
+        walk_forward_splits(100, 5, mode="rolling")
+
+def test_walk_forward_matches_manual_loop():
+    X, y = make_data()
+    folds = walk_forward(X, y, "rf", n_folds=3, mode="sliding", train_size=120, workers=2, threads=1)
+    assert list(folds["fold"]) == [0, 1, 2] and "error" not in folds
+
+    for row in folds.itertuples():
+        scaler = StandardScaler().fit(X[row.train_start:row.train_end])
+        model = build_model("rf", n_jobs=1)
+        model.train(scaler.transform(X[row.train_start:row.train_end]), y[row.train_start:row.train_end])
+        y_pred = model.model.predict(scaler.transform(X[row.test_start:row.test_end]))
+        assert row.accuracy == accuracy_score(y[row.test_start:row.test_end], y_pred)
+        assert row.train_rows == 120
+
+    stats = summarize_folds(folds)
+    assert stats["folds"] == 3 and stats["accuracy_mean"] == pytest.approx(folds["accuracy"].mean())
+
+def test_boosting_early_stops_on_train_tail():
+    X, y = make_data()
+    seen = {}
+    model = build_model("lgb", n_jobs=1)
+    model.train = lambda X_fit, y_fit, X_val=None, y_val=None: seen.update(fit=len(X_fit), val=len(X_val))
+    model.fit(X[:200], y[:200], valid_fraction=0.25)
+    assert seen == {"fit": 150, "val": 50}
+
+    folds = walk_forward(X, y, "xgb", n_folds=2, workers=1)
+    assert folds["best_iteration"].notna().all() and (folds["accuracy"] > 0.5).all()